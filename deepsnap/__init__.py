@@ -2,4 +2,9 @@ import deepsnap.graph
 import deepsnap.dataset
 import deepsnap.batch
 import deepsnap.hetero_graph
-import deepsnap.hetero_gnn
\ No newline at end of file
+import deepsnap.hetero_gnn
+import deepsnap.negative_sampling
+import deepsnap.sampler
+import deepsnap.packed
+import deepsnap.feature_store
+import deepsnap.cache
\ No newline at end of file
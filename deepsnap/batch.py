@@ -1,8 +1,10 @@
+import functools
+import itertools
 import torch
 from deepsnap.graph import Graph
+from deepsnap.feature_store import FeatureStore
 from typing import (
     Callable,
-    Dict,
     List,
 )
 
@@ -14,13 +16,19 @@ class Batch(Graph):
     base class, all its methods can also be used here.
     In addition, single graphs can be reconstructed via the assignment vector
     :obj:`batch`, which maps each node to its respective graph identifier.
+    The offsets :obj:`ptr` and :obj:`edge_index_ptr` hold the first node and
+    the first edge of each graph (followed by the total counts), so that
+    graph level readouts can be computed as contiguous segment reductions,
+    see :meth:`pool`.
     """
-    def __init__(self, batch=None, **kwargs):
+    def __init__(self, batch=None, ptr=None, **kwargs):
         super(Batch, self).__init__(**kwargs)
 
         self.batch = batch
+        self.ptr = ptr
         self.__data_class__ = Graph
         self.__slices__ = None
+        self.__cumsum__ = None
 
     @staticmethod
     def collate(follow_batch=[], transform=None, **kwargs):
@@ -39,7 +47,8 @@ class Batch(Graph):
         Constructs A :class:`deepsnap.batch.Batch` object from a python list holding
         :class:`torch_geometric.data.Data` objects.
         The assignment vector :obj:`batch` is created on the fly.
-        Additionally, creates assignment batch vectors for each key in
+        Additionally, creates assignment batch vectors and offsets
+        (:obj:`{key}_batch` and :obj:`{key}_ptr`) for each key in
         :obj:`follow_batch`.
 
         Args:
@@ -59,209 +68,355 @@ class Batch(Graph):
                 )
                 for data in data_list
             ]
-        keys = [set(data.keys) for data in data_list]
-        keys = list(set.union(*keys))
-        assert "batch" not in keys
-
-        batch, cumsum = Batch._init_batch_fields(keys, follow_batch)
+        batch = Batch()
         batch.__data_class__ = data_list[0].__class__
-        batch.batch = []
-        for i, data in enumerate(data_list):
-            # Note: in heterogeneous graph, __inc__ logic is different
-            Batch._collate_dict(
-                data, cumsum,
-                batch.__slices__, batch,
-                data, follow_batch, i=i
-            )
-            num_nodes = data.num_nodes
-            if num_nodes is not None:
-                item = torch.full((num_nodes, ), i, dtype=torch.long)
-                batch.batch.append(item)
+        batch.__slices__ = {}
+        batch.__cumsum__ = {}
+        # Note: in heterogeneous graph, __inc__ logic is different
+        Batch._collate_dict(
+            data_list, data_list, batch, batch.__slices__, batch.__cumsum__,
+            follow_batch
+        )
+        assert "batch" not in batch.__slices__
 
-        if num_nodes is None:
+        num_nodes = [data.num_nodes for data in data_list]
+        if None in num_nodes:
             batch.batch = None
-
-        Batch._dict_list_to_tensor(batch, data_list[0])
+        else:
+            batch.batch = Batch._repeat_index(num_nodes)
+            batch.ptr = Batch._slices_to_ptr(
+                list(itertools.accumulate([0] + num_nodes))
+            )
+        if "edge_index" in batch.__slices__:
+            batch.edge_index_ptr = Batch._slices_to_ptr(
+                batch.__slices__["edge_index"]
+            )
 
         return batch.contiguous()
 
     @staticmethod
-    def _init_batch_fields(keys, follow_batch):
-        batch = Batch()
-        batch.__slices__ = {key: [0] for key in keys}
-
-        for key in keys:
-            batch[key] = []
+    def _repeat_index(sizes: List[int]) -> torch.Tensor:
+        r"""
+        Returns the assignment vector in which the index of each graph is
+        repeated by its size, e.g. :obj:`[0, 0, 1, 2, 2, 2]` for sizes
+        :obj:`[2, 1, 3]`.
+        """
+        return torch.arange(len(sizes)).repeat_interleave(
+            torch.tensor(sizes, dtype=torch.long)
+        )
 
-        for key in follow_batch:
-            batch[f"{key}_batch"] = []
+    @staticmethod
+    def _slices_to_ptr(slices):
+        r"""
+        Converts the slices of an attribute (or a dictionary of them) into
+        offset tensors.
+        """
+        if isinstance(slices, dict):
+            return {
+                key: Batch._slices_to_ptr(value)
+                for key, value in slices.items()
+            }
+        return torch.tensor(slices, dtype=torch.long)
 
-        cumsum = {key: 0 for key in keys}
-        return batch, cumsum
+    @staticmethod
+    def _is_batch_key(key) -> bool:
+        r"""
+        Whether the attribute is created by batching, namely an assignment
+        vector or an offset tensor.
+        """
+        return (
+            isinstance(key, str)
+            and (key[-5:] == "batch" or key[-3:] == "ptr")
+        )
 
     @staticmethod
     def _collate_dict(
-        curr_dict,
-        cumsum: Dict[str, int],
-        slices,
+        dicts,
+        graphs: List[Graph],
         batched_dict,
-        graph,
-        follow_batch,
-        i=None
+        slices,
+        cumsum,
+        follow_batch: List[str],
     ):
-        r""" Called in from_data_list to collate a dictionary.
-        This can also be applied to Graph object, since it has support for
-        keys and __getitem__().
+        r"""
+        Called in from_data_list to collate the dictionaries of all graphs
+        key by key. This can also be applied to Graph objects, since they
+        have support for keys and __getitem__().
 
         Args:
-            curr_dict: current dictionary to be added to the collated dictionary.
-            cumsum: cumulative sum to be used for indexing.
+            dicts: the dictionaries (or graphs) to be collated, one per graph.
+            graphs: the graphs that own the dictionaries in :obj:`dicts`.
+            batched_dict: the batched dictionary (or batch) to be filled, of
+                the same structure as each of :obj:`dicts`. But all graph data
+                are batched together.
             slices: a dictionary of the same structure as batched_dict,
                 slices[key] indicates the indices to slice batch[key] into
                 tensors for all graphs in the batch.
-            batched_dict: the batched dictionary of the same structure as curr_dict.
-                But all graph data are batched together.
+            cumsum: a dictionary of the same structure as batched_dict,
+                cumsum[key] is the offset added to batch[key] for each graph
+                in the batch, or :obj:`None` if no offset is added.
+            follow_batch: keys for which assignment batch vectors are created.
         """
-        if isinstance(curr_dict, dict):
-            keys = curr_dict.keys()
-        else:
-            keys = curr_dict.keys
+        dict_keys = [
+            curr_dict.keys() if isinstance(curr_dict, dict)
+            else curr_dict.keys
+            for curr_dict in dicts
+        ]
+        keys = dict.fromkeys(key for curr_keys in dict_keys for key in curr_keys)
+        dict_keys = [set(curr_keys) for curr_keys in dict_keys]
+
         for key in keys:
-            item = curr_dict[key]
-            if isinstance(item, dict):
+            # graphs missing the key do not contribute to its slices
+            present = [
+                (curr_dict[key], graph)
+                for curr_dict, graph, curr_keys in zip(dicts, graphs, dict_keys)
+                if key in curr_keys
+            ]
+            items = [item for item, _ in present]
+            owners = [graph for _, graph in present]
+            if isinstance(items[0], dict):
                 # recursively collate every key in the dictionary
-                if isinstance(batched_dict[key], list):
-                    # nested dictionary not initialized yet
-                    assert len(batched_dict[key]) == 0
-                    # initialize the nested dictionary for batch
-                    cumsum[key] = {inner_key: 0 for inner_key in item.keys()}
-                    slices[key] = {inner_key: [0] for inner_key in item.keys()}
-                    batched_dict[key] = {}
-                    for inner_key in item.keys():
-                        batched_dict[key][inner_key] = []
-                    for inner_key in follow_batch:
-                        batched_dict[key][f"{key}_batch"] = []
+                batched_dict[key] = {}
+                slices[key] = {}
+                cumsum[key] = {}
                 Batch._collate_dict(
-                    item, cumsum[key],
-                    slices[key], batched_dict[key],
-                    graph, follow_batch, i=i
+                    items, owners, batched_dict[key], slices[key],
+                    cumsum[key], follow_batch
                 )
                 continue
-            if torch.is_tensor(item) and item.dtype != torch.bool:
-                item = item + cumsum[key]
-            if torch.is_tensor(item):
-                size = item.size(graph.__cat_dim__(key, curr_dict[key]))
-            else:
-                size = 1
-            slices[key].append(size + slices[key][-1])
-            cumsum[key] = cumsum[key] + graph.__inc__(key, item)
-            batched_dict[key].append(item)
 
+            batched_dict[key], sizes, cumsum[key] = Batch._collate_key(
+                key, items, owners
+            )
+            slices[key] = [0]
+            for size in sizes:
+                slices[key].append(slices[key][-1] + size)
             if key in follow_batch:
-                item = torch.full((size, ), i, dtype=torch.long)
-                batched_dict[f"{key}_batch"].append(item)
+                batched_dict[f"{key}_batch"] = Batch._repeat_index(sizes)
+                batched_dict[f"{key}_ptr"] = Batch._slices_to_ptr(slices[key])
 
     @staticmethod
-    def _dict_list_to_tensor(dict_of_list, graph):
-        r"""Convert a dict/Graph with list as values to a dict/Graph with
-        concatenated/stacked tensor as values.
+    def _collate_key(key, items: List, graphs: List[Graph]):
+        r"""
+        Collates the values of :obj:`key` of all graphs with a single
+        concatenation. Index attributes are shifted by the cumulative
+        :meth:`__inc__` of the preceding graphs in one vectorized addition.
+
+        Returns:
+            The collated value, the size of each item along the
+            concatenation dimension and the offset added to each item
+            (:obj:`None` if no offsets are added).
         """
-        if isinstance(dict_of_list, dict):
-            keys = dict_of_list.keys()
+        item = items[0]
+        graph = graphs[0]
+        if isinstance(item, FeatureStore):
+            # rows of the same store are gathered at once
+            sizes = [len(curr_item) for curr_item in items]
+            return FeatureStore.gather_concat(items), sizes, None
+        if not torch.is_tensor(item):
+            if isinstance(item, (float, int)):
+                return torch.tensor(items), [1] * len(items), None
+            return items, [1] * len(items), None
+
+        cat_dim = graph.__cat_dim__(key, item)
+        sizes = [curr_item.size(cat_dim) for curr_item in items]
+        if (
+            Graph._is_graph_attribute(key)
+            and item.ndim == 1
+            and (not item.dtype == torch.long)
+            and "feature" in key
+        ):
+            # special consideration: 1D tensor for graph attribute (classification)
+            # named as: "graph_xx_feature"
+            # batch by stacking the first dim
+            return torch.stack(items, dim=0), sizes, None
+
+        # concat at the __cat_dim__
+        collated = torch.cat(items, dim=cat_dim)
+        if item.dtype == torch.bool:
+            return collated, sizes, None
+
+        incs = [
+            curr_graph.__inc__(key, curr_item)
+            for curr_item, curr_graph in zip(items, graphs)
+        ]
+        if torch.is_tensor(incs[0]):
+            incs = torch.stack(incs).long()
+        elif not any(incs):
+            return collated, sizes, None
         else:
-            keys = dict_of_list.keys
-        for key in keys:
-            if isinstance(dict_of_list[key], dict):
-                # recursively convert the dictionary of list to dict of tensor
-                Batch._dict_list_to_tensor(dict_of_list[key], graph)
-                continue
-            item = dict_of_list[key][0]
-            if torch.is_tensor(item):
-                if (
-                    Graph._is_graph_attribute(key)
-                    and item.ndim == 1
-                    and (not item.dtype == torch.long)
-                    and "feature" in key
-                ):
-                    # special consideration: 1D tensor for graph attribute (classification)
-                    # named as: "graph_xx_feature"
-                    # batch by stacking the first dim
-                    dict_of_list[key] = torch.stack(
-                        dict_of_list[key],
-                        dim=0
-                    )
-                else:
-                    # concat at the __cat_dim__
-                    dict_of_list[key] = torch.cat(
-                        dict_of_list[key],
-                        dim=graph.__cat_dim__(key, item)
-                    )
-            elif isinstance(item, (float, int)):
-                dict_of_list[key] = torch.tensor(dict_of_list[key])
+            incs = torch.tensor(incs, dtype=torch.long)
+
+        # offset of graph i is the sum of the increments of graphs 0 .. i - 1
+        offsets = torch.cumsum(incs, dim=0) - incs
+        collated = collated + Batch._expand_offsets(
+            offsets, sizes, cat_dim, collated
+        )
+        return collated, sizes, offsets
 
-    def to_data_list(self):
+    @staticmethod
+    def _expand_offsets(
+        offsets: torch.Tensor,
+        sizes,
+        cat_dim: int,
+        collated: torch.Tensor,
+    ) -> torch.Tensor:
+        r"""
+        Repeats the offset of each graph by the size of its item, such that
+        the result broadcasts against the collated tensor.
+        """
+        offsets = offsets.repeat_interleave(
+            torch.as_tensor(sizes, dtype=torch.long), dim=0
+        ).to(device=collated.device, dtype=collated.dtype)
+        if offsets.ndim == 1:
+            shape = [1] * collated.ndim
+            shape[cat_dim] = -1
+            return offsets.view(shape)
+        # tensor increments broadcast along the concatenation dimension
+        return offsets.transpose(0, cat_dim).squeeze(0)
+
+    def to_data_list(self, lazy: bool = False):
         r"""
         Reconstructs the list of :class:`torch_geometric.data.Data` objects
         from the batch object.
         The batch object must have been created via :meth:`from_data_list` in
         order to be able reconstruct the initial objects.
+
+        The attributes of the returned graphs are views of the batched
+        tensors. Offsets of index attributes are removed with a single
+        subtraction per attribute for all graphs.
+
+        Args:
+            lazy (bool): If set to :obj:`True`, attributes that require
+                removing offsets (such as :obj:`edge_index`) are only
+                computed for a graph when they are first accessed, which
+                saves work when only few attributes of the graphs are used.
+                The returned graphs hold references to the batch.
+
+        Returns:
+            list: List of graphs in the batch.
         """
-        if self.__slices__ is None:
+        if self.__slices__ is None or self.__cumsum__ is None:
             raise RuntimeError(
                 "Cannot reconstruct data list from batch because the "
                 "batch object was not created using Batch.from_data_list()"
             )
 
-        keys = [key for key in self.keys if key[-5:] != "batch"]
-        cumsum = {key: 0 for key in keys}
-        data_list = []
-        for i in range(len(self.__slices__[keys[0]]) - 1):
-            # i: from 0 up to num graphs in the batch
-            data = self.__data_class__()
-            self._reconstruct_dict(
-                i, keys, data, cumsum, self.__slices__, self, data
-            )
-            data_list.append(data)
-
+        keys = [key for key in self.keys if not self._is_batch_key(key)]
+        num_graphs = len(self.__slices__[keys[0]]) - 1
+        graph = self.__data_class__()
+        data_class = self.__data_class__
+        if lazy:
+            data_class = _lazy_class(data_class)
+        data_list = [data_class() for _ in range(num_graphs)]
+        for key in keys:
+            cumsum = self.__cumsum__[key]
+            if lazy and torch.is_tensor(cumsum):
+                # views of the batched tensor, offsets are removed on access
+                values = self._unbatch_values(
+                    key, self[key], self.__slices__[key], None,
+                    graph, num_graphs
+                )
+                offsets = cumsum.tolist() if cumsum.ndim == 1 else cumsum
+                for data, value, offset in zip(data_list, values, offsets):
+                    data._lazy_keys[key] = functools.partial(
+                        self._subtract_offset, value, offset
+                    )
+            elif lazy and self._has_offsets(cumsum):
+                for graph_idx, data in enumerate(data_list):
+                    data._lazy_keys[key] = functools.partial(
+                        self._unbatch_item, key, self[key],
+                        self.__slices__[key], cumsum, graph, graph_idx
+                    )
+            else:
+                values = self._unbatch_values(
+                    key, self[key], self.__slices__[key], cumsum,
+                    graph, num_graphs
+                )
+                for data, value in zip(data_list, values):
+                    data[key] = value
         return data_list
 
-    def _reconstruct_dict(
-            self, graph_idx: int, keys, data_dict,
-            cumsum: Dict[str, int], slices, batched_dict, graph):
+    @staticmethod
+    def _has_offsets(cumsum) -> bool:
+        r"""
+        Whether offsets were added to the (nested) attribute when batching.
+        """
+        if isinstance(cumsum, dict):
+            return any(Batch._has_offsets(value) for value in cumsum.values())
+        return cumsum is not None
 
-        for key in keys:
-            if isinstance(batched_dict[key], dict):
-                # recursively unbatch the dict
-                data_dict[key] = {}
-                inner_keys = [
-                    inner_key
-                    for inner_key in batched_dict[key].keys()
-                    if inner_key[-5:] != "batch"
-                ]
-                inner_cumsum = {inner_key: 0 for inner_key in inner_keys}
-                inner_slices = slices[key]
-                self._reconstruct_dict(
-                    graph_idx, inner_keys,
-                    data_dict[key], inner_cumsum,
-                    inner_slices, batched_dict[key], graph
+    @staticmethod
+    def _unbatch_values(
+        key, batched, slices, cumsum, graph, num_graphs: int
+    ) -> List:
+        r"""
+        Splits a batched attribute into the values of all graphs, removing
+        the offsets with a single subtraction.
+        """
+        if isinstance(batched, dict):
+            # recursively unbatch the dict
+            values = [{} for _ in range(num_graphs)]
+            for inner_key in batched:
+                if Batch._is_batch_key(inner_key):
+                    continue
+                inner_values = Batch._unbatch_values(
+                    inner_key, batched[inner_key], slices[inner_key],
+                    cumsum[inner_key], graph, num_graphs
                 )
-                continue
+                for value, inner_value in zip(values, inner_values):
+                    value[inner_key] = inner_value
+            return values
+
+        if not torch.is_tensor(batched):
+            # each graph contributed one item
+            return [batched[start] for start in slices[:-1]]
+
+        cat_dim = graph.__cat_dim__(key, batched)
+        sizes = [end - start for start, end in zip(slices[:-1], slices[1:])]
+        if cumsum is not None:
+            batched = batched - Batch._expand_offsets(
+                cumsum, sizes, cat_dim, batched
+            )
+        return list(torch.split(batched, sizes, dim=cat_dim))
 
-            if torch.is_tensor(batched_dict[key]):
-                data_dict[key] = batched_dict[key].narrow(
-                    graph.__cat_dim__(key, batched_dict[key]),
-                    slices[key][graph_idx],
-                    slices[key][graph_idx + 1] - slices[key][graph_idx]
-                )
-                if batched_dict[key].dtype != torch.bool:
-                    data_dict[key] = data_dict[key] - cumsum[key]
-            else:
-                data_dict[key] = (
-                    batched_dict[key][
-                        slices[key][graph_idx]:slices[key][graph_idx + 1]
-                    ]
+    @staticmethod
+    def _unbatch_item(key, batched, slices, cumsum, graph, graph_idx: int):
+        r"""
+        Returns the value of a batched attribute for the graph at index
+        :obj:`graph_idx`.
+        """
+        if isinstance(batched, dict):
+            # recursively unbatch the dict
+            return {
+                inner_key: Batch._unbatch_item(
+                    inner_key, batched[inner_key], slices[inner_key],
+                    cumsum[inner_key], graph, graph_idx
                 )
-            cumsum[key] = cumsum[key] + graph.__inc__(key, data_dict[key])
+                for inner_key in batched
+                if not Batch._is_batch_key(inner_key)
+            }
+
+        if not torch.is_tensor(batched):
+            return batched[slices[graph_idx]]
+
+        value = batched.narrow(
+            graph.__cat_dim__(key, batched),
+            slices[graph_idx],
+            slices[graph_idx + 1] - slices[graph_idx]
+        )
+        if cumsum is not None:
+            value = Batch._subtract_offset(value, cumsum[graph_idx])
+        return value
+
+    @staticmethod
+    def _subtract_offset(value: torch.Tensor, offset):
+        r"""
+        Removes the offset added to the value of a graph when batching.
+        """
+        if torch.is_tensor(offset):
+            offset = offset.to(device=value.device, dtype=value.dtype)
+        return value - offset
 
     @property
     def num_graphs(self) -> int:
@@ -271,14 +426,113 @@ class Batch(Graph):
         Returns:
             int: The number of graphs in the batch.
         """
+        if self.ptr is not None:
+            # the offsets live on the device but their size does not
+            # require a synchronization
+            return self.ptr.numel() - 1
         return self.batch[-1].item() + 1
 
+    def pool(
+        self,
+        x: torch.Tensor,
+        reduce: str = "sum",
+        ptr: torch.Tensor = None,
+    ) -> torch.Tensor:
+        r"""
+        Pools node (or edge) level representations into graph level
+        representations by reducing the rows of each graph.
+
+        Args:
+            x (:class:`torch.Tensor`): Representations with one row per node,
+                ordered as in the batch.
+            reduce (str): The reduction, one of :obj:`"sum"`, :obj:`"mean"`
+                and :obj:`"max"`.
+            ptr (:class:`torch.Tensor`, optional): Offsets of the rows of each
+                graph. Defaults to the node offsets :obj:`ptr`, pass e.g.
+                :obj:`edge_index_ptr` to pool edge representations.
+
+        Returns:
+            :class:`torch.Tensor`: Tensor of shape `[num_graphs, *]`.
+        """
+        if ptr is None:
+            ptr = self.ptr
+        if ptr is None:
+            raise ValueError(
+                "Batch has no offsets, create it by Batch.from_data_list()."
+            )
+        return self.segment_pool(x, ptr, reduce)
+
+    @staticmethod
+    def segment_pool(
+        x: torch.Tensor,
+        ptr: torch.Tensor,
+        reduce: str = "sum",
+    ) -> torch.Tensor:
+        r"""
+        Reduces the contiguous segments :obj:`x[ptr[i]:ptr[i + 1]]` without
+        scattering (and hence without atomic operations). Empty segments
+        are reduced to zeros.
+
+        Args:
+            x (:class:`torch.Tensor`): The tensor to be reduced along its
+                first dimension.
+            ptr (:class:`torch.Tensor`): Segment offsets of length
+                `num_segments + 1`, starting at 0 and ending at `x.size(0)`.
+            reduce (str): The reduction, one of :obj:`"sum"`, :obj:`"mean"`
+                and :obj:`"max"`.
+
+        Returns:
+            :class:`torch.Tensor`: Tensor of shape `[num_segments, *]`.
+        """
+        if reduce not in ["sum", "mean", "max"]:
+            raise ValueError("reduce must be one of 'sum', 'mean' and 'max'.")
+        ptr = ptr.to(x.device)
+        counts = ptr[1:] - ptr[:-1]
+        if hasattr(torch, "segment_reduce") and x.is_floating_point():
+            out = torch.segment_reduce(x, reduce, offsets=ptr, axis=0)
+            if reduce != "sum":
+                # mean and max of empty segments are nan and -inf
+                empty = (counts == 0).view([-1] + [1] * (x.ndim - 1))
+                out = out.masked_fill(empty, 0)
+            return out
+
+        # pad the segments into a dense [num_segments, max_count, *] tensor
+        num_segments = counts.numel()
+        max_count = int(counts.max()) if num_segments > 0 else 0
+        segment = torch.arange(
+            num_segments, device=x.device
+        ).repeat_interleave(counts)
+        position = (
+            torch.arange(x.size(0), device=x.device) - ptr[:-1][segment]
+        )
+        fill_value = 0
+        if reduce == "max":
+            fill_value = (
+                float("-inf") if x.is_floating_point()
+                else torch.iinfo(x.dtype).min
+            )
+        dense = x.new_full(
+            (num_segments, max_count) + tuple(x.shape[1:]), fill_value
+        )
+        dense[segment, position] = x
+        if reduce == "max":
+            out = dense.max(dim=1)[0]
+            empty = (counts == 0).view([-1] + [1] * (x.ndim - 1))
+            return out.masked_fill(empty, 0)
+        out = dense.sum(dim=1)
+        if reduce == "mean":
+            out = out / counts.clamp(min=1).view(
+                [-1] + [1] * (x.ndim - 1)
+            ).to(out.dtype)
+        return out
+
     def apply_transform(
         self,
         transform,
         update_tensor: bool = True,
         update_graph: bool = False,
         deep_copy: bool = False,
+        update_keys: List[str] = None,
         **kwargs
     ):
         r"""
@@ -297,6 +551,7 @@ class Batch(Graph):
             deep_copy: :obj:`True` if a new deep copy of batch is returned.
                 This option allows modifying the batch of graphs without
                 changing the graphs in the original dataset.
+            update_keys: If specified, only these attributes are synced.
             kwargs: Parameters used in transform function in :class:`deepsnap.graph.Graph` objects.
 
         Returns:
@@ -307,7 +562,8 @@ class Batch(Graph):
         return self.from_data_list(
             [
                 Graph(graph).apply_transform(
-                    transform, update_tensor, update_graph, deep_copy, **kwargs
+                    transform, update_tensor, update_graph, deep_copy,
+                    update_keys=update_keys, **kwargs
                 )
                 for graph in self.G
             ]
@@ -319,6 +575,7 @@ class Batch(Graph):
         update_tensors: bool = True,
         update_graphs: bool = False,
         deep_copy: bool = False,
+        update_keys: List[str] = None,
         **kwargs
     ):
         r"""
@@ -340,10 +597,81 @@ class Batch(Graph):
                 *[
                     Graph(graph).apply_transform_multi(
                         transform, update_tensors, update_graphs,
-                        deep_copy, **kwargs,
+                        deep_copy, update_keys=update_keys, **kwargs,
                     )
                     for graph in self.G
                 ]
             )
         )
         return (self.from_data_list(g_list) for g_list in g_lists)
+
+
+class _LazyGraph(object):
+    r"""
+    Mixin for graphs returned by :meth:`Batch.to_data_list` with
+    :obj:`lazy=True`, whose pending attributes are computed on first access.
+    """
+    def __init__(self, *args, **kwargs):
+        self._lazy_keys = {}
+        super(_LazyGraph, self).__init__(*args, **kwargs)
+
+    def __getattr__(self, key):
+        # only called if the attribute is not (yet) set
+        lazy_keys = self.__dict__.get("_lazy_keys")
+        if not lazy_keys or key not in lazy_keys:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{key}'"
+            )
+        value = lazy_keys.pop(key)()
+        self[key] = value
+        return value
+
+    @property
+    def keys(self):
+        keys = super(_LazyGraph, self).keys
+        lazy_keys = self.__dict__.get("_lazy_keys")
+        if lazy_keys:
+            # pending attributes might have been overwritten by the user
+            keys = keys + [key for key in lazy_keys if key not in keys]
+        return keys
+
+    def __copy__(self):
+        # copies keep the pending attributes pending
+        graph = self.__class__.__new__(self.__class__)
+        graph.__dict__.update(self.__dict__)
+        graph._lazy_keys = dict(self.__dict__.get("_lazy_keys") or {})
+        return graph
+
+    def __reduce__(self):
+        # the pending attributes are computed before pickling (e.g. to send
+        # the graph to worker processes), and the lazy class is created
+        # again by the process loading the graph
+        for key in list(self.__dict__.get("_lazy_keys") or {}):
+            getattr(self, key)
+        state = self.__dict__.copy()
+        state["_lazy_keys"] = {}
+        data_class = self.__class__.__bases__[1]
+        return _new_lazy_graph, (data_class,), state
+
+
+_lazy_classes = {}
+
+
+def _lazy_class(data_class):
+    r"""
+    Returns the (cached) lazy variant of a graph class.
+    """
+    if data_class not in _lazy_classes:
+        _lazy_classes[data_class] = type(
+            f"Lazy{data_class.__name__}", (_LazyGraph, data_class), {}
+        )
+    return _lazy_classes[data_class]
+
+
+def _new_lazy_graph(data_class):
+    r"""
+    Creates an empty graph of the lazy variant of :obj:`data_class`, used
+    to unpickle lazy graphs.
+    """
+    lazy_class = _lazy_class(data_class)
+    return lazy_class.__new__(lazy_class)
@@ -0,0 +1,281 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import uuid
+import numpy as np
+import torch
+from deepsnap.graph import Graph
+from deepsnap.hetero_graph import HeteroGraph
+from deepsnap.packed import PackedGraphs
+from typing import (
+    Dict,
+    List,
+)
+
+
+class TransformCache(object):
+    r"""
+    Disk cache of transformed graphs, used by
+    :meth:`deepsnap.dataset.GraphDataset.apply_transform` with
+    :obj:`cache_dir`. An entry is keyed by a fingerprint of the input
+    graphs, the code of the transform and its parameters. The transformed
+    graphs are stored as :class:`deepsnap.packed.PackedGraphs` and memory
+    mapped when they are loaded.
+
+    The fingerprint of the input graphs covers their tensors and other
+    attributes, but not the non-tensor attributes of their NetworkX graphs.
+    The fingerprint of the transform covers its source code (or bytecode),
+    default arguments, closure variables and the attributes of the object
+    of a bound method, but not the functions it calls. Transforms that draw
+    random numbers return the same graphs on every hit. Graphs with custom
+    node ids of :obj:`G` are not cached, since they are not packed.
+
+    Args:
+        cache_dir (str): The directory of the cache, created if it does
+            not exist.
+        max_bytes (int, optional): Maximum total size of the entries. The
+            least recently used entries are removed when it is exceeded.
+    """
+    # version of the fingerprint, entries of other versions are not hit
+    VERSION = 1
+
+    def __init__(self, cache_dir: str, max_bytes: int = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def fingerprint(
+        self, graphs: List[Graph], transform, **params
+    ) -> str:
+        r"""
+        Computes the key of transforming the graphs.
+
+        Args:
+            graphs (list): The input graphs.
+            transform: The transform function.
+            **params: Other parameters of the transform, e.g. its keyword
+                arguments and the sync flags of :meth:`apply_transform`.
+
+        Returns:
+            str: The hexadecimal fingerprint.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        _hash_value(h, self.VERSION)
+        _hash_function(h, transform)
+        _hash_value(h, params)
+        _hash_value(h, len(graphs))
+        for graph in graphs:
+            _hash_graph(h, graph)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> List[Graph]:
+        r"""
+        Returns the cached graphs of :obj:`key`, or :obj:`None` if they are
+        not cached.
+        """
+        path = self._path(key)
+        manifest = os.path.join(path, "manifest.json")
+        if not os.path.isfile(manifest):
+            return None
+        graphs = PackedGraphs.load(path, mmap=True).to_graphs()
+        # mark the entry as recently used
+        os.utime(manifest)
+        return graphs
+
+    def save(self, key: str, graphs: List[Graph]) -> bool:
+        r"""
+        Stores the graphs as the entry :obj:`key` and removes the least
+        recently used entries if the cache exceeds :obj:`max_bytes`.
+
+        Returns:
+            bool: Whether the graphs were stored. Heterogeneous graphs,
+            graphs with custom node ids and graphs with attributes that can
+            not be packed are not stored.
+        """
+        if any(
+            isinstance(graph, HeteroGraph) or graph._node_ids is not None
+            for graph in graphs
+        ):
+            # custom node ids of G are not packed
+            return False
+        try:
+            packed = PackedGraphs(graphs)
+        except (ValueError, RuntimeError):
+            return False
+        # written to a temporary directory that is renamed at once, such
+        # that concurrent processes do not see partial entries
+        tmp_path = self._path(f".tmp-{key}-{uuid.uuid4().hex}")
+        try:
+            packed.save(tmp_path)
+        except ValueError:
+            # e.g. non-tensor attributes that are not JSON serializable
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+        try:
+            os.rename(tmp_path, self._path(key))
+        except OSError:
+            # stored by another process in the meantime
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self.evict(keep=key)
+        return True
+
+    def entries(self) -> Dict[str, Dict[str, float]]:
+        r"""
+        Returns:
+            dict: The :obj:`"size"` in bytes and the :obj:`"last_used"`
+            time of each entry.
+        """
+        entries = {}
+        for key in os.listdir(self.cache_dir):
+            manifest = os.path.join(self._path(key), "manifest.json")
+            if key.startswith(".") or not os.path.isfile(manifest):
+                continue
+            size = sum(
+                entry.stat().st_size for entry in os.scandir(self._path(key))
+            )
+            entries[key] = {
+                "size": size, "last_used": os.path.getmtime(manifest),
+            }
+        return entries
+
+    def evict(self, keep: str = None):
+        r"""
+        Removes the least recently used entries (except :obj:`keep`) until
+        the total size is at most :obj:`max_bytes`.
+        """
+        if self.max_bytes is None:
+            return
+        entries = self.entries()
+        total = sum(entry["size"] for entry in entries.values())
+        for key in sorted(entries, key=lambda key: entries[key]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            total -= entries[key]["size"]
+
+    def clear(self):
+        r"""
+        Removes all entries.
+        """
+        for key in self.entries():
+            shutil.rmtree(self._path(key), ignore_errors=True)
+
+
+def _hash_graph(h, graph: Graph):
+    # the tensors of G backed graphs are synced first
+    graph._update_tensors()
+    _hash_value(h, (type(graph).__name__, graph.num_nodes))
+    _hash_value(h, graph.is_directed())
+    for key in sorted(graph.keys):
+        if key != "G":
+            _hash_value(h, key)
+            _hash_value(h, graph[key])
+
+
+def _hash_function(h, func, seen=None):
+    if seen is None:
+        seen = set()
+    if ("function", id(func)) in seen:
+        # e.g. a recursive function, referring to itself in its closure
+        h.update(b"<recursive>")
+        return
+    seen.add(("function", id(func)))
+    if isinstance(func, functools.partial):
+        _hash_function(h, func.func, seen)
+        _hash_value(h, (func.args, func.keywords), seen)
+        return
+    if inspect.ismethod(func):
+        # the state of the bound object, e.g. Scale(2).apply
+        _hash_function(h, func.__func__, seen)
+        _hash_object(h, func.__self__, seen)
+        return
+    code = getattr(func, "__code__", None)
+    if code is None:
+        call = getattr(type(func), "__call__", None)
+        if inspect.isfunction(call):
+            # a callable object, fingerprinted by its class and attributes
+            _hash_function(h, call, seen)
+            _hash_object(h, func, seen)
+        else:
+            # e.g. a builtin function
+            _hash_value(h, (
+                getattr(func, "__module__", None),
+                getattr(func, "__qualname__", repr(func)),
+            ), seen)
+        return
+    _hash_value(h, (func.__module__, func.__qualname__), seen)
+    try:
+        _hash_value(h, inspect.getsource(func), seen)
+    except (OSError, TypeError):
+        _hash_value(h, (code.co_code, code.co_consts, code.co_names), seen)
+    _hash_value(h, (func.__defaults__, func.__kwdefaults__), seen)
+    if func.__closure__ is not None:
+        for cell in func.__closure__:
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                # a variable of the enclosing function that is not set yet
+                h.update(b"<empty>")
+                continue
+            _hash_value(h, contents, seen)
+
+
+def _hash_object(h, obj, seen):
+    state = getattr(obj, "__dict__", None)
+    if state is None or isinstance(obj, type) or inspect.ismodule(obj):
+        if callable(obj) and not isinstance(obj, type):
+            _hash_pickle(h, obj)
+        else:
+            _hash_value(h, obj, seen)
+        return
+    if ("object", id(obj)) in seen:
+        h.update(b"<recursive>")
+        return
+    seen.add(("object", id(obj)))
+    _hash_value(h, (type(obj).__module__, type(obj).__qualname__), seen)
+    _hash_value(h, state, seen)
+
+
+def _hash_pickle(h, value):
+    try:
+        h.update(pickle.dumps(value))
+    except Exception:
+        # e.g. objects holding locks, which are never hit again
+        h.update(repr(value).encode())
+
+
+def _hash_value(h, value, seen=None):
+    if torch.is_tensor(value):
+        value = value.detach().cpu()
+        if value.dtype == torch.bfloat16:
+            value = value.view(torch.int16)
+        _hash_value(h, ("tensor", str(value.dtype), tuple(value.shape)))
+        h.update(np.ascontiguousarray(value.numpy()).data)
+    elif isinstance(value, np.ndarray):
+        _hash_value(h, ("ndarray", str(value.dtype), value.shape))
+        h.update(np.ascontiguousarray(value).data)
+    elif value is None or isinstance(value, (bool, int, float, str, bytes)):
+        h.update(repr(value).encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}(".encode())
+        for item in value:
+            _hash_value(h, item, seen)
+        h.update(b")")
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}(".encode())
+        for key in sorted(value, key=repr):
+            _hash_value(h, key, seen)
+            _hash_value(h, value[key], seen)
+        h.update(b")")
+    elif callable(value):
+        _hash_function(h, value, seen)
+    else:
+        _hash_pickle(h, value)
@@ -1,11 +1,16 @@
 import copy
 import math
-import random
+import pickle
+import threading
+import warnings
 import networkx as nx
 import numpy as np
 import torch
+import torch.multiprocessing as mp
+from deepsnap.cache import TransformCache
 from deepsnap.graph import Graph
 from deepsnap.hetero_graph import HeteroGraph
+from deepsnap.packed import PackedGraphs
 import pdb
 from typing import (
     List,
@@ -36,12 +41,30 @@ class Generator(object):
 
     def _get_size(self, size=None):
         if size is None:
-            return np.random.choice(
+            return self._random_state().choice(
                 self.sizes, size=1, replace=True, p=self.size_prob
             )[0]
         else:
             return size
 
+    def seed(self, seed: int):
+        r"""
+        Seeds the random choices of the generator (e.g. of the graph sizes).
+        Subclasses using other sources of randomness in :meth:`generate`
+        can override this method to seed them as well.
+
+        Args:
+            seed (int): The seed, which is smaller than 2 ** 32.
+        """
+        self._numpy_random_state = np.random.RandomState(seed)
+
+    def _random_state(self):
+        r"""
+        Returns the numpy random state set by :meth:`seed`, or the global
+        numpy random state if the generator is not seeded.
+        """
+        return getattr(self, "_numpy_random_state", None) or np.random
+
     @property
     def num_node_labels(self):
         return 0
@@ -144,9 +167,26 @@ class EnsembleGenerator(Generator):
         Returns:
             list: Generated list of :class:`deepsnap.graph.Graph` objects.
         """
-        gen = np.random.choice(self.generators, 1, p=self.gen_prob)[0]
+        gen = self._random_state().choice(
+            self.generators, 1, p=self.gen_prob
+        )[0]
         return gen.generate(**kwargs)
 
+    def seed(self, seed: int):
+        r"""
+        Seeds the choice of the generators and each of the generators
+        (with seeds derived from :obj:`seed`).
+
+        Args:
+            seed (int): The seed, which is smaller than 2 ** 32.
+        """
+        super(EnsembleGenerator, self).seed(seed)
+        seeds = np.random.SeedSequence(seed).generate_state(
+            len(self.generators)
+        )
+        for gen, gen_seed in zip(self.generators, seeds):
+            gen.seed(int(gen_seed))
+
 
 class GraphDataset(object):
     r"""
@@ -166,6 +206,29 @@ class GraphDataset(object):
             # TODO: add comments for custom_split_graphs
             edge_negative_sampling_ratio (float): The number of negative samples compared
                 to that of positive data.
+            negative_sampling_mode (str): Whether to use (negative_sampling_mode =
+                "random": negative edges are random node pairs;
+                or "tail": the source node of each positive edge is kept and
+                edge_negative_sampling_ratio (an integer) negative target nodes
+                are sampled for it, see :meth:`deepsnap.graph.Graph._create_neg_sampling`).
+            negative_sampler (:class:`deepsnap.negative_sampling.NegativeSampler`): The
+                strategy drawing negative edges, e.g. degree biased or k-hop "hard" negatives.
+                Uniformly random negative edges are sampled if not specified. If the
+                sampler draws too few distinct negative edges, e.g. in small or dense
+                graphs, the remaining ones are sampled uniformly with a warning.
+            negative_resampling (str): When the negative edges of the training
+                graphs are resampled in link prediction (negative_resampling =
+                "access": the negative edges of a graph are resampled whenever it is accessed;
+                or "epoch": the negative edges of all graphs are resampled once per epoch by
+                :meth:`new_epoch`).
+            prefetch_negatives (bool): Whether :meth:`new_epoch` samples the negative
+                edges of the next epoch in a background thread. Only available when
+                negative_resampling is "epoch".
+            seed (int): If specified, splits, negative sampling, disjoint resampling and
+                on-the-fly generation are reproducible. They draw from independent random
+                streams derived from the seed, the split, the DataLoader worker and the
+                epoch (advanced by :meth:`new_epoch`). Otherwise the global random number
+                generators are used.
             edge_message_ratio (float): The number of message-passing edges
                 compared to that of training edge objectives.
             edge_train_mode (str): Whether to use (edge_train_mode = 'all':
@@ -193,6 +256,11 @@ class GraphDataset(object):
         edge_split_mode: str = 'exact',
         minimum_node_per_graph: int = 5,
         generator=None,
+        negative_sampling_mode: str = 'random',
+        negative_sampler=None,
+        negative_resampling: str = 'access',
+        prefetch_negatives: bool = False,
+        seed: int = None,
     ):
 
         if graphs is not None:
@@ -229,6 +297,46 @@ class GraphDataset(object):
                 "`edge_split_mode` must be 'exact' or 'approximate'"
             )
 
+        # validity check for `negative_sampling_mode`
+        if negative_sampling_mode not in ["random", "tail"]:
+            raise ValueError(
+                "`negative_sampling_mode` must be 'random' or 'tail'"
+            )
+        if negative_sampling_mode == "tail" and (
+            edge_negative_sampling_ratio < 1
+            or int(edge_negative_sampling_ratio)
+            != edge_negative_sampling_ratio
+        ):
+            raise ValueError(
+                "`edge_negative_sampling_ratio` must be a positive integer "
+                "when `negative_sampling_mode` is 'tail'."
+            )
+        if negative_sampling_mode == "tail" and graphs is not None and any(
+            isinstance(graph, HeteroGraph) for graph in graphs
+        ):
+            # TODO: add support for heterogeneous graph
+            raise ValueError(
+                "`negative_sampling_mode` 'tail' is not supported "
+                "for heterogeneous graphs."
+            )
+        # validity check for `negative_resampling`
+        if negative_resampling not in ["access", "epoch"]:
+            raise ValueError(
+                "`negative_resampling` must be 'access' or 'epoch'"
+            )
+        if prefetch_negatives and negative_resampling != "epoch":
+            raise ValueError(
+                "`prefetch_negatives` is only available when "
+                "`negative_resampling` is 'epoch'."
+            )
+        if negative_sampler is not None and graphs is not None and any(
+            isinstance(graph, HeteroGraph) for graph in graphs
+        ):
+            # TODO: add support for heterogeneous graph
+            raise ValueError(
+                "`negative_sampler` is not supported for heterogeneous graphs."
+            )
+
         # validity check for disjoint_split_mode
         if disjoint_split_mode not in ["random", "custom"]:
             raise ValueError(
@@ -256,11 +364,21 @@ class GraphDataset(object):
         self.custom_split_graphs = custom_split_graphs
         self.edge_message_ratio = edge_message_ratio
         self.edge_negative_sampling_ratio = edge_negative_sampling_ratio
+        self.negative_sampling_mode = negative_sampling_mode
+        self.negative_sampler = negative_sampler
+        self.negative_resampling = negative_resampling
+        self.prefetch_negatives = prefetch_negatives
+        self.seed = seed
         self.edge_train_mode = edge_train_mode
         self.edge_split_mode = edge_split_mode
         self.minimum_node_per_graph = minimum_node_per_graph
         self._resample_negatives = False
         self._split_types = None
+        self._negative_prefetch = None
+        # random streams derived from the seed
+        self._epoch = 0
+        self._split_index = 0
+        self._stream_generators = {}
 
         # graphs preprocessing
         if graphs is None or len(graphs) == 0:
@@ -464,6 +582,11 @@ class GraphDataset(object):
         split_graphs = [[] for x in range(split_num)]
         for i in range(len(self.graphs)):
             graph = self.graphs[i]
+            if torch.is_tensor(graph.custom_splits[0]):
+                split_graph = self._custom_split_link_pred_tensor(graph)
+                for j in range(split_num):
+                    split_graphs[j].append(split_graph[j])
+                continue
             graph_train = copy.copy(graph)
 
             edges_train = graph_train.custom_splits[0]
@@ -509,8 +632,51 @@ class GraphDataset(object):
 
         return split_graphs
 
+    def _custom_split_link_pred_tensor(self, graph):
+        r"""
+        Tensor counterpart of :meth:`_custom_split_link_pred` for a graph
+        whose custom splits are tensors of node indices. The split graphs
+        are gathered from the edge tensors of the graph instead of being
+        rebuilt as NetworkX graphs.
+        """
+        edges = graph._unique_edges()
+        edge_ids = [
+            graph._edge_index_to_ids(split) for split in graph.custom_splits
+        ]
+
+        graph_train = graph._edge_subgraph_from_ids(edges, edge_ids[0])
+        graph_train.custom_disjoint_split = graph.custom_disjoint_split
+        graph_val = copy.copy(graph_train)
+        graph._create_label_link_pred_tensor(
+            graph_train, edges, edge_ids[0], edge_ids[0]
+        )
+        graph._create_label_link_pred_tensor(
+            graph_val, edges, edge_ids[0], edge_ids[1]
+        )
+        if len(edge_ids) == 3:
+            edges_message = torch.cat([edge_ids[0], edge_ids[1]])
+            graph_test = graph._edge_subgraph_from_ids(edges, edges_message)
+            graph._create_label_link_pred_tensor(
+                graph_test, edges, edges_message, edge_ids[2]
+            )
+            return [graph_train, graph_val, graph_test]
+        return [graph_train, graph_val]
+
     def _custom_split_link_pred_disjoint(self, graph_train):
         objective_edges = graph_train.custom_disjoint_split
+        if torch.is_tensor(objective_edges):
+            edges = graph_train._unique_edges()
+            objective_ids = graph_train._edge_index_to_ids(objective_edges)
+            is_message = torch.ones(graph_train.num_edges, dtype=torch.bool)
+            is_message[objective_ids] = False
+            message_ids = torch.nonzero(is_message).view(-1)
+            graph_message = graph_train._edge_subgraph_from_ids(
+                edges, message_ids
+            )
+            graph_train._create_label_link_pred_tensor(
+                graph_message, edges, message_ids, objective_ids
+            )
+            return graph_message
         message_edges = list(set(graph_train.G.edges) - set(objective_edges))
         graph_train = Graph(
             graph_train._edge_subgraph_with_isonodes(
@@ -527,6 +693,9 @@ class GraphDataset(object):
         self,
         split_ratio: List[float],
         split_types: List[str] = None,
+        generator: torch.Generator = None,
+        num_workers: int = 0,
+        chunksize: int = None,
     ) -> List[Graph]:
         r"""
         Split the dataset assuming training process is transductive.
@@ -534,6 +703,9 @@ class GraphDataset(object):
         Args:
             split_ratio: number of data splitted into train, validation
                 (and test) set.
+            generator: the random number generator used for splitting.
+            num_workers: number of worker processes splitting the graphs.
+            chunksize: number of graphs sent to a worker at once.
 
         Returns:
             list: A list of 3 (2) lists of :class:`deepsnap.graph.Graph` object corresponding
@@ -542,6 +714,28 @@ class GraphDataset(object):
         if self.task == "graph":
             raise ValueError('Graph prediction task cannot be transductive')
 
+        if (
+            num_workers > 0
+            and self.general_split_mode == "random"
+            and not (
+                self.task == "link_pred"
+                and self.edge_train_mode == "disjoint"
+                and self.disjoint_split_mode == "custom"
+            )
+        ):
+            # each graph is split and its negative edges are sampled in
+            # a worker process
+            split_graphs = _map_graphs(
+                _split_graph_transductive, self.graphs,
+                (split_ratio, split_types, self._split_params()),
+                num_workers, chunksize,
+                items=self._graph_seeds(len(self.graphs), generator),
+            )
+            split_graphs = list(map(list, zip(*split_graphs)))
+            return self._split_datasets(
+                split_graphs, split_types, negative_sampling=False
+            )
+
         # a list of split graphs
         # (e.g. [[train graph, val graph, test graph], ... ])
         if self.general_split_mode == "custom":
@@ -578,10 +772,13 @@ class GraphDataset(object):
                             task=self.task,
                             split_types=split_types,
                             split_ratio=split_ratio,
-                            edge_split_mode=self.edge_split_mode
+                            edge_split_mode=self.edge_split_mode,
+                            generator=generator,
                         )
                     else:
-                        split_graph = graph.split(self.task, split_ratio)
+                        split_graph = graph.split(
+                            self.task, split_ratio, generator
+                        )
                 else:
                     raise TypeError(
                         "element in self.graphs of unexpected type"
@@ -620,11 +817,12 @@ class GraphDataset(object):
                             graph = graph.split_link_pred(
                                 split_types=split_types,
                                 split_ratio=self.edge_message_ratio,
-                                edge_split_mode=self.edge_split_mode
+                                edge_split_mode=self.edge_split_mode,
+                                generator=generator,
                             )[1]
                         else:
                             graph = graph.split_link_pred(
-                                self.edge_message_ratio
+                                self.edge_message_ratio, generator
                             )[1]
                         split_graphs[0][i] = graph
                     else:
@@ -632,40 +830,15 @@ class GraphDataset(object):
                             "element in self.graphs of unexpected type"
                         )
 
-        # list of num_splits datasets
-        # (e.g. [train dataset, val dataset, test dataset])
-        dataset_return = []
-        for x in split_graphs:
-            dataset_current = copy.copy(self)
-            dataset_current.graphs = x
-            if self.task == "link_pred":
-                for graph_temp in dataset_current.graphs:
-                    if isinstance(graph_temp, Graph):
-                        if isinstance(graph_temp, HeteroGraph):
-                            graph_temp._create_neg_sampling(
-                                negative_sampling_ratio=(
-                                    self.edge_negative_sampling_ratio
-                                ),
-                                split_types=split_types
-                            )
-                        else:
-                            graph_temp._create_neg_sampling(
-                                self.edge_negative_sampling_ratio
-                            )
-                    else:
-                        raise TypeError(
-                            "element in self.graphs of unexpected type"
-                        )
-            dataset_return.append(dataset_current)
-
-        # resample negatives for train split (only for link prediction)
-        dataset_return[0]._resample_negatives = True
-        return dataset_return
+        return self._split_datasets(split_graphs, split_types, generator)
 
     def _split_inductive(
         self,
         split_ratio: List[float],
         split_types: List[str] = None,
+        generator: torch.Generator = None,
+        num_workers: int = 0,
+        chunksize: int = None,
     ) -> List[Graph]:
         r"""
         Split the dataset assuming training process is inductive.
@@ -673,6 +846,10 @@ class GraphDataset(object):
         Args:
             split_ratio: number of data splitted into train, validation
                 (and test) set.
+            generator: the random number generator used for splitting.
+            num_workers: number of worker processes creating the link
+                prediction objectives of the graphs.
+            chunksize: number of graphs sent to a worker at once.
 
         Returns:
             List[Graph]: a list of 3 (2) lists of graph object corresponding to train, validation (and test) set.
@@ -687,7 +864,7 @@ class GraphDataset(object):
                     "number of splitted parts"
                 )
 
-            self._shuffle()
+            self._shuffle(generator)
             # a list of num_splits list of graphs
             # (e.g. [train graphs, val graphs, test graphs])
             split_graphs = []
@@ -718,6 +895,29 @@ class GraphDataset(object):
             # message passing and objective.
             elif self.edge_train_mode == "all":
                 split_start = 1
+            if num_workers > 0:
+                # the objectives and negative edges of each graph are
+                # created in a worker process
+                graphs = [graph for split in split_graphs for graph in split]
+                seeds = iter(self._graph_seeds(len(graphs), generator))
+                items = [
+                    (next(seeds), i >= split_start)
+                    for i, split in enumerate(split_graphs)
+                    for _ in split
+                ]
+                graphs = _map_graphs(
+                    _split_graph_inductive, graphs,
+                    (split_types, self._split_params()),
+                    num_workers, chunksize, items=items,
+                )
+                sizes = [len(split) for split in split_graphs]
+                split_graphs = []
+                for size in sizes:
+                    split_graphs.append(graphs[:size])
+                    graphs = graphs[size:]
+                return self._split_datasets(
+                    split_graphs, split_types, negative_sampling=False
+                )
             for i in range(split_start, len(split_graphs)):
                 for j in range(len(split_graphs[i])):
                     if isinstance(split_graphs[i][j], Graph):
@@ -726,13 +926,14 @@ class GraphDataset(object):
                                 split_graphs[i][j].split_link_pred(
                                     split_types,
                                     self.edge_message_ratio,
-                                    self.edge_split_mode
+                                    self.edge_split_mode,
+                                    generator,
                                 )[1]
                             )
                         else:
                             split_graphs[i][j] = (
                                 split_graphs[i][j].split_link_pred(
-                                    self.edge_message_ratio
+                                    self.edge_message_ratio, generator
                                 )[1]
                             )
                     else:
@@ -740,25 +941,43 @@ class GraphDataset(object):
                             "element in self.graphs of unexpected type."
                         )
 
+        return self._split_datasets(split_graphs, split_types, generator)
+
+    def _split_datasets(
+        self,
+        split_graphs: List[List[Graph]],
+        split_types: List[str] = None,
+        generator: torch.Generator = None,
+        negative_sampling: bool = True,
+    ) -> List["GraphDataset"]:
+        r"""
+        Creates the datasets of the split graphs and, for link prediction,
+        samples the negative edges of their objectives.
+
+        Args:
+            split_graphs: lists of graphs of the train, validation
+                (and test) set.
+            negative_sampling: whether the negative edges still need to be
+                sampled.
+
+        Returns:
+            list: The train, validation (and test) datasets.
+        """
+        params = self._split_params()
         # list of num_splits datasets
+        # (e.g. [train dataset, val dataset, test dataset])
         dataset_return = []
-        for graphs in split_graphs:
+        for i, graphs in enumerate(split_graphs):
             dataset_current = copy.copy(self)
             dataset_current.graphs = graphs
-            if self.task == "link_pred":
+            dataset_current._split_index = i
+            dataset_current._stream_generators = {}
+            if self.task == "link_pred" and negative_sampling:
                 for graph_temp in dataset_current.graphs:
                     if isinstance(graph_temp, Graph):
-                        if isinstance(graph_temp, HeteroGraph):
-                            graph_temp._create_neg_sampling(
-                                negative_sampling_ratio=(
-                                    self.edge_negative_sampling_ratio
-                                ),
-                                split_types=split_types
-                            )
-                        else:
-                            graph_temp._create_neg_sampling(
-                                self.edge_negative_sampling_ratio
-                            )
+                        _create_neg_sampling(
+                            graph_temp, generator, split_types, params
+                        )
                     else:
                         raise TypeError(
                             "element in self.graphs of unexpected type"
@@ -767,23 +986,61 @@ class GraphDataset(object):
 
         # resample negatives for train split (only for link prediction)
         dataset_return[0]._resample_negatives = True
-
         return dataset_return
 
+    def _split_params(self):
+        r"""
+        Parameters of the dataset used to split a graph, which are sent to
+        the worker processes of a parallel split.
+        """
+        return {
+            "task": self.task,
+            "edge_split_mode": self.edge_split_mode,
+            "edge_message_ratio": self.edge_message_ratio,
+            "edge_train_mode": self.edge_train_mode,
+            "disjoint_split_mode": self.disjoint_split_mode,
+            "edge_negative_sampling_ratio": self.edge_negative_sampling_ratio,
+            "negative_sampling_mode": self.negative_sampling_mode,
+            "negative_sampler": self.negative_sampler,
+        }
+
+    def _graph_seeds(self, num_graphs: int, generator: torch.Generator):
+        r"""
+        Draws a seed for each graph of a parallel split, such that the
+        split does not depend on the number of workers.
+        """
+        return torch.randint(
+            2 ** 63 - 1, (num_graphs,), generator=generator
+        ).tolist()
+
     def split(
         self,
         transductive: bool = True,
         split_ratio: List[float] = None,
         split_types: Union[str, List[str]] = None,
+        num_workers: int = 0,
+        chunksize: int = None,
     ) -> List[Graph]:
         r""" Split datasets into train, validation (and test) set.
 
+        With :obj:`num_workers > 0` the graphs are split (and the negative
+        edges of link prediction are sampled) in a pool of worker processes,
+        see :meth:`apply_transform`. Each graph draws from a random stream
+        of its own, hence the splits are reproducible with a :obj:`seed`
+        regardless of :obj:`num_workers` and :obj:`chunksize`, but differ
+        from the splits with :obj:`num_workers=0`. Custom splits are
+        created in the main process.
+
         Args:
             transductive: whether the training process is transductive
                 or inductive. Inductive split is always used for graph-level tasks (
                 self.task == 'graph').
             split_ratio: number of data splitted into train, validation
                 (and test) set.
+            num_workers (int): Number of worker processes, 0 to split the
+                graphs in the main process.
+            chunksize (int, optional): Number of graphs sent to a worker at
+                once.
 
         Returns:
             list: a list of 3 (2) lists of :class:`deepsnap.graph.Graph` objects corresponding to train, validation (and test) set.
@@ -821,13 +1078,14 @@ class GraphDataset(object):
 
         # list of num_splits datasets
         dataset_return = []
+        generator = self._stream_generator(self._SPLIT_STREAM, cached=False)
         if transductive and self.task != "graph":
-            dataset_return = (
-                self._split_transductive(split_ratio, split_types)
+            dataset_return = self._split_transductive(
+                split_ratio, split_types, generator, num_workers, chunksize
             )
         elif not transductive and self.task in ["graph", "link_pred"]:
-            dataset_return = (
-                self._split_inductive(split_ratio, split_types)
+            dataset_return = self._split_inductive(
+                split_ratio, split_types, generator, num_workers, chunksize
             )
         else:
             raise ValueError(
@@ -849,9 +1107,31 @@ class GraphDataset(object):
                 "Resampling disjoint is not needed for on-the-fly dataset. "
                 "Split the on-the-fly data as the batch arrives."
             )
+        if self._negative_prefetch is not None:
+            # negative edges sampled ahead are for the previous objectives
+            self._negative_prefetch[0].join()
+            self._negative_prefetch = None
+        generator = self._stream_generator(self._DISJOINT_STREAM)
         graphs = []
         for graph in self.graphs:
-            graphs.append(graph.resample_disjoint(self.edge_message_ratio))
+            num_positive_examples = graph._num_positive_examples
+            graph = graph.resample_disjoint(
+                self.edge_message_ratio, generator
+            )
+            if (
+                self.task == "link_pred"
+                and num_positive_examples is not None
+                and not isinstance(graph, HeteroGraph)
+                and graph._num_positive_examples is None
+            ):
+                # negative edges of the new objective edges
+                graph._create_neg_sampling(
+                    self.edge_negative_sampling_ratio,
+                    generator=self._stream_generator(self._NEGATIVE_STREAM),
+                    negative_sampling_mode=self.negative_sampling_mode,
+                    negative_sampler=self.negative_sampler,
+                )
+            graphs.append(graph)
         self.graphs = graphs
 
     def _reset_cache(self):
@@ -875,16 +1155,42 @@ class GraphDataset(object):
         update_tensor: bool = True,
         update_graph: bool = False,
         deep_copy: bool = False,
+        update_keys: List[str] = None,
+        num_workers: int = 0,
+        chunksize: int = None,
+        cache_dir: str = None,
+        cache_max_bytes: int = None,
         **kwargs
     ):
         r"""
-        Applies a transformation to each graph object in parallel by first
-        calling `to_data_list`, applying the transform, and then perform
-        re-batching again to a `GraphDataset`.
+        Applies a transformation to each graph object, see
+        :meth:`deepsnap.graph.Graph.apply_transform`, and returns a new
+        dataset of the transformed graphs.
+
+        With :obj:`num_workers > 0` the graphs are transformed in a pool of
+        worker processes, in chunks of :obj:`chunksize` graphs. The graphs
+        are sent to and from the workers as packed tensors in shared memory
+        instead of pickled NetworkX graphs. The NetworkX graph :obj:`G` of
+        a transformed graph is rebuilt from its tensors when it is accessed
+        (see :meth:`deepsnap.graph.Graph.drop_G`), hence changes to
+        :obj:`G` that are not synced by :obj:`update_tensor` are lost.
+        Graphs of this dataset are not modified in place in this case. The
+        transform and its parameters need to be picklable, otherwise the
+        graphs are transformed serially with a warning.
 
         Args:
             transform: user-defined transformation function.
             update_tensor: whether request the Graph object remain unchanged.
+            update_keys: if specified, only these attributes are synced.
+            num_workers (int): Number of worker processes, 0 to transform
+                the graphs in the main process.
+            chunksize (int, optional): Number of graphs sent to a worker at
+                once. By default each worker receives about 4 chunks.
+            cache_dir (str, optional): Directory of the disk cache of
+                transformed graphs.
+            cache_max_bytes (int, optional): Maximum size of the disk cache,
+                the least recently used entries are removed when it is
+                exceeded.
             kwargs: parameters used in transform function in Graph object.
         """
         # currently does not support transform for on-the-fly dataset
@@ -893,19 +1199,98 @@ class GraphDataset(object):
                 "On-the-fly datasets do not support transform. "
                 "Transform can be done at the batch level."
             )
-        # TODO: parallel apply
         new_dataset = copy.copy(self)
-        new_dataset.graphs = [
-            graph.apply_transform(
+        if cache_dir is not None:
+            cache = TransformCache(cache_dir, cache_max_bytes)
+            key = cache.fingerprint(
+                self.graphs, transform,
+                update_tensor=update_tensor, update_graph=update_graph,
+                update_keys=update_keys, kwargs=kwargs,
+            )
+            new_dataset.graphs = cache.load(key)
+            if new_dataset.graphs is not None:
+                new_dataset._reset_cache()
+                return new_dataset
+        new_dataset.graphs = _map_graphs(
+            _apply_transform, self.graphs,
+            (
                 transform, update_tensor, update_graph,
-                deep_copy, **kwargs
+                deep_copy, update_keys, kwargs
+            ),
+            num_workers, chunksize,
+        )
+        if cache_dir is not None and not cache.save(key, new_dataset.graphs):
+            warnings.warn(
+                "The transformed graphs can not be cached, e.g. since they "
+                "are heterogeneous graphs, have custom node ids or have "
+                "attributes that can not be packed and saved."
             )
-            for graph in self.graphs
-        ]
         # update example graph used for num_node_features etc.
         new_dataset._reset_cache()
         return new_dataset
 
+    def pack(self):
+        r"""
+        Packs the graphs of the dataset into contiguous tensors, see
+        :class:`deepsnap.packed.PackedGraphs`. The packed graphs are a
+        snapshot of the current graphs, e.g. negative edges are not
+        resampled.
+
+        Returns:
+            :class:`deepsnap.packed.PackedGraphs`: The packed graphs, which
+            return graphs as tensor views and collate batches of graph ids.
+        """
+        if self.graphs is None:
+            raise ValueError(
+                "On the fly generated datasets can not be packed."
+            )
+        return PackedGraphs(self.graphs)
+
+    def save(self, path: str):
+        r"""
+        Saves the graphs of the dataset (see :meth:`pack`) and its
+        parameters to the directory :obj:`path`. Custom split graphs, the
+        negative sampler and the NetworkX graphs are not saved.
+
+        Args:
+            path (str): The directory, created if it does not exist.
+        """
+        metadata = {
+            "task": self.task,
+            "general_split_mode": self.general_split_mode,
+            "disjoint_split_mode": self.disjoint_split_mode,
+            "edge_negative_sampling_ratio": self.edge_negative_sampling_ratio,
+            "edge_message_ratio": self.edge_message_ratio,
+            "edge_train_mode": self.edge_train_mode,
+            "edge_split_mode": self.edge_split_mode,
+            "minimum_node_per_graph": self.minimum_node_per_graph,
+            "negative_sampling_mode": self.negative_sampling_mode,
+            "negative_resampling": self.negative_resampling,
+            "prefetch_negatives": self.prefetch_negatives,
+            "seed": self.seed,
+        }
+        self.pack().save(path, metadata=metadata)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, **kwargs):
+        r"""
+        Loads a dataset saved by :meth:`save`. The graphs are tensor backed
+        and their tensors are views of the (memory mapped) saved tensors,
+        see :meth:`deepsnap.packed.PackedGraphs.load`.
+
+        Args:
+            path (str): The directory of the saved dataset.
+            mmap (bool): Whether to memory map the saved tensors.
+            **kwargs: Parameters of the dataset overriding the saved ones.
+
+        Returns:
+            :class:`deepsnap.dataset.GraphDataset`: The loaded dataset.
+        """
+        packed = PackedGraphs.load(path, mmap=mmap)
+        params = dict(packed.metadata or {})
+        params.update(kwargs)
+        return cls(packed.to_graphs(), **params)
+
     def filter(self, filter_fn, deep_copy: bool = False, **kwargs):
         r""" Filter the dataset, discarding graph data G where filter_fn(G) is False.
 
@@ -947,40 +1332,67 @@ class GraphDataset(object):
             for graph in self.graphs:
                 graph.to(device)
 
-    def _shuffle(self):
+    def _shuffle(self, generator: torch.Generator = None):
         r"""
         shuffle Graph object in graphs.
         """
         if self.graphs is not None:
-            random.shuffle(self.graphs)
+            Graph._python_random(generator).shuffle(self.graphs)
 
     @staticmethod
     def pyg_to_graphs(
         dataset,
         verbose: bool = False,
-        fixed_split: bool = False
+        fixed_split: bool = False,
+        backend: str = "networkx",
+        num_workers: int = 0,
+        chunksize: int = None,
     ) -> List[Graph]:
         r"""
         Transform a torch_geometric.data.Dataset object to a list of Graph object.
 
+        With the `tensor` backend the whole dataset is converted at once
+        by :meth:`deepsnap.packed.PackedGraphs.from_pyg`, using the
+        collated storage of an in memory dataset when available. The
+        tensors of the graphs are then views of shared tensors.
+
         Args:
             dataset: a torch_geometric.data.Dataset object.
             verbose: if print verbose warning
             fixed_split: if load fixed data split from PyG dataset
+            backend: `networkx` or `tensor`, see
+                :meth:`deepsnap.graph.Graph.pyg_to_graph`.
+            num_workers (int): Number of worker processes loading the PyG
+                graphs of a dataset without collated storage (e.g. with a
+                transform or stored on disk) for the `tensor` backend.
+            chunksize (int, optional): Number of PyG graphs loaded by a
+                worker at once.
 
         Returns:
             list: A list of :class:`deepsnap.graph.Graph` object.
         """
+        if backend == "tensor":
+            graphs = _pyg_to_graphs_tensor(dataset, num_workers, chunksize)
+            if fixed_split:
+                data = dataset[0]
+                keys = data.keys() if callable(data.keys) else data.keys
+                return [
+                    [graph]
+                    for graph in Graph._fixed_split(graphs[0], data, keys)
+                ]
+            return graphs
         if fixed_split:
             graphs = [
-                Graph.pyg_to_graph(data, verbose=verbose, fixed_split=True)
+                Graph.pyg_to_graph(
+                    data, verbose=verbose, fixed_split=True, backend=backend
+                )
                 for data in dataset
             ]
             graphs_split = [[graph] for graph in graphs[0]]
             return graphs_split
         else:
             return [
-                Graph.pyg_to_graph(data, verbose=verbose)
+                Graph.pyg_to_graph(data, verbose=verbose, backend=backend)
                 for data in dataset
             ]
 
@@ -1009,26 +1421,10 @@ class GraphDataset(object):
             Union[:class:`deepsnap.graph.Graph`, List[:class:`deepsnap.graph.Graph`]]: A single
             :class:`deepsnap.graph.Graph` object or subset of :class:`deepsnap.graph.Graph` objects.
         """
-        if self.task == "link_pred" and self._resample_negatives:
-            # resample negative examples
-            for graph in self.graphs:
-                if isinstance(graph, Graph):
-                    if isinstance(graph, HeteroGraph):
-                        graph._create_neg_sampling(
-                            self.edge_negative_sampling_ratio,
-                            split_types=self._split_types,
-                            resample=True
-                        )
-                    else:
-                        graph._create_neg_sampling(
-                            self.edge_negative_sampling_ratio, resample=True)
-                else:
-                    raise TypeError(
-                        "element in self.graphs of unexpected type."
-                    )
-
         # TODO: add the hetero graph equivalent of these functions ?
         if self.graphs is None:
+            if self.seed is not None:
+                self._seed_generator()
             graph = self.generator.generate()
             if not isinstance(graph, Graph):
                 graph = Graph(graph)
@@ -1037,9 +1433,204 @@ class GraphDataset(object):
                 graph.to(self.otf_device)
             return graph
         elif isinstance(idx, int):
-            return self.graphs[idx]
+            graph = self.graphs[idx]
+            if self._resample_on_access():
+                self._resample_graph_negatives(
+                    [graph],
+                    generator=self._stream_generator(self._NEGATIVE_STREAM),
+                )
+            return graph
         else:
-            return self._index_select(idx)
+            dataset = self._index_select(idx)
+            if self._resample_on_access():
+                self._resample_graph_negatives(
+                    dataset.graphs,
+                    generator=self._stream_generator(self._NEGATIVE_STREAM),
+                )
+            return dataset
+
+    # ids of the random streams derived from the seed
+    _SPLIT_STREAM = 0
+    _NEGATIVE_STREAM = 1
+    _DISJOINT_STREAM = 2
+    _GENERATOR_STREAM = 3
+
+    def _stream_seed(self, stream: int, epoch: int = None) -> int:
+        r"""
+        Derives the 63 bit seed of a random stream from the seed of the
+        dataset, the split, the DataLoader worker and the epoch, such that
+        the streams are reproducible and statistically independent.
+        """
+        worker_info = torch.utils.data.get_worker_info()
+        worker_id = 0 if worker_info is None else worker_info.id + 1
+        state = np.random.SeedSequence(
+            [
+                self.seed,
+                stream,
+                self._split_index,
+                worker_id,
+                self._epoch if epoch is None else epoch,
+            ]
+        ).generate_state(2)
+        return (int(state[0]) << 32 | int(state[1])) & (2 ** 63 - 1)
+
+    def _stream_generator(
+        self, stream: int, cached: bool = True, epoch: int = None
+    ):
+        r"""
+        Returns the :class:`torch.Generator` of a random stream of the
+        current worker and epoch (see :meth:`_stream_seed`), or :obj:`None`
+        if no seed is set. Cached generators continue their stream over
+        calls within an epoch.
+        """
+        if self.seed is None:
+            return None
+        seed = self._stream_seed(stream, epoch)
+        if not cached:
+            return torch.Generator().manual_seed(seed)
+        if stream not in self._stream_generators or (
+            self._stream_generators[stream][0] != seed
+        ):
+            self._stream_generators[stream] = (
+                seed, torch.Generator().manual_seed(seed)
+            )
+        return self._stream_generators[stream][1]
+
+    def _seed_generator(self):
+        r"""
+        Seeds the on-the-fly generator once per worker and epoch.
+        """
+        seed = self._stream_seed(self._GENERATOR_STREAM) % 2 ** 32
+        if self._stream_generators.get(self._GENERATOR_STREAM) != seed:
+            self.generator.seed(seed)
+            self._stream_generators[self._GENERATOR_STREAM] = seed
+
+    def _resample_on_access(self) -> bool:
+        return (
+            self.task == "link_pred"
+            and self._resample_negatives
+            and self.negative_resampling == "access"
+        )
+
+    def _resample_graph_negatives(
+        self,
+        graphs: List[Graph],
+        negative_edges: List[torch.Tensor] = None,
+        generator: torch.Generator = None,
+    ):
+        r"""
+        Resamples the negative edges of the graphs, or replaces them with the
+        :obj:`negative_edges` sampled ahead of time by
+        :meth:`_sample_graph_negatives`.
+        """
+        for i, graph in enumerate(graphs):
+            if isinstance(graph, Graph):
+                if isinstance(graph, HeteroGraph):
+                    graph._create_neg_sampling(
+                        self.edge_negative_sampling_ratio,
+                        split_types=self._split_types,
+                        resample=True,
+                        generator=generator,
+                    )
+                else:
+                    graph._create_neg_sampling(
+                        self.edge_negative_sampling_ratio,
+                        resample=True,
+                        generator=generator,
+                        negative_sampling_mode=self.negative_sampling_mode,
+                        negative_sampler=self.negative_sampler,
+                        negative_edges=(
+                            None if negative_edges is None
+                            else negative_edges[i]
+                        ),
+                    )
+            else:
+                raise TypeError(
+                    "element in self.graphs of unexpected type."
+                )
+
+    def _sample_graph_negatives(
+        self, graphs: List[Graph], generator: torch.Generator = None
+    ):
+        r"""
+        Samples the negative edges of the graphs without changing them,
+        where negative edges of heterogeneous graphs are not sampled ahead.
+
+        Returns:
+            list: The negative edges (or :obj:`None`) of each graph.
+        """
+        negative_edges = []
+        for graph in graphs:
+            if isinstance(graph, HeteroGraph) or (
+                graph._num_positive_examples is None
+            ):
+                negative_edges.append(None)
+            else:
+                negative_edges.append(
+                    graph._sample_negative_edges(
+                        graph.edge_label_index[
+                            :, :graph._num_positive_examples
+                        ],
+                        self.edge_negative_sampling_ratio,
+                        generator=generator,
+                        negative_sampling_mode=self.negative_sampling_mode,
+                        negative_sampler=self.negative_sampler,
+                    )
+                )
+        return negative_edges
+
+    def new_epoch(self):
+        r"""
+        Resamples the negative edges of all graphs for the next epoch when
+        negative_resampling is "epoch" (it has no effect otherwise). If
+        prefetch_negatives is set, the negative edges that were sampled in
+        the background during the previous epoch are used, and the negative
+        edges of the following epoch are sampled in a background thread.
+        This should be called before iterating over the dataset in each
+        epoch (the dataset is copied to DataLoader workers at that time).
+
+        The epoch counter of the random streams of a seeded dataset is
+        advanced in any case.
+        """
+        self._epoch += 1
+        if not (
+            self.task == "link_pred"
+            and self._resample_negatives
+            and self.negative_resampling == "epoch"
+        ):
+            return
+        negative_edges = None
+        if self._negative_prefetch is not None:
+            thread, result = self._negative_prefetch
+            thread.join()
+            self._negative_prefetch = None
+            if "error" in result:
+                raise result["error"]
+            negative_edges = result["negative_edges"]
+        self._resample_graph_negatives(
+            self.graphs,
+            negative_edges,
+            self._stream_generator(self._NEGATIVE_STREAM, cached=False),
+        )
+
+        if self.prefetch_negatives:
+            result = {}
+            # the stream of the next epoch, as if sampled in that epoch
+            generator = self._stream_generator(
+                self._NEGATIVE_STREAM, cached=False, epoch=self._epoch + 1
+            )
+
+            def prefetch():
+                try:
+                    result["negative_edges"] = self._sample_graph_negatives(
+                        self.graphs, generator
+                    )
+                except Exception as error:
+                    result["error"] = error
+
+            thread = threading.Thread(target=prefetch, daemon=True)
+            self._negative_prefetch = (thread, result)
+            thread.start()
 
     def _index_select(self, idx: int) -> List[Graph]:
         r"""
@@ -1081,3 +1672,305 @@ class GraphDataset(object):
             len(self) if self.graphs is not None else self.generator.__class__
         )
         return f"{self.__class__.__name__}({descriptor})"
+
+
+
+def _apply_transform(
+    graph, transform, update_tensor, update_graph, deep_copy, update_keys,
+    kwargs,
+):
+    return graph.apply_transform(
+        transform, update_tensor, update_graph,
+        deep_copy, update_keys=update_keys, **kwargs
+    )
+
+
+def _create_neg_sampling(graph, generator, split_types, params):
+    if isinstance(graph, HeteroGraph):
+        graph._create_neg_sampling(
+            negative_sampling_ratio=params["edge_negative_sampling_ratio"],
+            split_types=split_types,
+            generator=generator,
+        )
+    else:
+        graph._create_neg_sampling(
+            params["edge_negative_sampling_ratio"],
+            generator=generator,
+            negative_sampling_mode=params["negative_sampling_mode"],
+            negative_sampler=params["negative_sampler"],
+        )
+
+
+def _split_link_pred(graph, generator, split_types, params):
+    if isinstance(graph, HeteroGraph):
+        return graph.split_link_pred(
+            split_types=split_types,
+            split_ratio=params["edge_message_ratio"],
+            edge_split_mode=params["edge_split_mode"],
+            generator=generator,
+        )[1]
+    return graph.split_link_pred(params["edge_message_ratio"], generator)[1]
+
+
+def _split_graph_transductive(graph, seed, split_ratio, split_types, params):
+    r"""
+    Splits a graph as :meth:`GraphDataset._split_transductive` with the
+    random stream :obj:`seed`, including the disjoint split of the training
+    graph and the negative edges of link prediction.
+    """
+    generator = torch.Generator().manual_seed(seed)
+    task = params["task"]
+    if isinstance(graph, HeteroGraph):
+        split_graphs = graph.split(
+            task=task,
+            split_types=split_types,
+            split_ratio=split_ratio,
+            edge_split_mode=params["edge_split_mode"],
+            generator=generator,
+        )
+    else:
+        split_graphs = graph.split(task, split_ratio, generator)
+    split_graphs = list(split_graphs)
+    if task == "link_pred":
+        if (
+            params["edge_train_mode"] == "disjoint"
+            and params["disjoint_split_mode"] == "random"
+        ):
+            split_graphs[0] = _split_link_pred(
+                split_graphs[0], generator, split_types, params
+            )
+        for split_graph in split_graphs:
+            _create_neg_sampling(split_graph, generator, split_types, params)
+    return tuple(split_graphs)
+
+
+def _split_graph_inductive(graph, item, split_types, params):
+    r"""
+    Creates the link prediction objective of a graph of an inductive split
+    with the random stream :obj:`item[0]`. The message passing and
+    objective edges are split if :obj:`item[1]` is true.
+    """
+    seed, split_edges = item
+    generator = torch.Generator().manual_seed(seed)
+    if split_edges:
+        graph = _split_link_pred(graph, generator, split_types, params)
+    _create_neg_sampling(graph, generator, split_types, params)
+    return graph
+
+
+def _map_graphs(
+    func, graphs: List[Graph], args: tuple = (),
+    num_workers: int = 0, chunksize: int = None, items: List = None,
+) -> List:
+    r"""
+    Returns :obj:`[func(graph, *args) for graph in graphs]`, computed in a
+    pool of :obj:`num_workers` processes if :obj:`num_workers > 0`. The
+    order of the graphs is kept. If :obj:`items` is given,
+    :obj:`func(graph, item, *args)` is called with the item of each graph.
+    :obj:`func` returns a graph or a tuple of graphs.
+    """
+    if num_workers > 0:
+        try:
+            pickle.dumps((func, args))
+        except Exception as e:
+            warnings.warn(
+                "The transform can not be sent to worker processes since "
+                f"it is not picklable ({e}), e.g. a lambda or a local "
+                "function. Falling back to transforming the graphs in the "
+                "main process."
+            )
+            num_workers = 0
+    if num_workers == 0 or len(graphs) <= 1:
+        return _map_serial(func, graphs, args, items)
+
+    if chunksize is None:
+        chunksize = math.ceil(len(graphs) / (4 * num_workers))
+    chunks = (
+        (
+            _send_graphs(graphs[start:start + chunksize], sync=True),
+            None if items is None else items[start:start + chunksize],
+        )
+        for start in range(0, len(graphs), chunksize)
+    )
+    results = []
+    with mp.Pool(
+        num_workers, initializer=_init_worker, initargs=(func, args)
+    ) as pool:
+        for chunk in pool.imap(_map_chunk, chunks):
+            results.extend(_receive_results(chunk))
+    return results
+
+
+def _pyg_to_graphs_tensor(dataset, num_workers: int, chunksize: int):
+    r"""
+    Converts a PyG dataset to tensor backed graphs, see
+    :meth:`GraphDataset.pyg_to_graphs`. The PyG graphs of a dataset without
+    collated storage are loaded and concatenated in chunks by
+    :obj:`num_workers` processes.
+    """
+    if num_workers == 0 or PackedGraphs._has_pyg_storage(dataset):
+        return PackedGraphs.from_pyg(dataset).to_graphs()
+    if chunksize is None:
+        chunksize = math.ceil(len(dataset) / (4 * num_workers))
+    bounds = [
+        (start, min(start + chunksize, len(dataset)))
+        for start in range(0, len(dataset), chunksize)
+    ]
+    with mp.Pool(
+        num_workers, initializer=_init_worker, initargs=(None, (dataset,))
+    ) as pool:
+        storages = pool.map(_concat_pyg_chunk, bounds, chunksize=1)
+    packed = PackedGraphs._from_pyg_storage(*PackedGraphs._merge_pyg(storages))
+    return packed.to_graphs()
+
+
+def _concat_pyg_chunk(bounds):
+    _, (dataset,) = _worker_func
+    return PackedGraphs._concat_pyg(
+        [dataset[i] for i in range(*bounds)]
+    )
+
+
+def _map_serial(func, graphs, args, items):
+    if items is None:
+        return [func(graph, *args) for graph in graphs]
+    return [func(graph, item, *args) for graph, item in zip(graphs, items)]
+
+
+# function and arguments of _map_graphs in a worker process
+_worker_func = None
+
+
+def _init_worker(func, args):
+    global _worker_func
+    # the main process already uses all cores across the workers
+    torch.set_num_threads(1)
+    _worker_func = (func, args)
+
+
+def _map_chunk(chunk):
+    func, args = _worker_func
+    sent, items = chunk
+    results = _map_serial(func, _receive_graphs(sent), args, items)
+    if results and isinstance(results[0], tuple):
+        # tuples of graphs are sent as one flat list of graphs
+        lengths = [len(result) for result in results]
+        graphs = [graph for result in results for graph in result]
+        return lengths, _send_graphs(graphs, sync=False)
+    return None, _send_graphs(results, sync=False)
+
+
+def _receive_results(chunk) -> List:
+    lengths, sent = chunk
+    graphs = _receive_graphs(sent)
+    if lengths is None:
+        return graphs
+    offsets = np.cumsum([0] + lengths).tolist()
+    return [
+        tuple(graphs[start:end])
+        for start, end in zip(offsets[:-1], offsets[1:])
+    ]
+
+
+# private attributes of a graph that are sent along with its attributes,
+# e.g. the edges of a disjoint split kept for resample_disjoint
+_GRAPH_STATE = [
+    "_split_edges",
+    "_message_edges",
+    "_objective_edges",
+    "_disjoint_edges",
+]
+
+
+def _send_graphs(graphs: List[Graph], sync: bool):
+    r"""
+    Prepares graphs to be sent to or from a worker process. The NetworkX
+    graphs are dropped and the graphs are packed into a few contiguous
+    tensors, which are moved to shared memory when they are pickled. The
+    packed groups of graphs are appended to the list of sent graphs as
+    tuples of their positions and :class:`deepsnap.packed.PackedGraphs`.
+
+    With :obj:`sync=False` the tensors are sent as they are, without
+    syncing them from :obj:`G` (e.g. a graph transformed with
+    :obj:`update_tensor=False`). Heterogeneous graphs and graphs with custom
+    node ids are sent with :obj:`G`.
+    """
+    sent = []
+    for graph in graphs:
+        if isinstance(graph, HeteroGraph) or graph._node_ids is not None:
+            sent.append(graph)
+            continue
+        graph = copy.copy(graph)
+        if graph._G is not None:
+            if not sync:
+                graph._tensors_stale = False
+            graph.drop_G()
+        _pop_state(graph)
+        sent.append(graph)
+
+    # graphs with the same attributes (e.g. the training graphs of a split)
+    # are packed together
+    groups = {}
+    for i, graph in enumerate(sent):
+        if isinstance(graph, HeteroGraph) or graph._node_ids is not None:
+            continue
+        groups.setdefault(tuple(sorted(graph.keys)), []).append(i)
+    for ids in groups.values():
+        try:
+            packed = PackedGraphs([sent[i] for i in ids])
+        except (ValueError, RuntimeError):
+            # attributes that can not be concatenated
+            for i in ids:
+                _restore_state(sent[i])
+            continue
+        for i in ids:
+            sent[i] = None
+        sent.append((ids, packed))
+    return sent
+
+
+def _receive_graphs(sent) -> List[Graph]:
+    graphs = sent
+    while graphs and isinstance(graphs[-1], tuple):
+        ids, packed = graphs.pop()
+        for i, graph in zip(ids, packed.to_graphs()):
+            _restore_state(graph)
+            graphs[i] = graph
+    return graphs
+
+
+def _pop_state(graph: Graph):
+    r"""
+    Moves the private state of a graph into public attributes
+    :obj:`"state_*"`, which are packed with the other attributes. The
+    names of the state attributes are kept in :obj:`state_keys`.
+    """
+    state_keys = []
+    for key in _GRAPH_STATE:
+        if key not in graph.__dict__:
+            continue
+        value = graph.__dict__.pop(key)
+        if isinstance(value, dict):
+            state_keys.append((key, tuple(value)))
+            for name, item in value.items():
+                graph[f"state{key}.{name}"] = item
+        else:
+            state_keys.append((key, None))
+            if value is not None:
+                graph[f"state{key}"] = value
+    graph.state_keys = tuple(state_keys)
+
+
+def _restore_state(graph: Graph):
+    state_keys = graph.__dict__.pop("state_keys", None)
+    if state_keys is None:
+        return
+    for key, names in state_keys:
+        if names is None:
+            value = graph.__dict__.pop(f"state{key}", None)
+        else:
+            value = {
+                name: graph.__dict__.pop(f"state{key}.{name}")
+                for name in names
+            }
+        setattr(graph, key, value)
@@ -0,0 +1,306 @@
+import numpy as np
+import torch
+from typing import (
+    Dict,
+    List,
+)
+
+
+class FeatureStore(object):
+    r"""
+    Out-of-core storage of node (or edge) features in a memory mapped
+    numpy file, which can be referenced by a :class:`deepsnap.graph.Graph`
+    in place of a feature tensor, e.g. :obj:`graph.node_feature`.
+    Rows are read with :meth:`gather`, keeping the most recently used rows
+    in a cache of :obj:`cache_size` rows.
+
+    A store can be restricted to a subset of rows by :meth:`select`,
+    for example to the nodes of a sampled subgraph, without reading any
+    features. :meth:`deepsnap.batch.Batch.from_data_list` gathers the rows
+    of all graphs in a batch that reference the same store at once.
+
+    The features are read-only. Copies of a store share the memory mapped
+    file and the cache.
+
+    Args:
+        path (str): Path of a :obj:`.npy` file of shape
+            `[num_rows, *]`, e.g. written by :meth:`create` or by
+            :func:`numpy.lib.format.open_memmap` for features that do not
+            fit in memory.
+        cache_size (int): Number of rows kept in the cache.
+        device (:class:`torch.device`, optional): Device of the gathered
+            features and the cache.
+    """
+    def __init__(
+        self,
+        path: str,
+        cache_size: int = 0,
+        device=None,
+    ):
+        self.path = path
+        self.cache_size = cache_size
+        self._array = np.load(path, mmap_mode="r")
+        if self._array.ndim == 0:
+            raise ValueError("FeatureStore requires an array with rows.")
+        self.device = torch.device(device or "cpu")
+        self._dtype = torch.from_numpy(self._array[:0].copy()).dtype
+        # row ids of the base array, None for all rows
+        self._index = None
+        self._cache = None
+        if cache_size > 0:
+            self._cache = _RowCache(
+                len(self._array), self._array.shape[1:], self._dtype,
+                cache_size, self.device,
+            )
+
+    @classmethod
+    def create(cls, path: str, features, **kwargs):
+        r"""
+        Writes the features to :obj:`path` and opens them as a store.
+
+        Args:
+            path (str): Path of the :obj:`.npy` file to be written.
+            features (:class:`torch.Tensor` or :class:`numpy.ndarray`):
+                The features.
+            **kwargs: Parameters of :class:`FeatureStore`.
+
+        Returns:
+            :class:`deepsnap.feature_store.FeatureStore`: The store.
+        """
+        if torch.is_tensor(features):
+            features = features.detach().cpu().numpy()
+        np.save(path, features)
+        if not path.endswith(".npy"):
+            path = path + ".npy"
+        return cls(path, **kwargs)
+
+    @property
+    def shape(self) -> torch.Size:
+        num_rows = (
+            len(self._array) if self._index is None else len(self._index)
+        )
+        return torch.Size((num_rows,) + self._array.shape[1:])
+
+    @property
+    def dtype(self) -> torch.dtype:
+        return self._dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def size(self, dim: int = None):
+        if dim is None:
+            return self.shape
+        return self.shape[dim]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def _copy(self):
+        store = self.__class__.__new__(self.__class__)
+        store.__dict__.update(self.__dict__)
+        return store
+
+    def _rows(self, index) -> torch.Tensor:
+        r"""
+        Returns the row ids of the base array of the rows :obj:`index`.
+        """
+        if index is None:
+            if self._index is None:
+                return torch.arange(len(self._array))
+            return self._index
+        index = torch.as_tensor(index, dtype=torch.long).view(-1).cpu()
+        if self._index is None:
+            return index
+        return self._index[index]
+
+    def select(self, index) -> "FeatureStore":
+        r"""
+        Restricts the store to the rows :obj:`index` without reading them.
+
+        Args:
+            index (:class:`torch.LongTensor`): The selected rows.
+
+        Returns:
+            :class:`deepsnap.feature_store.FeatureStore`: A store sharing the
+            file and the cache, whose row :obj:`i` is row :obj:`index[i]`.
+        """
+        store = self._copy()
+        store._index = self._rows(index)
+        return store
+
+    def gather(self, index=None) -> torch.Tensor:
+        r"""
+        Reads the rows :obj:`index` (all rows by default). Each distinct row
+        is read once, rows in the cache are not read from the file.
+
+        Args:
+            index (:class:`torch.LongTensor`, optional): The rows to read.
+
+        Returns:
+            :class:`torch.Tensor`: The features of shape
+            `[len(index), *]` on the device of the store.
+        """
+        return self._gather_rows(self._rows(index))
+
+    def _gather_rows(self, rows: torch.Tensor) -> torch.Tensor:
+        unique_rows, inverse = torch.unique(rows, return_inverse=True)
+        if self._cache is None:
+            features = self._read(unique_rows).to(self.device)
+        else:
+            features = self._cache.gather(unique_rows, self._read)
+        return features[inverse.to(features.device)]
+
+    def _read(self, rows: torch.Tensor) -> torch.Tensor:
+        r"""
+        Reads sorted rows from the memory mapped file.
+        """
+        return torch.from_numpy(self._array[rows.numpy()])
+
+    @staticmethod
+    def gather_concat(stores: List["FeatureStore"]) -> torch.Tensor:
+        r"""
+        Concatenates the features of several stores. Stores on the same
+        file are gathered at once.
+        """
+        if all(store._base_of(stores[0]) for store in stores[1:]):
+            rows = torch.cat([store._rows(None) for store in stores])
+            return stores[0]._gather_rows(rows)
+        return torch.cat([store.gather() for store in stores], dim=0)
+
+    def _base_of(self, other: "FeatureStore") -> bool:
+        return (
+            self._array is other._array
+            and self._cache is other._cache
+            and self.device == other.device
+        )
+
+    def to(self, device) -> "FeatureStore":
+        r"""
+        Returns a store whose gathered features and cache are on
+        :obj:`device`.
+        """
+        device = torch.device(device)
+        if device == self.device:
+            return self
+        store = self._copy()
+        store.device = device
+        if self._cache is not None:
+            store._cache = self._cache.to(device)
+        return store
+
+    def cache_info(self) -> Dict[str, int]:
+        r"""
+        Returns:
+            dict: The number of cache :obj:`"hits"` and :obj:`"misses"`
+            (counted per distinct row of each gather) and the number of
+            cached rows :obj:`"size"`.
+        """
+        if self._cache is None:
+            return {"hits": 0, "misses": 0, "size": 0}
+        return self._cache.info()
+
+    def __deepcopy__(self, memo):
+        # the features are read-only, copies share the file and the cache
+        return self
+
+    def __getstate__(self):
+        # the file is mapped again and the cache is rebuilt after
+        # unpickling, e.g. in the data loader workers
+        state = self.__dict__.copy()
+        state["_array"] = None
+        state["_cache"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._array = np.load(self.path, mmap_mode="r")
+        if self.cache_size > 0:
+            self._cache = _RowCache(
+                len(self._array), self._array.shape[1:], self._dtype,
+                self.cache_size, self.device,
+            )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(path={self.path}, "
+            f"shape={list(self.shape)}, cache_size={self.cache_size})"
+        )
+
+
+class _RowCache(object):
+    r"""
+    Least recently used cache of rows, in which lookups, evictions and
+    insertions of a batch of rows are vectorized.
+    """
+    def __init__(self, num_rows, row_shape, dtype, capacity, device):
+        self.capacity = capacity
+        self.rows = torch.empty(
+            (capacity,) + tuple(row_shape), dtype=dtype, device=device
+        )
+        # slot of each row, -1 if the row is not cached
+        self.slot_of = torch.full((num_rows,), -1, dtype=torch.int32)
+        self.row_of = torch.full((capacity,), -1, dtype=torch.long)
+        self.last_used = torch.zeros(capacity, dtype=torch.long)
+        self.tick = 0
+        self.hits = 0
+        self.misses = 0
+
+    def to(self, device):
+        cache = self.__class__.__new__(self.__class__)
+        cache.__dict__.update(self.__dict__)
+        cache.slot_of = self.slot_of.clone()
+        cache.row_of = self.row_of.clone()
+        cache.last_used = self.last_used.clone()
+        cache.rows = self.rows.to(device)
+        return cache
+
+    def gather(self, rows: torch.Tensor, read) -> torch.Tensor:
+        r"""
+        Returns the features of the distinct sorted :obj:`rows`, reading
+        the rows that are not cached by :obj:`read` and caching them.
+        """
+        self.tick += 1
+        device = self.rows.device
+        slots = self.slot_of[rows].long()
+        hit = slots >= 0
+        hit_pos = hit.nonzero().view(-1)
+        miss_pos = (~hit).nonzero().view(-1)
+        hit_slots = slots[hit_pos]
+        miss_rows = rows[miss_pos]
+        self.hits += hit_slots.numel()
+        self.misses += miss_rows.numel()
+        self.last_used[hit_slots] = self.tick
+
+        features = torch.empty(
+            (rows.numel(),) + self.rows.shape[1:],
+            dtype=self.rows.dtype, device=device,
+        )
+        features.index_copy_(
+            0, hit_pos.to(device),
+            self.rows.index_select(0, hit_slots.to(device)),
+        )
+        loaded = read(miss_rows).to(device)
+        features.index_copy_(0, miss_pos.to(device), loaded)
+
+        num_insert = min(miss_rows.numel(), self.capacity)
+        if num_insert > 0:
+            # evict the least recently used rows
+            victims = torch.topk(
+                self.last_used, num_insert, largest=False
+            ).indices
+            evicted = self.row_of[victims]
+            self.slot_of[evicted[evicted >= 0]] = -1
+            self.slot_of[miss_rows[:num_insert]] = victims.int()
+            self.row_of[victims] = miss_rows[:num_insert]
+            self.last_used[victims] = self.tick
+            self.rows.index_copy_(0, victims.to(device), loaded[:num_insert])
+        return features
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": int((self.row_of >= 0).sum()),
+        }
@@ -3,10 +3,12 @@ import random
 import copy
 import math
 import pdb
+import warnings
 import numpy as np
 import torch
 import networkx as nx
 from torch_geometric.utils import to_undirected
+from deepsnap.feature_store import FeatureStore
 from typing import (
     Dict,
     List,
@@ -26,24 +28,32 @@ class Graph(object):
             and corresponding attributes.
     """
 
+    # attributes of every graph, which are None if they are not set
+    _DEFAULT_KEYS = [
+        "node_feature",
+        "node_label",
+        "edge_feature",
+        "edge_label",
+        "graph_feature",
+        "graph_label",
+        "edge_index",
+        "edge_label_index",
+        "node_label_index",
+        "custom_splits",
+        "custom_disjoint_split",
+        "task"
+    ]
+
     def __init__(self, G=None, **kwargs):
         self.G = G
+        # snapshot of the tensors when G and the tensors were last synced
+        self._synced_tensors = None
+        # node ids of G, if they are not 0, ..., num_nodes - 1 in order
+        self._node_ids = None
+        self._node_id_sorter = None
+        self._node_id_dict = None
         if G is not None:
-            keys = [
-                "node_feature",
-                "node_label",
-                "edge_feature",
-                "edge_label",
-                "graph_feature",
-                "graph_label",
-                "edge_index",
-                "edge_label_index",
-                "node_label_index",
-                "custom_splits",
-                "custom_disjoint_split",
-                "task"
-            ]
-            for key in keys:
+            for key in self._DEFAULT_KEYS:
                 self[key] = None
 
             for key, item in kwargs.items():
@@ -51,6 +61,13 @@ class Graph(object):
 
             self._update_tensors(init=True)
         self._num_positive_examples = None
+        # sorted keys of the positive edges, reused by negative sampling
+        self._negative_sampling_cache = None
+        # tables of the negative sampler, see deepsnap.negative_sampling
+        self._negative_sampler_cache = None
+        # only used by tensor backed graphs (G is None)
+        self._num_nodes = None
+        self._directed = None
 
     @classmethod
     def _from_dict(cls, dictionary: Dict[str, torch.tensor]):
@@ -69,6 +86,87 @@ class Graph(object):
 
         return graph
 
+    @classmethod
+    def _empty_tensor_graph(cls, num_nodes: int, directed: bool):
+        r"""
+        Creates a tensor backed graph with :obj:`num_nodes` nodes whose
+        attributes are not set.
+        """
+        graph = cls()
+        graph._num_nodes = num_nodes
+        graph._directed = directed
+        for key in cls._DEFAULT_KEYS:
+            graph[key] = None
+        return graph
+
+    @classmethod
+    def from_tensors(
+        cls,
+        edge_index: torch.Tensor,
+        num_nodes: int = None,
+        directed: bool = True,
+        **kwargs
+    ):
+        r"""
+        Creates a graph object directly from tensors, without building a
+        NetworkX graph. The returned graph supports splitting, negative
+        sampling and batching in the same way as a graph created from
+        a NetworkX object, while its :obj:`G` is left unset.
+
+        Args:
+            edge_index (:class:`torch.LongTensor`): Edge indices with shape
+                `[2, num_edges]`.
+            num_nodes (int, optional): Number of nodes. If not specified it
+                is inferred from the node attributes or the edge indices.
+            directed (bool): Whether the graph is directed. For undirected
+                graphs each edge only needs to appear in one direction.
+                Duplicated (and reversed) edges are removed and the
+                remaining edges are stored in both directions, consistent
+                with graphs created from an undirected NetworkX object.
+            **kwargs: keyworded argument list with keys such as
+                :obj:`"node_feature"`, :obj:`"edge_feature"` and corresponding
+                attributes. Edge attributes are aligned with :obj:`edge_index`.
+
+        Returns:
+            :class:`deepsnap.graph.Graph`: A new tensor backed
+            :class:`deepsnap.graph.Graph` object.
+        """
+        if edge_index.numel() == 0:
+            raise ValueError(
+                "in from_tensors, number of edges must be larger than 0"
+            )
+        if num_nodes is None:
+            for key, item in kwargs.items():
+                if Graph._is_node_attribute(key) and torch.is_tensor(item):
+                    num_nodes = item.size(0)
+                    break
+            else:
+                num_nodes = int(edge_index.max()) + 1
+
+        if not directed:
+            # keep the first occurrence of each undirected edge
+            row, col = edge_index
+            edge_key = (
+                torch.min(row, col) * num_nodes + torch.max(row, col)
+            )
+            _, first = np.unique(edge_key.cpu().numpy(), return_index=True)
+            first = torch.from_numpy(np.sort(first)).to(edge_index.device)
+            edge_index = edge_index[:, first]
+            edge_index = torch.cat([edge_index, torch.flip(edge_index, [0])], 1)
+            for key, item in kwargs.items():
+                if Graph._is_edge_attribute(key) and torch.is_tensor(item):
+                    item = item[first]
+                    kwargs[key] = torch.cat([item, item], dim=0)
+
+        graph = cls._empty_tensor_graph(num_nodes, directed)
+        for key, item in kwargs.items():
+            graph[key] = item
+
+        graph.edge_index = edge_index
+        graph.edge_label_index = edge_index
+        graph.node_label_index = torch.arange(num_nodes, dtype=torch.long)
+        return graph
+
     def __getitem__(self, key: str):
         r"""
         Gets the data of the attribute :obj:`key`.
@@ -79,6 +177,104 @@ class Graph(object):
         """Sets the attribute :obj:`key` to :obj:`value`."""
         setattr(self, key, value)
 
+    @property
+    def G(self):
+        r"""
+        The NetworkX graph object of the graph.
+
+        For tensor backed graphs (e.g. created by :meth:`from_tensors`,
+        or after :meth:`drop_G`) the NetworkX graph is only built from
+        :obj:`edge_index` and the attribute tensors when it is accessed.
+
+        Since the returned object might be modified by the caller, accessing
+        :obj:`G` marks the tensors as possibly out of date, such that
+        :meth:`_update_tensors` re-syncs them from :obj:`G`.
+        """
+        if self._G is None and self._directed is not None:
+            self._G = self._tensors_to_G()
+            self._synced_tensors = self._tensor_versions()
+        if self._G is not None:
+            self._tensors_stale = True
+        return self._G
+
+    @G.setter
+    def G(self, G):
+        self._G = G
+        self._tensors_stale = G is not None
+
+    def drop_G(self):
+        r"""
+        Releases the NetworkX graph object :obj:`G` to save memory.
+        The tensors are synced from :obj:`G` first if it might have been
+        modified. :obj:`G` is rebuilt from the tensors on the next access,
+        in which case non-tensor node and edge attributes are not kept.
+
+        Returns:
+            :class:`deepsnap.graph.Graph`: Return the self :class:`deepsnap.graph.Graph`.
+        """
+        if self._G is not None:
+            self._update_tensors()
+            self._num_nodes = self._G.number_of_nodes()
+            self._directed = self._G.is_directed()
+            self._G = None
+        return self
+
+    def _tensors_to_G(self):
+        r"""
+        Builds the NetworkX graph object from :obj:`edge_index` and the
+        node, edge and graph attribute tensors.
+        """
+        G = nx.DiGraph() if self.is_directed() else nx.Graph()
+        num_nodes = self.num_nodes
+        num_edges = self.num_edges
+        if self._node_ids is None:
+            node_ids = range(num_nodes)
+        elif isinstance(self._node_ids, np.ndarray):
+            node_ids = self._node_ids.tolist()
+        else:
+            node_ids = self._node_ids
+        G.add_nodes_from(node_ids)
+
+        # attributes that are not aligned with the nodes or edges
+        # (e.g. edge_label of link prediction objectives) are skipped
+        node_keys, edge_keys = [], []
+        for key in self.keys:
+            if not torch.is_tensor(self[key]):
+                continue
+            if self._is_node_attribute(key):
+                if self[key].size(0) == num_nodes:
+                    node_keys.append(key)
+            elif self._is_edge_attribute(key):
+                if self[key].size(0) == self.edge_index.size(1):
+                    edge_keys.append(key)
+            elif self._is_graph_attribute(key):
+                Graph.add_graph_attr(G, key, self[key])
+        for key in node_keys:
+            Graph.add_node_attr(G, key, self[key])
+
+        edges = self.edge_index[:, :num_edges].t().tolist()
+        G.add_edges_from(
+            (node_ids[u], node_ids[v], {key: self[key][i] for key in edge_keys})
+            for i, (u, v) in enumerate(edges)
+        )
+        return G
+
+    def _tensor_versions(self):
+        r"""
+        Returns a snapshot of the identities and in-place modification
+        counters of the node, edge and graph attribute tensors, which is
+        used to detect whether :obj:`G` is out of date.
+        """
+        versions = {}
+        for key, item in self.__dict__.items():
+            if key[0] != "_" and torch.is_tensor(item) and (
+                self._is_node_attribute(key)
+                or self._is_edge_attribute(key)
+                or self._is_graph_attribute(key)
+            ):
+                versions[key] = (id(item), item.data_ptr(), item._version)
+        return versions
+
     @property
     def keys(self):
         r"""
@@ -89,10 +285,11 @@ class Graph(object):
         """
         # filter attributes that are not observed by users
         # (1) those with value "None"; (2) those start with '_'
+        # G is only included when it has been built
         keys = [
-            key
-            for key in self.__dict__.keys()
-            if self[key] is not None and key[0] != "_"
+            "G" if key == "_G" else key
+            for key, item in self.__dict__.items()
+            if item is not None and (key[0] != "_" or key == "_G")
         ]
         return keys
 
@@ -169,7 +366,16 @@ class Graph(object):
         Returns:
             int: Number of nodes in the graph.
         """
-        return self.G.number_of_nodes()
+        if self._G is not None:
+            return self._G.number_of_nodes()
+        if self._num_nodes is not None:
+            return self._num_nodes
+        for key in self.keys:
+            if self._is_node_attribute(key) and torch.is_tensor(self[key]):
+                return self[key].size(0)
+        if self.edge_index is not None:
+            return int(self.edge_index.max()) + 1
+        return None
 
     @property
     def num_edges(self) -> int:
@@ -179,7 +385,11 @@ class Graph(object):
         Returns:
             int: Number of edges.
         """
-        return self.G.number_of_edges()
+        if self._G is not None:
+            return self._G.number_of_edges()
+        if self.is_undirected():
+            return self.edge_index.size(1) // 2
+        return self.edge_index.size(1)
 
     @property
     def num_node_features(self) -> int:
@@ -281,7 +491,9 @@ class Graph(object):
         Returns:
             bool: :obj:`True` if the graph is directed.
         """
-        return self.G.is_directed()
+        if self._G is not None:
+            return self._G.is_directed()
+        return self._directed is not False
 
     def is_undirected(self) -> bool:
         r"""
@@ -290,7 +502,7 @@ class Graph(object):
         Returns:
             bool: :obj:`True` if the graph is undirected.
         """
-        return not self.G.is_directed()
+        return not self.is_directed()
 
     def apply_tensor(self, func, *keys):
         r"""
@@ -339,7 +551,12 @@ class Graph(object):
             device: Specified device name.
             *keys (string, optional): Tensor attributes which will transfer to the specified device.
         """
-        return self.apply_tensor(lambda x: x.to(device), *keys)
+        self.apply_tensor(lambda x: x.to(device), *keys)
+        # feature stores gather their rows to the device
+        for key, item in self(*keys):
+            if isinstance(item, FeatureStore):
+                self[key] = item.to(device)
+        return self
 
     def clone(self):
         r"""
@@ -406,42 +623,62 @@ class Graph(object):
                     0
                 ), f"key {key} is not valid, num nodes must equal num nodes w/ features"
 
-    def _update_tensors(self, init: bool = False):
+    def _update_tensors(self, init: bool = False, keys: List[str] = None):
         r"""
         Update attributes and edge indices with values from the .G graph object.
+
+        Args:
+            init (boolean): whether the tensors are initialized for the first time.
+            keys (list): if specified, only these attributes are updated.
         """
-        self._update_attributes()
+        if self._G is None:
+            # tensor backed graph, the tensors are already up to date
+            return
+        if not init and not self._tensors_stale:
+            # G has not been accessed since the last sync
+            return
+        self._update_attributes(None if init else keys)
         self._update_index(init)
+        self._tensors_stale = False
+        self._synced_tensors = self._tensor_versions()
 
-    def _update_attributes(self):
+    def _update_attributes(self, keys: List[str] = None):
         r"""
-        Update attributes
+        Update attributes. The nodes and edges of .G are each traversed once
+        for all of the attributes.
+
+        Args:
+            keys (list): if specified, only these attributes are updated.
         """
         # node
-        if self.G.number_of_nodes() == 0:
+        if self._G.number_of_nodes() == 0:
             raise ValueError(
                 "in _update_attributes, number of nodes in Graph "
                 "G must be larger than 0"
             )
-        if self.G.number_of_edges() == 0:
+        if self._G.number_of_edges() == 0:
             raise ValueError(
                 "in _update_attributes, number of edges in Graph "
                 "G must be larger than 0"
             )
 
-        keys = next(iter(self.G.nodes(data=True)))[-1].keys()
-        for key in keys:
-            if key != "node_type":
-                self[key] = self._get_node_attributes(key)
+        node_keys = [
+            key for key in next(iter(self._G.nodes(data=True)))[-1].keys()
+            if key != "node_type" and (keys is None or key in keys)
+        ]
+        for key, value in self._get_node_attributes_multi(node_keys).items():
+            self[key] = value
         # edge
-        keys = next(iter(self.G.edges(data=True)))[-1].keys()
-        for key in keys:
-            if key != "edge_type":
-                self[key] = self._get_edge_attributes(key)
+        edge_keys = [
+            key for key in next(iter(self._G.edges(data=True)))[-1].keys()
+            if key != "edge_type" and (keys is None or key in keys)
+        ]
+        for key, value in self._get_edge_attributes_multi(edge_keys).items():
+            self[key] = value
         # graph
-        keys = self.G.graph.keys()
-        for key in keys:
-            self[key] = self._get_graph_attributes(key)
+        for key in self._G.graph.keys():
+            if keys is None or key in keys:
+                self[key] = self._get_graph_attributes(key)
 
     def _get_node_attributes(self, name: str):
         r"""
@@ -453,21 +690,27 @@ class Graph(object):
         Returns:
             :class:`torch.tensor`: Node attributes.
         """
-        # new: concat
-        attributes = []
-        for _, d in self.G.nodes.items():
-            if name in d:
-                attributes.append(d[name])
-        if len(attributes) == 0:
-            return None
-        if torch.is_tensor(attributes[0]):
-            attributes = torch.stack(attributes, dim=0)
-        elif isinstance(attributes[0], float):
-            attributes = torch.tensor(attributes, dtype=torch.float)
-        elif isinstance(attributes[0], int):
-            attributes = torch.tensor(attributes, dtype=torch.long)
+        return self._get_node_attributes_multi([name])[name]
 
-        return attributes
+    def _get_node_attributes_multi(self, names: List[str]):
+        r"""
+        Returns the node attributes for each of :obj:`names`, traversing
+        the nodes of the graph only once.
+
+        Args:
+            names (list): the names of the attributes to return.
+
+        Returns:
+            dict: Attribute name to :class:`torch.tensor` of node attributes.
+        """
+        if len(names) == 0:
+            return {}
+        attributes = Graph._collect_attributes(
+            (d for _, d in self._G.nodes(data=True)), names
+        )
+        return {
+            name: Graph._stack_attributes(attributes[name]) for name in names
+        }
 
     def _get_edge_attributes(self, name: str):
         r"""
@@ -479,28 +722,126 @@ class Graph(object):
         Returns:
             :class:`torch.tensor`: Edge attributes.
         """
+        return self._get_edge_attributes_multi([name])[name]
 
-        # new: concat
-        attributes = []
-        for x in self.G.edges(data=True):
-            if name in x[-1]:
-                attributes.append(x[-1][name])
-        if len(attributes) == 0:
-            return None
-        if torch.is_tensor(attributes[0]):
-            attributes = torch.stack(attributes, dim=0)
-        elif isinstance(attributes[0], float):
-            attributes = torch.tensor(attributes, dtype=torch.float)
-        elif isinstance(attributes[0], int):
-            attributes = torch.tensor(attributes, dtype=torch.long)
-        else:
-            raise ValueError("Unknown type of key {} in edge attributes.")
+    def _get_edge_attributes_multi(self, names: List[str]):
+        r"""
+        Returns the edge attributes for each of :obj:`names`, traversing
+        the edges of the graph only once.
 
-        if self.is_undirected():
-            attributes = torch.cat([attributes, attributes], dim=0)
+        Args:
+            names (list): the names of the attributes to return.
 
+        Returns:
+            dict: Attribute name to :class:`torch.tensor` of edge attributes.
+        """
+        if len(names) == 0:
+            return {}
+        collected = Graph._collect_attributes(
+            (edge[-1] for edge in self._G.edges(data=True)), names
+        )
+        attributes = {}
+        for name in names:
+            attribute = Graph._stack_attributes(collected[name])
+            if attribute is not None:
+                if not torch.is_tensor(attribute):
+                    raise ValueError(
+                        f"Unknown type of key {name} in edge attributes."
+                    )
+                if self.is_undirected():
+                    attribute = torch.cat([attribute, attribute], dim=0)
+            attributes[name] = attribute
         return attributes
 
+    @staticmethod
+    def _collect_attributes(attribute_dicts, names: List[str]):
+        r"""
+        Collects the attributes :obj:`names` from node or edge attribute
+        dictionaries (e.g. of :obj:`G.nodes(data=True)`). The NetworkX structure
+        is only traversed once, after which each attribute is gathered
+        from the flat list of dictionaries.
+
+        Args:
+            attribute_dicts (iterable): node or edge attribute dictionaries.
+            names (list): names of the attributes to collect.
+
+        Returns:
+            dict: Attribute name to the list of attribute values, where
+            the elements without the attribute are skipped.
+        """
+        attribute_dicts = list(attribute_dicts)
+        attributes = {}
+        for name in names:
+            try:
+                attributes[name] = [d[name] for d in attribute_dicts]
+            except KeyError:
+                attributes[name] = [
+                    d[name] for d in attribute_dicts if name in d
+                ]
+        return attributes
+
+    @staticmethod
+    def _stack_attributes(attributes: List):
+        r"""
+        Converts a list of attribute values to a tensor. Tensors are
+        stacked, and python floats and ints are converted to float and
+        long tensors respectively.
+
+        If the tensors are consecutive rows of the same tensor (e.g. when
+        :obj:`G` was built from the tensors of the graph), those rows are
+        returned without copying.
+
+        Returns:
+            :class:`torch.tensor`: Stacked attributes, or the list itself
+            if the values are of other types.
+        """
+        if len(attributes) == 0:
+            return None
+        first = attributes[0]
+        if torch.is_tensor(first):
+            rows = Graph._rows_of_base(attributes)
+            if rows is not None:
+                return rows
+            return torch.stack(attributes, dim=0)
+        elif isinstance(first, float):
+            return torch.tensor(attributes, dtype=torch.float)
+        elif isinstance(first, int):
+            return torch.tensor(attributes, dtype=torch.long)
+        return attributes
+
+    @staticmethod
+    def _rows_of_base(tensors: List[torch.Tensor]):
+        r"""
+        Returns the tensor whose consecutive rows are exactly the views in
+        :obj:`tensors`, or None if the tensors are not such views.
+        """
+        first = tensors[0]
+        base = first._base
+        if (
+            base is None
+            or base.dim() != first.dim() + 1
+            or base.shape[1:] != first.shape
+            or base.stride()[1:] != first.stride()
+            or base.stride(0) == 0
+        ):
+            return None
+        stride = base.stride(0)
+        offset = first.storage_offset() - base.storage_offset()
+        if offset % stride != 0:
+            return None
+        start = first.storage_offset()
+        if not all(
+            tensor._base is base
+            and tensor.storage_offset() == start + i * stride
+            and tensor.shape == first.shape
+            for i, tensor in enumerate(tensors)
+        ):
+            return None
+        row = offset // stride
+        if row + len(tensors) > base.size(0):
+            return None
+        return base.narrow(0, row, len(tensors))
+
     def _get_graph_attributes(self, name: str):
         r"""
         Returns the graph attributes.
@@ -511,19 +852,15 @@ class Graph(object):
         Returns:
             any: graph attributes with the specified name.
         """
-        return self.G.graph.get(name)
+        return self._G.graph.get(name)
 
     def _update_index(self, init=False):
         # TODO: add validity check for custom_splits
         # TODO: add validity check for custom_disjoint_split
-        # relabel graphs
-        keys = list(self.G.nodes)
-        vals = list(range(self.num_nodes))
-        mapping = dict(zip(keys, vals))
-        if keys != vals:
-            self.G = nx.relabel_nodes(self.G, mapping, copy=True)
+        # map node ids of G to node indices, G itself is not relabeled
+        self._update_node_ids()
         # get edges
-        self.edge_index = self._edge_to_index(list(self.G.edges))
+        self.edge_index = self._edge_to_index(list(self._G.edges))
         if init:
             # init is only true when creating the variables
             # edge_label_index and node_label_index
@@ -532,71 +869,206 @@ class Graph(object):
                 torch.arange(self.num_nodes, dtype=torch.long)
             )
 
-            # TODO: handle the networkx multi-graph case
             if self.task is not None:
+                # custom splits are stored as tensors of node indices, edges
+                # of multigraphs are kept as they are to keep the edge keys
                 if self.custom_splits is not None:
                     if self.task == "node":
                         for i in range(len(self.custom_splits)):
-                            nodes = self.custom_splits[i]
-                            nodes = [
-                                mapping[node]
-                                for node in nodes
-                            ]
-                            self.custom_splits[i] = nodes
-                    elif self.task == "edge" or self.task == "link_pred":
+                            self.custom_splits[i] = self._node_ids_to_index(
+                                self.custom_splits[i]
+                            )
+                    elif (
+                        (self.task == "edge" or self.task == "link_pred")
+                        and not self._G.is_multigraph()
+                    ):
                         for i in range(len(self.custom_splits)):
-                            edges = self.custom_splits[i]
-                            for j in range(len(edges)):
-                                node_0 = mapping[
-                                    edges[j][0]
-                                ]
-                                node_1 = mapping[
-                                    edges[j][1]
-                                ]
-                                if len(edges[j]) == 3:
-                                    edge_info = edges[j][2]
-                                    edge = (node_0, node_1, edge_info)
-                                elif len(edges[j]) == 2:
-                                    edge = (node_0, node_1)
-                                else:
-                                    raise ValueError(
-                                        "edge has length more than 3."
-                                    )
-                                self.custom_splits[i][j] = edge
+                            self.custom_splits[i] = (
+                                self._custom_edges_to_index(
+                                    self.custom_splits[i]
+                                )
+                            )
 
                 if self.custom_disjoint_split is not None:
                     if self.task == "link_pred":
-                        edges = self.custom_disjoint_split
-                        for i in range(len(edges)):
-                            node_0 = mapping[edges[i][0]]
-                            node_1 = mapping[edges[i][1]]
-                            if len(edges[i]) == 3:
-                                edge_info = edges[i][2]
-                                edge = (node_0, node_1, edge_info)
-                            elif len(edges[i]) == 2:
-                                edge = (node_0, node_1)
-                            else:
-                                raise ValueError("edge has length more than 3.")
-                            self.custom_disjoint_split[i] = edge
+                        if not self._G.is_multigraph():
+                            self.custom_disjoint_split = (
+                                self._custom_edges_to_index(
+                                    self.custom_disjoint_split
+                                )
+                            )
+                        elif any(
+                            len(edge) not in [2, 3]
+                            for edge in self.custom_disjoint_split
+                        ):
+                            raise ValueError("edge has length more than 3.")
                     else:
                         raise ValueError(
                             "When self.custom_disjoint_splits is not "
                             "None, self.task must be `link_pred`"
                         )
 
+    def _custom_edges_to_index(self, edges) -> torch.Tensor:
+        r"""
+        Maps the edges of a custom split to node indices.
+
+        Args:
+            edges (list or :class:`torch.Tensor`): edges of .G, or a tensor
+                with shape [2 x num_edges] of node ids of .G.
+
+        Returns:
+            :class:`torch.LongTensor`: Edges with shape [2 x num_edges].
+        """
+        if torch.is_tensor(edges):
+            if edges.dim() != 2 or edges.size(0) != 2:
+                raise ValueError(
+                    "Edges of custom splits need to be a tensor "
+                    "with shape [2 x num_edges]."
+                )
+            return torch.stack(
+                [
+                    self._node_ids_to_index(edges[0]),
+                    self._node_ids_to_index(edges[1]),
+                ]
+            )
+        if any(len(edge) not in [2, 3] for edge in edges):
+            raise ValueError("edge has length more than 3.")
+        return torch.stack(
+            [
+                self._node_ids_to_index([edge[0] for edge in edges]),
+                self._node_ids_to_index([edge[1] for edge in edges]),
+            ]
+        )
+
+    def _edge_index_to_ids(self, edges: torch.Tensor) -> torch.Tensor:
+        r"""
+        Finds the ids of edges (positions in :meth:`_unique_edges`) given
+        by their node indices. Edges of undirected graphs can be given in
+        either direction. Parallel edges are matched to the first of them.
+
+        Args:
+            edges (:class:`torch.Tensor`): edges with shape [2 x num_edges].
+
+        Returns:
+            :class:`torch.LongTensor`: Edge ids.
+        """
+        num_nodes = self.num_nodes
+        edge_index = self.edge_index[:, :self.num_edges]
+        if self.is_undirected():
+            edge_index, _ = torch.sort(edge_index, dim=0)
+            edges, _ = torch.sort(edges, dim=0)
+        edge_keys = (edge_index[0] * num_nodes + edge_index[1]).cpu().numpy()
+        keys = (edges[0] * num_nodes + edges[1]).cpu().numpy()
+        sorter = np.argsort(edge_keys, kind="stable")
+        position = np.searchsorted(edge_keys, keys, sorter=sorter)
+        position[position == len(edge_keys)] = 0
+        edge_ids = sorter[position]
+        if not np.all(edge_keys[edge_ids] == keys):
+            raise ValueError("Edges of custom splits are not in the graph.")
+        return torch.from_numpy(edge_ids.astype(np.int64))
+
+    def _update_node_ids(self):
+        r"""
+        Updates the table from the node ids of .G to the node indices,
+        which are the positions of the nodes in .G. No table is kept when
+        the node ids are already 0, ..., num_nodes - 1 in order.
+
+        Node ids that are all integers or all strings are stored in a numpy
+        array and looked up by binary search, other node ids (including
+        mixed integers and strings) are looked up in a dictionary.
+        """
+        nodes = list(self._G.nodes)
+        self._node_ids = None
+        self._node_id_sorter = None
+        self._node_id_dict = None
+        if nodes == list(range(len(nodes))):
+            return
+        # only node ids of a single type are stored in an array, such that
+        # e.g. 1 and "1" are not the same id
+        node_ids = None
+        if len(nodes) > 0 and (
+            all(type(node) is int for node in nodes)
+            or all(type(node) is str for node in nodes)
+        ):
+            node_ids = np.asarray(nodes)
+        if (
+            node_ids is not None
+            and node_ids.ndim == 1
+            and node_ids.dtype.kind in "iuU"
+        ):
+            self._node_ids = node_ids
+            self._node_id_sorter = np.argsort(node_ids, kind="stable")
+        else:
+            self._node_ids = nodes
+            self._node_id_dict = {node: i for i, node in enumerate(nodes)}
+
+    def _node_ids_to_index(self, nodes) -> torch.Tensor:
+        r"""
+        Maps node ids of .G to node indices.
+
+        Args:
+            nodes (list or :class:`torch.Tensor`): node ids of .G.
+
+        Returns:
+            :class:`torch.LongTensor`: Node indices.
+        """
+        if self._node_ids is None or len(nodes) == 0:
+            if torch.is_tensor(nodes):
+                return nodes.long()
+            return torch.as_tensor(nodes, dtype=torch.long)
+        if torch.is_tensor(nodes):
+            nodes = nodes.cpu().numpy()
+            if self._node_id_dict is not None:
+                nodes = nodes.tolist()
+        if self._node_id_dict is None:
+            query = np.asarray(nodes)
+            if (
+                query.ndim == 1
+                and query.dtype.kind in "iuUS"
+                and (query.dtype.kind in "iu") == (
+                    self._node_ids.dtype.kind in "iu"
+                )
+            ):
+                position = np.searchsorted(
+                    self._node_ids, query, sorter=self._node_id_sorter
+                )
+                position[position == len(self._node_ids)] = 0
+                index = self._node_id_sorter[position]
+                if np.all(self._node_ids[index] == query):
+                    return torch.from_numpy(index.astype(np.int64))
+            node_ids = set(self._node_ids.tolist())
+            missing = [node for node in nodes if node not in node_ids]
+            raise KeyError(f"Nodes {missing[:10]} are not in the graph.")
+        return torch.tensor(
+            [self._node_id_dict[node] for node in nodes], dtype=torch.long
+        )
+
     def _edge_to_index(self, edges):
         r"""
         List of G.edges to torch tensor edge_index
 
         Only the selected edges' edge indices are extracted.
         """
+        if torch.is_tensor(edges):
+            # [2 x num_edges] tensor of node indices, e.g. of custom splits
+            if self.is_undirected():
+                edges = torch.cat([edges, torch.flip(edges, [0])], dim=1)
+            return edges
         # TODO: potentially need to fix this for fully support of multigraph ?
         if len(edges) == 0:
             raise ValueError("in _edge_to_index, len(edges) must be " "larger than 0")
-        if len(edges[0]) > 2:  # edges have features or when nx graph is a multigraph
-            edges = [(edge[0], edge[1]) for edge in edges]
-
-        edge_index = torch.LongTensor(edges)
+        if self._node_ids is None:
+            if len(edges[0]) > 2:  # edges have features or when nx graph is a multigraph
+                edges = [(edge[0], edge[1]) for edge in edges]
+            edge_index = torch.LongTensor(edges)
+        else:
+            edge_index = torch.stack(
+                [
+                    self._node_ids_to_index([edge[0] for edge in edges]),
+                    self._node_ids_to_index([edge[1] for edge in edges]),
+                ],
+                dim=1,
+            )
         if self.is_undirected():
             edge_index = torch.cat(
                 [edge_index, torch.flip(edge_index, [1])],
@@ -618,39 +1090,48 @@ class Graph(object):
         if not isinstance(edges[0][-1], dict) or key not in edges[0][-1]:
             return None
 
-        attributes = [edge[-1][key] for edge in edges]
-        if torch.is_tensor(attributes[0]):
-            attributes = torch.stack(attributes, dim=0)
-        elif isinstance(attributes[0], float):
-            attributes = torch.tensor(attributes, dtype=torch.float)
-        elif isinstance(attributes[0], int):
-            attributes = torch.tensor(attributes, dtype=torch.long)
-        else:
-            raise ValueError("Unknown type of key {} in edge attributes.")
+        attributes = Graph._stack_attributes(
+            [edge[-1][key] for edge in edges]
+        )
+        if not torch.is_tensor(attributes):
+            raise ValueError(f"Unknown type of key {key} in edge attributes.")
 
         if self.is_undirected():
             attributes = torch.cat([attributes, attributes], dim=0)
 
         return attributes
 
-    def _update_graphs(self, verbose=False):
+    def _update_graphs(self, verbose=False, keys: List[str] = None):
         r"""
         Update the .G graph object with new attributes.
         The edges remain unchanged (edge_index should not be directly modified).
+        If :obj:`keys` is specified, only these attributes are written to .G.
 
         The counter-part of update_tensors.
         """
+        if self._G is None:
+            # G will be built from the up to date tensors when accessed
+            return
+        if (
+            self._synced_tensors is not None
+            and self._synced_tensors == self._tensor_versions()
+        ):
+            # tensors have not been changed since the last sync
+            return
         for key in self.keys:
+            if keys is not None and key not in keys:
+                continue
             if Graph._is_node_attribute(key):
-                Graph.add_node_attr(self.G, key, self[key])
+                Graph.add_node_attr(self._G, key, self[key])
             elif Graph._is_edge_attribute(key):
                 # the order of edge attributes is consistent with edge index
-                Graph.add_edge_attr(self.G, key, self[key])
+                Graph.add_edge_attr(self._G, key, self[key])
             elif Graph._is_graph_attribute(key):
-                Graph.add_graph_attr(self.G, key, self[key])
+                Graph.add_graph_attr(self._G, key, self[key])
             else:
                 if verbose:
                     print(f"Index fields: {key} ignored.")
+        self._synced_tensors = self._tensor_versions()
 
     def apply_transform(
         self,
@@ -658,6 +1139,7 @@ class Graph(object):
         update_tensor: bool = True,
         update_graph: bool = False,
         deep_copy: bool = False,
+        update_keys: List[str] = None,
         **kwargs,
     ):
         r"""
@@ -681,6 +1163,12 @@ class Graph(object):
         applying a transform in the future with update_tensor=True will overwrite the
         current transform (with parameters update_tensor=False; update_graph=False).
 
+        Syncing is skipped when there is nothing to sync: update_tensor only re-reads the
+        tensors if .G was accessed by the transform, and update_graph only writes to .G if
+        it has been built and the tensors were changed. For tensor backed graphs .G is only
+        built when the transform accesses it. When the transform only changes some of the
+        attributes, update_keys restricts the sync to these attributes.
+
         Args:
             transform (fuction): in the format of :obj:`transform(deepsnap.graph.Graph, **kwargs)`.
                 The function needs to either return deepsnap.graph.Graph (the transformed graph
@@ -694,6 +1182,8 @@ class Graph(object):
                 In this case, the transform function needs to either return a graph object,
                 Important: when returning Graph object in transform function, user should decide
                 whether the tensor values of the graph is to be copied (deep copy).
+            update_keys (list): if specified, only these attributes are synced by
+                update_tensor and update_graph.
             **kwargs (any): additional args for the transform function.
 
         Returns:
@@ -706,7 +1196,7 @@ class Graph(object):
         graph_obj = copy.deepcopy(self) if deep_copy else self
         return_graph = transform(graph_obj, **kwargs)
 
-        if isinstance(return_graph, self.G.__class__):
+        if isinstance(return_graph, nx.Graph):
             return_graph = Graph(return_graph)
         elif isinstance(return_graph, self.__class__):
             return_graph = return_graph
@@ -718,9 +1208,9 @@ class Graph(object):
                 "Transform function returns a value of unknown type ({return_graph.__class__})"
             )
         if update_graph:
-            return_graph._update_graphs()
+            return_graph._update_graphs(keys=update_keys)
         if update_tensor:
-            return_graph._update_tensors()
+            return_graph._update_tensors(keys=update_keys)
         return return_graph
 
     def apply_transform_multi(
@@ -729,6 +1219,7 @@ class Graph(object):
         update_tensors: bool = True,
         update_graphs: bool = False,
         deep_copy: bool = False,
+        update_keys: List[str] = None,
         **kwargs,
     ):
         r"""
@@ -742,6 +1233,8 @@ class Graph(object):
                 The function needs to either return a tuple of deepsnap.graph.Graph (the transformed graph
                 object), or a tuple of internal .G object (NetworkX).
                 If returning .G object, all corresponding tensors will be updated.
+            update_keys (list): if specified, only these attributes are synced by
+                update_tensors and update_graphs.
 
         Returns:
             a tuple of transformed Graph objects.
@@ -750,7 +1243,7 @@ class Graph(object):
         graph_obj = copy.deepcopy(self) if deep_copy else self
         return_graphs = transform(graph_obj, **kwargs)
 
-        if isinstance(return_graphs[0], self.G.__class__):
+        if isinstance(return_graphs[0], nx.Graph):
             return_graphs = (
                 Graph(return_graph) for return_graph in return_graphs
             )
@@ -765,19 +1258,26 @@ class Graph(object):
             )
         if update_graphs:
             for return_graph in return_graphs:
-                return_graph._update_graphs()
+                return_graph._update_graphs(keys=update_keys)
         if update_tensors:
             for return_graph in return_graphs:
-                return_graph._update_tensors()
+                return_graph._update_tensors(keys=update_keys)
         return return_graphs
 
-    def split(self, task: str = "node", split_ratio: List[float] = None):
+    def split(
+        self,
+        task: str = "node",
+        split_ratio: List[float] = None,
+        generator: torch.Generator = None,
+    ):
         r"""
         Split current graph object to list of graph objects.
 
         Args:
             task (string): one of `node`, `edge` or `link_pred`.
             split_ratio (array_like): array_like ratios `[train_ratio, validation_ratio, test_ratio]`.
+            generator (:class:`torch.Generator`, optional): the random number
+                generator used for splitting.
 
         Returns:
             list: A Python list of :class:`deepsnap.graph.Graph` objects with specified task.
@@ -798,17 +1298,19 @@ class Graph(object):
             raise ValueError("split ratio must contain all positivevalues.")
 
         if task == "node":
-            return self._split_node(split_ratio)
+            return self._split_node(split_ratio, generator)
         elif task == "edge":
-            return self._split_edge(split_ratio)
+            return self._split_edge(split_ratio, generator)
         elif task == "link_pred":
-            return self.split_link_pred(split_ratio)
+            return self.split_link_pred(split_ratio, generator)
         elif task == "graph":
             raise ValueError("Graph task does not split individual graphs.")
         else:
             raise ValueError("Unknown task.")
 
-    def _split_node(self, split_ratio: float):
+    def _split_node(
+        self, split_ratio: float, generator: torch.Generator = None
+    ):
         r"""
         Split the graph into len(split_ratio) graphs for node prediction.
         Internally this splits node indices, and the model will only compute
@@ -824,7 +1326,9 @@ class Graph(object):
             )
 
         split_graphs = []
-        shuffled_node_indices = torch.randperm(self.num_nodes)
+        shuffled_node_indices = torch.randperm(
+            self.num_nodes, generator=generator
+        )
         split_offset = 0
 
         # perform `secure split` s.t. guarantees all splitted subgraph
@@ -846,7 +1350,9 @@ class Graph(object):
             split_graphs.append(graph_new)
         return split_graphs
 
-    def _split_edge(self, split_ratio: float):
+    def _split_edge(
+        self, split_ratio: float, generator: torch.Generator = None
+    ):
         r"""
         Split the graph into len(split_ratio) graphs for node prediction.
         Internally this splits node indices, and the model will only compute
@@ -861,8 +1367,11 @@ class Graph(object):
             )
 
         split_graphs = []
-        edges = list(self.G.edges)
-        random.shuffle(edges)
+        if self._G is None:
+            edges = torch.randperm(self.num_edges, generator=generator)
+        else:
+            edges = list(self._G.edges)
+            Graph._python_random(generator).shuffle(edges)
         split_offset = 0
 
         # perform `secure split` s.t. guarantees all splitted subgraph
@@ -878,11 +1387,22 @@ class Graph(object):
                 edges_split_i = edges[split_offset:]
             # shallow copy all attributes
             graph_new = copy.copy(self)
-            graph_new.edge_label_index = self._edge_to_index(edges_split_i)
+            if self._G is None:
+                graph_new.edge_label_index = (
+                    self._edge_ids_to_index(edges_split_i)
+                )
+            else:
+                graph_new.edge_label_index = (
+                    self._edge_to_index(edges_split_i)
+                )
             split_graphs.append(graph_new)
         return split_graphs
 
-    def split_link_pred(self, split_ratio: Union[float, List[float]]):
+    def split_link_pred(
+        self,
+        split_ratio: Union[float, List[float]],
+        generator: torch.Generator = None,
+    ):
         r"""
         Split the graph into len(split_ratio) graphs for link prediction.
         Internally this splits edge indices, and the model will only compute
@@ -893,6 +1413,11 @@ class Graph(object):
         Note: this functon will be called twice,
         if during training, we further split the training graph so that
         message edges and objective edges are different
+
+        Args:
+            split_ratio (float or list): ratios of the splits.
+            generator (:class:`torch.Generator`, optional): the random number
+                generator used for splitting.
         """
         if isinstance(split_ratio, float):
             split_ratio = [split_ratio, 1 - split_ratio]
@@ -911,8 +1436,13 @@ class Graph(object):
                     "smaller than number of splitted parts"
                 )
 
-        edges = list(self.G.edges(data=True))
-        random.shuffle(edges)
+        if self._G is None or not self._G.is_multigraph():
+            # G is not rebuilt for the splits, which are tensor backed
+            self._update_tensors()
+            return self._split_link_pred_tensor(split_ratio, generator)
+
+        edges = list(self._G.edges(data=True))
+        Graph._python_random(generator).shuffle(edges)
 
         # perform `secure split` s.t. guarantees all splitted subgraph
         # contains at least one edge.
@@ -930,13 +1460,13 @@ class Graph(object):
             edges_test = edges[num_edges_train + num_edges_val:]
 
         graph_train = Graph(
-            self._edge_subgraph_with_isonodes(self.G, edges_train)
+            self._edge_subgraph_with_isonodes(self._G, edges_train)
         )
         graph_val = copy.copy(graph_train)
         if len(split_ratio) == 3:
             graph_test = Graph(
                 self._edge_subgraph_with_isonodes(
-                    self.G, edges_train + edges_val
+                    self._G, edges_train + edges_val
                 )
             )
 
@@ -949,6 +1479,127 @@ class Graph(object):
         else:
             return [graph_train, graph_val]
 
+    def _split_link_pred_tensor(
+        self, split_ratio: List[float], generator: torch.Generator = None
+    ):
+        r"""
+        Tensor counterpart of :meth:`split_link_pred`, used for all graphs
+        except NetworkX multigraphs. The edge tensors are permuted once by
+        a random permutation, such that the edges of each split are
+        contiguous and the split graphs hold views into the permuted
+        tensors (for directed graphs). The split graphs share the node and
+        graph attributes of the current graph and are tensor backed, so
+        non-tensor attributes of :obj:`G` are not kept.
+        """
+        perm = torch.randperm(self.num_edges, generator=generator)
+        edges = {
+            key: item[:, perm] if key == "edge_index" else item[perm]
+            for key, item in self._unique_edges().items()
+        }
+
+        # perform `secure split` s.t. guarantees all splitted subgraph
+        # contains at least one edge.
+        if len(split_ratio) == 2:
+            num_edges_train = 1 + int(split_ratio[0] * (self.num_edges - 2))
+
+            edges_train = slice(0, num_edges_train)
+            edges_val = slice(num_edges_train, self.num_edges)
+        elif len(split_ratio) == 3:
+            num_edges_train = 1 + int(split_ratio[0] * (self.num_edges - 3))
+            num_edges_val = 1 + int(split_ratio[1] * (self.num_edges - 3))
+
+            edges_train = slice(0, num_edges_train)
+            edges_val = slice(
+                num_edges_train, num_edges_train + num_edges_val
+            )
+            edges_test = slice(
+                num_edges_train + num_edges_val, self.num_edges
+            )
+
+        graph_train = self._edge_subgraph_from_ids(edges, edges_train)
+        graph_val = copy.copy(graph_train)
+        if len(split_ratio) == 3:
+            edges_message = slice(0, num_edges_train + num_edges_val)
+            graph_test = self._edge_subgraph_from_ids(edges, edges_message)
+
+        # set objective
+        self._create_label_link_pred_tensor(
+            graph_train, edges, edges_train, edges_train
+        )
+        self._create_label_link_pred_tensor(
+            graph_val, edges, edges_train, edges_val
+        )
+        if len(split_ratio) == 3:
+            self._create_label_link_pred_tensor(
+                graph_test, edges, edges_message, edges_test
+            )
+            return [graph_train, graph_val, graph_test]
+        else:
+            return [graph_train, graph_val]
+
+    def _unique_edges(self) -> Dict[str, torch.Tensor]:
+        r"""
+        Returns the edge indices and edge attributes of a tensor backed
+        graph, where each edge of an undirected graph only appears once.
+        The returned tensors are views of the tensors of the graph.
+        """
+        num_edges = self.num_edges
+        edges = {"edge_index": self.edge_index[:, :num_edges]}
+        for key in self.keys:
+            if self._is_edge_attribute(key) and torch.is_tensor(self[key]):
+                edges[key] = self[key][:num_edges]
+        return edges
+
+    def _edge_ids_to_index(self, edge_ids: torch.Tensor) -> torch.Tensor:
+        r"""
+        Tensor counterpart of :meth:`_edge_to_index`, which takes ids of
+        the (unique) edges instead of a list of NetworkX edges.
+        """
+        if self.is_undirected():
+            edge_ids = torch.cat([edge_ids, edge_ids + self.num_edges])
+        return self.edge_index[:, edge_ids]
+
+    def _gather_edges(self, edges, edge_ids: torch.Tensor, key: str):
+        r"""
+        Gathers the tensor :obj:`key` from :obj:`edges` (returned by
+        :meth:`_unique_edges`) for the given edge ids, or a view if the ids
+        are a :obj:`slice`. Edges of undirected graphs are returned in both
+        directions.
+        """
+        if key == "edge_index":
+            item = edges[key][:, edge_ids]
+            if self.is_undirected():
+                item = torch.cat([item, torch.flip(item, [0])], dim=1)
+        else:
+            item = edges[key][edge_ids]
+            if self.is_undirected():
+                item = torch.cat([item, item], dim=0)
+        return item
+
+    def _edge_subgraph_from_ids(self, edges, edge_ids: torch.Tensor):
+        r"""
+        Tensor counterpart of :meth:`_edge_subgraph_with_isonodes`.
+        Generates a new tensor backed graph with the same nodes and a
+        subset of edges. Node and graph attributes are shared with the
+        current graph.
+        """
+        graph = self.__class__()
+        graph._num_nodes = self.num_nodes
+        graph._directed = self.is_directed()
+        graph._node_ids = self._node_ids
+        graph._node_id_sorter = self._node_id_sorter
+        graph._node_id_dict = self._node_id_dict
+        for key in self.keys:
+            if self._is_node_attribute(key) or self._is_graph_attribute(key):
+                graph[key] = self[key]
+        for key in edges:
+            graph[key] = self._gather_edges(edges, edge_ids, key)
+        graph.edge_label_index = graph.edge_index
+        graph.node_label_index = (
+            torch.arange(graph.num_nodes, dtype=torch.long)
+        )
+        return graph
+
     def _edge_subgraph_with_isonodes(self, G, edges):
         r"""
         Generate a new networkx graph with same nodes and their attributes.
@@ -964,18 +1615,74 @@ class Graph(object):
         G_new.add_edges_from(edges)
         return G_new
 
-    def resample_disjoint(self, message_ratio):
+    def resample_disjoint(
+        self, message_ratio, generator: torch.Generator = None
+    ):
         r""" Resample disjoint edge split of message passing and objective links.
 
         Note that if apply_transform (on the message passing graph)
         was used before this resampling, it needs to be
         re-applied, after resampling, to update some of the edges that were in objectives.
+
+        For tensor backed splits the union of message and objective edges
+        is kept as edge ids, which are re-partitioned by one permutation.
+        :obj:`edge_index`, the edge attributes, :obj:`edge_label_index` and
+        :obj:`edge_label` are updated in place (without negative edges) and
+        the graph itself is returned.
         """
         if not hasattr(self, "_objective_edges"):
             raise ValueError("No disjoint edge split was performed.")
+        if torch.is_tensor(self._objective_edges):
+            if isinstance(message_ratio, list):
+                message_ratio = message_ratio[0]
+            edge_ids = self._disjoint_edges
+            if edge_ids is None:
+                # combine message and objective edges
+                edge_ids = torch.unique(
+                    torch.cat([self._message_edges, self._objective_edges])
+                )
+            num_edges = edge_ids.numel()
+            if num_edges < 2:
+                raise ValueError(
+                    "in resample_disjoint num of edges are"
+                    "smaller than number of splitted parts"
+                )
+            # perform `secure split` s.t. guarantees both parts
+            # contain at least one edge.
+            num_edges_message = 1 + int(message_ratio * (num_edges - 2))
+            edge_ids = edge_ids[
+                torch.randperm(num_edges, generator=generator)
+            ]
+            message_edge_ids = edge_ids[:num_edges_message]
+            objective_edge_ids = edge_ids[num_edges_message:]
+
+            # G is rebuilt from the updated tensors when accessed
+            self.drop_G()
+            edges = self._split_edges
+            for key in edges:
+                self[key] = self._gather_edges(edges, message_edge_ids, key)
+            self._create_label_link_pred_tensor(
+                self, edges, message_edge_ids, objective_edge_ids
+            )
+            self._disjoint_edges = edge_ids
+            self._num_positive_examples = None
+            return self
         # combine into 1 graph
-        self.G.add_edges_from(self._objective_edges)
-        return self.split_link_pred(message_ratio)[1]
+        self._G.add_edges_from(self._objective_edges)
+        return self.split_link_pred(message_ratio, generator)[1]
+
+    @staticmethod
+    def _python_random(generator: torch.Generator = None):
+        r"""
+        Returns the Python random number generator used to shuffle or sample
+        lists, which is seeded from the :obj:`generator`. The global
+        :obj:`random` module is returned if :obj:`generator` is None.
+        """
+        if generator is None:
+            return random
+        return random.Random(
+            int(torch.randint(2 ** 62, (1,), generator=generator))
+        )
 
     def _create_label_link_pred(self, graph, edges):
         r"""
@@ -992,8 +1699,44 @@ class Graph(object):
         # for resampling the disjoint split (message passing and objective links)
         graph._objective_edges = edges
 
+    def _create_label_link_pred_tensor(
+        self, graph, edges, message_edge_ids, objective_edge_ids
+    ):
+        r"""
+        Tensor counterpart of :meth:`_create_label_link_pred`, where the
+        message and objective edges are given as ids (or slices) into
+        :obj:`edges` (returned by :meth:`_unique_edges`).
+        """
+        graph.edge_label_index = (
+            self._gather_edges(edges, objective_edge_ids, "edge_index")
+        )
+        if "edge_label" in edges:
+            graph.edge_label = (
+                self._gather_edges(edges, objective_edge_ids, "edge_label")
+            )
+        else:
+            graph.edge_label = None
+        # keep the ids of the message and objective edges for resampling
+        # the disjoint split (message passing and objective links)
+        graph._split_edges = edges
+        graph._message_edges = Graph._slice_to_ids(message_edge_ids)
+        graph._objective_edges = Graph._slice_to_ids(objective_edge_ids)
+        graph._disjoint_edges = None
+
+    @staticmethod
+    def _slice_to_ids(edge_ids) -> torch.Tensor:
+        if isinstance(edge_ids, slice):
+            return torch.arange(edge_ids.start, edge_ids.stop)
+        return edge_ids
+
     def _create_neg_sampling(
-        self, negative_sampling_ratio: float, resample: bool = False
+        self,
+        negative_sampling_ratio: float,
+        resample: bool = False,
+        generator: torch.Generator = None,
+        negative_sampling_mode: str = "random",
+        negative_sampler=None,
+        negative_edges: torch.Tensor = None,
     ):
         r"""
         Create negative samples for link prediction,
@@ -1012,6 +1755,22 @@ class Graph(object):
         Args:
             negative_sampling_ratio (float or int): ratio of negative sampling edges compared with the original edges.
             resample (boolean): whether should resample.
+            generator (:class:`torch.Generator`, optional): the random number
+                generator used for sampling the negative edges.
+            negative_sampling_mode (string): `random` to sample random node
+                pairs, or `tail` to keep the source node of each positive edge
+                and sample negative_sampling_ratio (an integer) random target
+                nodes for it. In the `tail` mode the negative targets of the
+                positive edges are :obj:`edge_label_index[1, num_pos:]`, which
+                can be viewed with shape [num_pos, negative_sampling_ratio].
+            negative_sampler (:class:`deepsnap.negative_sampling.NegativeSampler`, optional):
+                the sampler drawing the candidate negative edges. Uniformly
+                random nodes are drawn if not specified. Negative edges that
+                the sampler does not draw in 10 rounds of candidates are
+                sampled uniformly with a warning.
+            negative_edges (:class:`torch.LongTensor`, optional): negative
+                edges sampled ahead of time by :meth:`_sample_negative_edges`,
+                which are used instead of sampling new ones.
         """
         if resample and self._num_positive_examples is not None:
             # remove previous negative samples first
@@ -1020,24 +1779,18 @@ class Graph(object):
                 :, : self._num_positive_examples
             ]
         num_pos_edges = self.edge_label_index.shape[-1]
-        num_neg_edges = int(num_pos_edges * negative_sampling_ratio)
-
-        if self.edge_index.size() == self.edge_label_index.size() and (
-            torch.sum(self.edge_index - self.edge_label_index) == 0
-        ):
-            # (train in 'all' mode)
-            edge_index_all = self.edge_index
-        else:
-            edge_index_all = (
-                torch.cat((self.edge_index, self.edge_label_index), -1)
-            )
 
-        if len(edge_index_all) > 0:
-            negative_edges = self.negative_sampling(
-                edge_index_all, self.num_nodes, num_neg_edges
+        if negative_edges is None:
+            negative_edges = self._sample_negative_edges(
+                self.edge_label_index,
+                negative_sampling_ratio,
+                generator=generator,
+                negative_sampling_mode=negative_sampling_mode,
+                negative_sampler=negative_sampler,
             )
-        else:
-            return torch.LongTensor([])
+            if negative_edges is None:
+                return torch.LongTensor([])
+        num_neg_edges = negative_edges.shape[1]
 
         # label for negative edges is 0
         negative_label = torch.zeros(num_neg_edges, dtype=torch.long)
@@ -1060,6 +1813,116 @@ class Graph(object):
             torch.cat((positive_label, negative_label), -1).type(torch.long)
         )
 
+    def _sample_negative_edges(
+        self,
+        edge_label_index: torch.Tensor,
+        negative_sampling_ratio: float,
+        generator: torch.Generator = None,
+        negative_sampling_mode: str = "random",
+        negative_sampler=None,
+    ):
+        r"""
+        Samples the negative edges of the positive edges
+        :obj:`edge_label_index` (see :meth:`_create_neg_sampling`). The
+        graph itself is not changed, so that negative edges can be sampled
+        ahead of time, e.g. in a background thread.
+
+        Returns:
+            :class:`torch.LongTensor`: Negative edges with shape [2, num_neg],
+            or :obj:`None` if the graph has no edges.
+        """
+        if negative_sampling_mode not in ["random", "tail"]:
+            raise ValueError(
+                "`negative_sampling_mode` must be 'random' or 'tail'"
+            )
+        num_neg_edges = int(
+            edge_label_index.shape[-1] * negative_sampling_ratio
+        )
+
+        if self.edge_index.size() == edge_label_index.size() and (
+            torch.sum(self.edge_index - edge_label_index) == 0
+        ):
+            # (train in 'all' mode)
+            edge_index_all = self.edge_index
+        else:
+            edge_index_all = (
+                torch.cat((self.edge_index, edge_label_index), -1)
+            )
+
+        if len(edge_index_all) == 0:
+            return None
+        edge_keys = self._negative_sampling_keys(
+            edge_index_all, edge_label_index
+        )
+        if negative_sampling_mode == "tail":
+            negative_edges = self._negative_tail_sampling_from_keys(
+                edge_keys,
+                edge_label_index[0],
+                self.num_nodes,
+                int(negative_sampling_ratio),
+                generator,
+                sample_targets=(
+                    None if negative_sampler is None else
+                    lambda sources: negative_sampler.sample_targets(
+                        self, sources, generator
+                    )
+                ),
+            )
+        else:
+            negative_edges = self._negative_sampling_from_keys(
+                edge_keys,
+                self.num_nodes,
+                num_neg_edges,
+                generator,
+                sample_edges=(
+                    None if negative_sampler is None else
+                    lambda num: self._sample_negative_candidates(
+                        negative_sampler, num, generator
+                    )
+                ),
+            )
+        return negative_edges.to(edge_index_all.device)
+
+    def _sample_negative_candidates(
+        self, negative_sampler, num_samples: int, generator=None
+    ):
+        r"""
+        Draws :obj:`num_samples` candidate negative edges with the
+        :obj:`negative_sampler`.
+        """
+        sources = negative_sampler.sample_sources(
+            self, num_samples, generator
+        )
+        targets = negative_sampler.sample_targets(self, sources, generator)
+        return sources, targets
+
+    def _negative_sampling_keys(self, edge_index_all, edge_label_index):
+        r"""
+        Returns the sorted keys of the positive edges :obj:`edge_index_all`
+        (see :meth:`_edge_keys`). The keys are cached and reused as long as
+        :obj:`edge_index` and the positive :obj:`edge_label_index` are
+        unchanged, e.g. when negative edges are resampled in every epoch.
+        """
+        num_nodes = self.num_nodes
+        cache = self._negative_sampling_cache
+        if (
+            cache is not None
+            and cache[0] is self.edge_index
+            and cache[1] == self.edge_index._version
+            and cache[2] == num_nodes
+            and torch.equal(cache[3], edge_label_index)
+        ):
+            return cache[4]
+        edge_keys = Graph._edge_keys(edge_index_all, num_nodes)
+        self._negative_sampling_cache = (
+            self.edge_index,
+            self.edge_index._version,
+            num_nodes,
+            edge_label_index.clone(),
+            edge_keys,
+        )
+        return edge_keys
+
     @staticmethod
     def add_node_attr(G, attr_name: str, node_attr):
         r"""
@@ -1072,7 +1935,7 @@ class Graph(object):
                 attribute to set.
             node_attr (array_like): node attributes.
         """
-        attr_dict = dict(zip(range(G.number_of_nodes()), node_attr))
+        attr_dict = dict(zip(G.nodes, node_attr))
         nx.set_node_attributes(G, attr_dict, name=attr_name)
 
     @staticmethod
@@ -1104,7 +1967,12 @@ class Graph(object):
         G.graph[attr_name] = graph_attr
 
     @staticmethod
-    def pyg_to_graph(data, verbose: bool = False, fixed_split: bool = False):
+    def pyg_to_graph(
+        data,
+        verbose: bool = False,
+        fixed_split: bool = False,
+        backend: str = "networkx",
+    ):
         r"""
         Converts Pytorch Geometric data to a Graph object.
 
@@ -1112,13 +1980,15 @@ class Graph(object):
             data (:class:`torch_geometric.data`): a Pytorch Geometric data.
             verbose: if print verbose warning
             fixed_split: if load fixed data split from PyG dataset
+            backend (str): `networkx` to build the graph through a NetworkX
+                object, or `tensor` to build a tensor backed graph directly
+                with :meth:`from_tensors`.
 
         Returns:
             :class:`deepsnap.graph.Graph`: A new DeepSNAP :class:`deepsnap.graph.Graph` object.
         """
-        G = nx.Graph()
-        G.add_nodes_from(range(data.num_nodes))
-        G.add_edges_from(data.edge_index.t().tolist())
+        if backend not in ["networkx", "tensor"]:
+            raise ValueError("`backend` must be 'networkx' or 'tensor'")
 
         # all fields in PyG Data object
         kwargs = {}
@@ -1145,6 +2015,30 @@ class Graph(object):
             if key not in keys_processed:
                 kwargs[key] = data[key]
 
+        if backend == "tensor":
+            attributes = {
+                key: value
+                for key, value in kwargs.items()
+                if value is not None and (
+                    Graph._is_node_attribute(key)
+                    or Graph._is_edge_attribute(key)
+                    or Graph._is_graph_attribute(key)
+                )
+            }
+            graph = Graph.from_tensors(
+                data.edge_index,
+                num_nodes=data.num_nodes,
+                directed=False,
+                **attributes
+            )
+            if fixed_split:
+                return Graph._fixed_split(graph, data, kwargs)
+            return graph
+
+        G = nx.Graph()
+        G.add_nodes_from(range(data.num_nodes))
+        G.add_edges_from(data.edge_index.t().tolist())
+
         # we assume that edge-related and node-related features are defined
         # the same as in Graph._is_edge_attribute and Graph._is_node_attribute
         for key, value in kwargs.items():
@@ -1161,20 +2055,27 @@ class Graph(object):
                 if verbose:
                     print(f"Index fields: {key} ignored.")
         if fixed_split:
-            masks = ["train_mask", "val_mask", "test_mask"]
-            graph = Graph(G)
-            graphs = []
-            for mask in masks:
-                if mask in kwargs:
-                    graph_new = copy.copy(graph)
-                    graph_new.node_label_index = (
-                        torch.nonzero(data[mask]).squeeze()
-                    )
-                    graphs.append(graph_new)
-            return graphs
+            return Graph._fixed_split(Graph(G), data, kwargs)
         else:
             return Graph(G)
 
+    @staticmethod
+    def _fixed_split(graph, data, kwargs):
+        r"""
+        Splits the graph converted by :meth:`pyg_to_graph` according to
+        the fixed split masks of the PyG data.
+        """
+        masks = ["train_mask", "val_mask", "test_mask"]
+        graphs = []
+        for mask in masks:
+            if mask in kwargs:
+                graph_new = copy.copy(graph)
+                graph_new.node_label_index = (
+                    torch.nonzero(data[mask]).squeeze()
+                )
+                graphs.append(graph_new)
+        return graphs
+
     @staticmethod
     def raw_to_graph(data):
         r"""
@@ -1184,7 +2085,12 @@ class Graph(object):
         raise NotImplementedError
 
     @staticmethod
-    def negative_sampling(edge_index, num_nodes=None, num_neg_samples=None):
+    def negative_sampling(
+        edge_index,
+        num_nodes=None,
+        num_neg_samples=None,
+        generator: torch.Generator = None,
+    ):
         r"""Samples random negative edges of a graph given by :attr:`edge_index`.
 
         Args:
@@ -1194,30 +2100,234 @@ class Graph(object):
             num_neg_samples (int, optional): The number of negative samples to
                 return. If set to :obj:`None`, will try to return a negative edge
                 for every positive edge. (default: :obj:`None`)
-            force_undirected (bool, optional): If set to :obj:`True`, sampled
-                negative edges will be undirected. (default: :obj:`False`)
+            generator (:class:`torch.Generator`, optional): The random number
+                generator used for sampling. (default: :obj:`None`)
 
         :rtype: :class:`torch.LongTensor`
         """
-        num_neg_samples = min(
-            num_neg_samples, num_nodes * num_nodes - edge_index.size(1)
-        )
+        if num_nodes is None:
+            num_nodes = int(edge_index.max()) + 1
+        if num_neg_samples is None:
+            num_neg_samples = edge_index.size(1)
+        edge_keys = Graph._edge_keys(edge_index, num_nodes)
+        return Graph._negative_sampling_from_keys(
+            edge_keys, num_nodes, num_neg_samples, generator
+        ).to(edge_index.device)
+
+    @staticmethod
+    def _edge_keys(edge_index, num_nodes: int):
+        r"""
+        Returns the sorted unique keys :obj:`num_nodes * i + j` of the
+        edges :obj:`(i, j)` in :attr:`edge_index`, as a numpy array.
+        """
+        keys = edge_index[0].to("cpu") * num_nodes + edge_index[1].to("cpu")
+        return Graph._sorted_unique(keys.numpy())
 
-        rng = range(num_nodes ** 2)
-        # idx = N * i + j
-        idx = (edge_index[0] * num_nodes + edge_index[1]).to("cpu")
+    @staticmethod
+    def _sorted_unique(keys):
+        r"""
+        Sorts a numpy array of keys and removes the duplicates.
+        """
+        keys = np.sort(keys)
+        if len(keys) > 1:
+            keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+        return keys
+
+    @staticmethod
+    def _isin_sorted(keys, sorted_keys):
+        r"""
+        Returns whether each of the sorted :obj:`keys` is in the sorted
+        array :obj:`sorted_keys`.
+        """
+        if len(sorted_keys) == 0:
+            return np.zeros(len(keys), dtype=bool)
+        position = np.searchsorted(sorted_keys, keys)
+        position[position == len(sorted_keys)] = 0
+        return sorted_keys[position] == keys
+
+    @staticmethod
+    def _isin_keys(keys, sorted_keys):
+        r"""
+        Returns whether each of the (unsorted) :obj:`keys` is in the sorted
+        array :obj:`sorted_keys`. The keys are sorted for the binary search,
+        which keeps the memory accesses of the search local.
+        """
+        order = np.argsort(keys)
+        is_in = np.empty(len(keys), dtype=bool)
+        is_in[order] = Graph._isin_sorted(keys[order], sorted_keys)
+        return is_in
+
+    @staticmethod
+    def _negative_tail_sampling_from_keys(
+        edge_keys,
+        sources: torch.Tensor,
+        num_nodes: int,
+        num_neg_per_source: int,
+        generator: torch.Generator = None,
+        sample_targets=None,
+    ):
+        r"""
+        Samples negative edges by keeping the source node of each of the
+        positive edges and corrupting the target node, where the positive
+        edges are given by their sorted keys (see :meth:`_edge_keys`).
+
+        The negative edges of the :obj:`i`-th source are at the positions
+        :obj:`i * num_neg_per_source, ..., (i + 1) * num_neg_per_source - 1`.
+        Target nodes are drawn by :obj:`sample_targets` (a function of the
+        source nodes) if given, and uniformly otherwise. Targets that are
+        still rejected after 10 rounds are drawn uniformly with a warning.
+
+        :rtype: :class:`torch.LongTensor`
+        """
+        sources = sources.to("cpu")
+        if len(edge_keys) > 0:
+            degree = np.bincount(edge_keys // num_nodes, minlength=num_nodes)
+            if np.any(degree[sources.numpy()] >= num_nodes):
+                raise ValueError(
+                    "Negative target nodes can not be sampled for source "
+                    "nodes that are connected to all nodes."
+                )
+        row = sources.repeat_interleave(num_neg_per_source)
+        rest = torch.arange(row.numel())
+        col = torch.zeros(row.numel(), dtype=torch.long)
+        num_rounds = 0
+        while rest.numel() > 0:
+            if sample_targets is not None and num_rounds < 10:
+                col[rest] = sample_targets(row[rest]).to("cpu")
+            else:
+                if sample_targets is not None and num_rounds == 10:
+                    warnings.warn(
+                        f"The negative sampler drew no negative target for "
+                        f"{rest.numel()} sources in 10 rounds, their "
+                        f"targets are sampled uniformly."
+                    )
+                col[rest] = torch.randint(
+                    num_nodes, (rest.numel(),), generator=generator
+                )
+            num_rounds += 1
+            keys = (row[rest] * num_nodes + col[rest]).numpy()
+            rest = rest[torch.from_numpy(Graph._isin_keys(keys, edge_keys))]
+        return torch.stack([row, col], dim=0).long()
 
-        perm = torch.tensor(random.sample(rng, num_neg_samples))
-        mask = torch.from_numpy(np.isin(perm, idx)).to(torch.bool)
-        rest = mask.nonzero().view(-1)
-        while rest.numel() > 0:  # pragma: no cover
-            tmp = torch.tensor(random.sample(rng, rest.size(0)))
-            mask = torch.from_numpy(np.isin(tmp, idx)).to(torch.bool)
-            perm[rest] = tmp
-            rest = rest[mask.nonzero().view(-1)]
+    @staticmethod
+    def _negative_sampling_from_keys(
+        edge_keys,
+        num_nodes: int,
+        num_neg_samples: int,
+        generator: torch.Generator = None,
+        sample_edges=None,
+    ):
+        r"""
+        Samples distinct random negative edges, where the positive edges are
+        given by their sorted keys (see :meth:`_edge_keys`). Candidate edges
+        are drawn by :obj:`sample_edges` (a function of the number of edges
+        returning their source and target nodes) if given, and uniformly
+        otherwise.
+
+        Candidate edges are drawn in bulk and rejected by a binary search
+        in the positive keys. The candidates are sorted before the search,
+        and the accepted keys are shuffled afterwards. When most of the
+        possible edges have to be sampled, the uniform negative keys are
+        enumerated instead. If :obj:`sample_edges` does not draw enough
+        distinct negative edges in 10 rounds of at most
+        :obj:`10 * num_neg_samples` candidates, or a round draws no new
+        negative edge, e.g. in small or dense graphs, the remaining edges
+        are sampled uniformly with a warning.
+
+        :rtype: :class:`torch.LongTensor`
+        """
+        num_keys = num_nodes * num_nodes
+        num_neg_samples = min(num_neg_samples, num_keys - len(edge_keys))
+        if num_neg_samples <= 0:
+            return torch.zeros((2, 0), dtype=torch.long)
+
+        if sample_edges is None:
+            keys = Graph._uniform_negative_keys(
+                edge_keys, num_nodes, num_neg_samples, generator
+            )
+        else:
+            keys = np.zeros(0, dtype=np.int64)
+            # fraction of the keys that are not drawn yet, replaced by the
+            # measured fraction of accepted candidates after the first round
+            acceptance = 1 - len(edge_keys) / num_keys
+            for _ in range(10):
+                if len(keys) >= num_neg_samples:
+                    break
+                # capped, since the measured acceptance is tiny when the
+                # sampler draws few distinct edges
+                num_candidates = min(
+                    int(1.1 * (num_neg_samples - len(keys)) / acceptance),
+                    10 * num_neg_samples,
+                ) + 16
+                row, col = sample_edges(num_candidates)
+                candidates = (row.to("cpu") * num_nodes + col.to("cpu"))
+                candidates = Graph._sorted_unique(candidates.numpy())
+                candidates = candidates[
+                    ~Graph._isin_sorted(candidates, edge_keys)
+                    & ~Graph._isin_sorted(candidates, keys)
+                ]
+                keys = np.sort(np.concatenate([keys, candidates]))
+                if len(candidates) == 0:
+                    # the sampler does not draw any other negative edges
+                    break
+                acceptance = len(candidates) / num_candidates
+            num_rest = num_neg_samples - len(keys)
+            if num_rest > 0:
+                warnings.warn(
+                    f"The negative sampler drew {len(keys)} of "
+                    f"{num_neg_samples} distinct negative edges, the "
+                    f"remaining {num_rest} are sampled uniformly."
+                )
+                excluded = np.sort(np.concatenate([edge_keys, keys]))
+                rest = Graph._uniform_negative_keys(
+                    excluded, num_nodes, num_rest, generator
+                )
+                perm = torch.randperm(len(rest), generator=generator)
+                rest = rest[perm[:num_rest].numpy()]
+                keys = np.concatenate([keys, rest])
+        # random subset of the negative keys in random order
+        perm = torch.randperm(len(keys), generator=generator)
+        keys = torch.from_numpy(keys)[perm[:num_neg_samples]]
 
-        row = perm // num_nodes
-        col = perm % num_nodes
-        neg_edge_index = torch.stack([row, col], dim=0).long()
+        row = keys // num_nodes
+        col = keys % num_nodes
+        return torch.stack([row, col], dim=0).long()
 
-        return neg_edge_index.to(edge_index.device)
+    @staticmethod
+    def _uniform_negative_keys(
+        excluded_keys,
+        num_nodes: int,
+        num_neg_samples: int,
+        generator: torch.Generator = None,
+    ):
+        r"""
+        Returns at least :obj:`num_neg_samples` distinct uniformly random
+        keys that are not in the sorted :obj:`excluded_keys`, or all of them
+        if most keys are needed. The returned keys are sorted.
+        """
+        num_keys = num_nodes * num_nodes
+        if 2 * (num_neg_samples + len(excluded_keys)) > num_keys:
+            # dense case, where rejection sampling would rarely succeed
+            is_negative = np.ones(num_keys, dtype=bool)
+            is_negative[excluded_keys] = False
+            return np.nonzero(is_negative)[0]
+        keys = np.zeros(0, dtype=np.int64)
+        acceptance = 1 - (len(excluded_keys) + num_neg_samples) / num_keys
+        while len(keys) < num_neg_samples:
+            num_candidates = int(
+                1.1 * (num_neg_samples - len(keys)) / acceptance
+            ) + 16
+            row = torch.randint(
+                num_nodes, (num_candidates,), generator=generator
+            )
+            col = torch.randint(
+                num_nodes, (num_candidates,), generator=generator
+            )
+            candidates = row * num_nodes + col
+            candidates = Graph._sorted_unique(candidates.numpy())
+            candidates = candidates[
+                ~Graph._isin_sorted(candidates, excluded_keys)
+                & ~Graph._isin_sorted(candidates, keys)
+            ]
+            keys = np.sort(np.concatenate([keys, candidates]))
+        return keys
@@ -1,8 +1,6 @@
 import math
 import copy
-import random
 import torch
-import networkx as nx
 import numpy as np
 from deepsnap.graph import Graph
 from typing import (
@@ -324,6 +322,19 @@ class HeteroGraph(Graph):
 
         return attributes
 
+    def _get_node_attributes_multi(self, keys: List[str]):
+        r"""
+        Returns the node attributes of each of the keys, see
+        `_get_node_attributes`.
+        """
+        return {key: self._get_node_attributes(key) for key in keys}
+
+    def _get_edge_attributes_multi(self, keys: List[str]):
+        r"""
+        Similar to the `_get_node_attributes_multi`
+        """
+        return {key: self._get_edge_attributes(key) for key in keys}
+
     def _get_edge_attributes(self, key: str):
         r"""
         Similar to the `_get_node_attributes`
@@ -375,10 +386,8 @@ class HeteroGraph(Graph):
         r"""
         Currently store the edge_index and edge_indices for each edge_type
         """
-        keys = list(self.G.nodes)
-        vals = range(self.num_nodes)
-        mapping = dict(zip(keys, vals))
-        self.G = nx.relabel_nodes(self.G, mapping, copy=True)
+        # map node ids of G to node indices, G itself is not relabeled
+        self._update_node_ids()
         self.edge_index = (
             self._edge_to_index(
                 list(self.G.edges(data=True)),
@@ -432,7 +441,14 @@ class HeteroGraph(Graph):
 
         if isinstance(edge_index, dict):
             for key in edge_index:
-                edge_index[key] = torch.LongTensor(edge_index[key])
+                edges = edge_index[key]
+                edge_index[key] = torch.stack(
+                    [
+                        self._node_ids_to_index([edge[0] for edge in edges]),
+                        self._node_ids_to_index([edge[1] for edge in edges]),
+                    ],
+                    dim=1,
+                )
 
         if self.is_undirected():
             if isinstance(edge_index, dict):
@@ -546,7 +562,12 @@ class HeteroGraph(Graph):
         )
         graph._objective_edges = edges
 
-    def _split_node(self, split_types: List[str], split_ratio: float):
+    def _split_node(
+        self,
+        split_types: List[str],
+        split_ratio: float,
+        generator: torch.Generator = None,
+    ):
         r"""
         Split the graph into len(split_ratio) graphs for node prediction.
         Internally this splits node indices, and the model will only compute
@@ -595,7 +616,8 @@ class HeteroGraph(Graph):
                     split_type_indices[split_type] = (
                         graph_new.node_label_index[split_type][
                             torch.randperm(
-                                split_type_index_lengths[split_type]
+                                split_type_index_lengths[split_type],
+                                generator=generator,
                             )
                         ]
                     )
@@ -636,7 +658,12 @@ class HeteroGraph(Graph):
 
         return split_graphs
 
-    def _split_edge(self, split_types: List[tuple], split_ratio: float):
+    def _split_edge(
+        self,
+        split_types: List[tuple],
+        split_ratio: float,
+        generator: torch.Generator = None,
+    ):
         r"""
         Split the graph into len(split_ratio) graphs for node prediction.
         Internally this splits node indices, and the model will only compute
@@ -683,7 +710,10 @@ class HeteroGraph(Graph):
                         graph_new.edge_label_index[split_type].shape[1]
                     )
                     rand_idx_type = (
-                        torch.randperm(split_type_index_lengths[split_type])
+                        torch.randperm(
+                            split_type_index_lengths[split_type],
+                            generator=generator,
+                        )
                     )
                     split_type_indices[split_type] = (
                         graph_new.edge_label_index[split_type][
@@ -733,6 +763,7 @@ class HeteroGraph(Graph):
         split_types: List[tuple],
         split_ratio: Union[float, List[float]],
         edge_split_mode: str = "exact",
+        generator: torch.Generator = None,
     ):
         r"""
         Split the graph into len(split_ratio) graphs for link prediction.
@@ -806,7 +837,7 @@ class HeteroGraph(Graph):
             for split_type in self.message_types:
                 edges_split_type = edges_split_type_dict[split_type]
                 edges_split_type_length = len(edges_split_type)
-                random.shuffle(edges_split_type)
+                Graph._python_random(generator).shuffle(edges_split_type)
                 if len(split_ratio) == 2:
                     if split_type in split_types:
                         num_edges_train = (
@@ -872,7 +903,7 @@ class HeteroGraph(Graph):
                     else:
                         edges_non_split_type.append(edge)
 
-                random.shuffle(edges_split_type)
+                Graph._python_random(generator).shuffle(edges_split_type)
                 edges_split_type_length = len(edges_split_type)
 
                 # perform `secure split` s.t. guarantees all splitted subgraph
@@ -918,7 +949,7 @@ class HeteroGraph(Graph):
                 # as compared to exact split by splitting all the edges
                 # regardless of edge types
                 edges = list(self.G.edges(data=True))
-                random.shuffle(edges)
+                Graph._python_random(generator).shuffle(edges)
 
                 # perform `secure split` s.t. guarantees all splitted subgraph
                 # contains at least one edge.
@@ -981,6 +1012,7 @@ class HeteroGraph(Graph):
         split_types: Union[str, List[str], tuple, List[tuple]] = None,
         split_ratio: List[float] = None,
         edge_split_mode: str = "exact",
+        generator: torch.Generator = None,
     ):
         r"""
         Split current graph object to list of graph objects.
@@ -990,6 +1022,8 @@ class HeteroGraph(Graph):
             split_types (list): Types splitted on. Default is `None` which will split all the types in
                 specified task.
             split_ratio (array_like): Array_like ratios `[train_ratio, validation_ratio, test_ratio]`.
+            generator (:class:`torch.Generator`, optional): The random number
+                generator used for splitting.
 
         Returns:
             list: A Python list of Graph objects with specified task.
@@ -1016,14 +1050,15 @@ class HeteroGraph(Graph):
             split_types = [split_types]
 
         if task == "node":
-            return self._split_node(split_types, split_ratio)
+            return self._split_node(split_types, split_ratio, generator)
         elif task == "edge":
-            return self._split_edge(split_types, split_ratio)
+            return self._split_edge(split_types, split_ratio, generator)
         elif task == "link_pred":
             return self.split_link_pred(
                 split_types,
                 split_ratio,
                 edge_split_mode,
+                generator,
             )
         elif task == "graph":
             raise ValueError("Graph task does not split individual graphs.")
@@ -1034,7 +1069,8 @@ class HeteroGraph(Graph):
         self,
         negative_sampling_ratio: float,
         split_types: List[str] = None,
-        resample: bool = False
+        resample: bool = False,
+        generator: torch.Generator = None,
     ):
         r"""
         Create negative samples for link prediction,
@@ -1053,6 +1089,8 @@ class HeteroGraph(Graph):
         Args:
             negative_sampling_ratio (float or int): ratio of negative sampling edges compared with the original edges.
             resample (boolean): whether should resample.
+            generator (:class:`torch.Generator`, optional): the random number
+                generator used for sampling the negative edges.
         """
         if split_types is None:
             split_types = self.message_types
@@ -1143,6 +1181,7 @@ class HeteroGraph(Graph):
                 edge_index_all,
                 self.get_num_nodes(),
                 num_neg_edges,
+                generator,
             )
         )
 
@@ -1221,6 +1260,7 @@ class HeteroGraph(Graph):
         edge_index: Dict[str, torch.tensor],
         num_nodes=None,
         num_neg_samples: Dict[str, int] = None,
+        generator: torch.Generator = None,
     ):
         r"""Samples random negative edges of a heterogeneous graph given by :attr:`edge_index`.
 
@@ -1233,6 +1273,8 @@ class HeteroGraph(Graph):
                 for every positive edge. (default: :obj:`None`)
             force_undirected (bool, optional): If set to :obj:`True`, sampled
                 negative edges will be undirected. (default: :obj:`False`)
+            generator (:class:`torch.Generator`, optional): The random number
+                generator used for sampling. (default: :obj:`None`)
 
         :rtype: :class:`torch.LongTensor`
         """
@@ -1249,6 +1291,7 @@ class HeteroGraph(Graph):
             }
         )
 
+        python_random = Graph._python_random(generator)
         rng = (
             {
                 message_type:
@@ -1271,7 +1314,7 @@ class HeteroGraph(Graph):
         perm = (
             {
                 message_type: torch.tensor(
-                    random.sample(
+                    python_random.sample(
                         rng[message_type],
                         num_neg_samples[message_type]
                     )
@@ -1300,7 +1343,7 @@ class HeteroGraph(Graph):
         for message_type in edge_index:
             while rest[message_type].numel() > 0:
                 tmp = torch.tensor(
-                    random.sample(
+                    python_random.sample(
                         rng[message_type],
                         rest[message_type].size(0)
                     )
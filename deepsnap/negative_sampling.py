@@ -0,0 +1,236 @@
+import numpy as np
+import torch
+
+
+class NegativeSampler(object):
+    r"""
+    Base class of the negative samplers used in link prediction, which
+    draw the candidate negative edges of a :class:`deepsnap.graph.Graph`.
+    Candidates that are positive edges are rejected and drawn again by
+    :meth:`deepsnap.graph.Graph._create_neg_sampling`. Negative edges that
+    are still missing after 10 rounds of candidates, e.g. since the sampler
+    concentrates on few node pairs of a small or dense graph, are sampled
+    uniformly with a warning.
+
+    This base class draws uniformly random nodes. Subclasses override
+    :meth:`sample_sources` and :meth:`sample_targets`, and can keep
+    precomputed tables of a graph with :meth:`_get_state`, which are
+    reused across epochs as long as the :obj:`edge_index` of the graph
+    is unchanged.
+    """
+    def sample_sources(
+        self, graph, num_samples: int, generator: torch.Generator = None
+    ):
+        r"""
+        Samples the source nodes of :obj:`num_samples` negative edges.
+
+        Args:
+            graph (:class:`deepsnap.graph.Graph`): the graph to sample from.
+            num_samples (int): number of source nodes to sample.
+            generator (:class:`torch.Generator`, optional): random number
+                generator used for sampling.
+
+        Returns:
+            :class:`torch.LongTensor`: Source nodes.
+        """
+        return torch.randint(
+            graph.num_nodes, (num_samples,), generator=generator
+        )
+
+    def sample_targets(
+        self, graph, sources, generator: torch.Generator = None
+    ):
+        r"""
+        Samples a target node of a negative edge for each of the
+        :obj:`sources`.
+
+        Args:
+            graph (:class:`deepsnap.graph.Graph`): the graph to sample from.
+            sources (:class:`torch.LongTensor`): source nodes.
+            generator (:class:`torch.Generator`, optional): random number
+                generator used for sampling.
+
+        Returns:
+            :class:`torch.LongTensor`: Target nodes.
+        """
+        return torch.randint(
+            graph.num_nodes, (sources.numel(),), generator=generator
+        )
+
+    def _build_state(self, graph):
+        r"""
+        Builds the tables of the sampler for the graph.
+        """
+        return None
+
+    def _get_state(self, graph):
+        r"""
+        Returns the tables of the sampler for the graph, which are cached
+        on the graph until its :obj:`edge_index` is changed.
+        """
+        cache = graph._negative_sampler_cache
+        if (
+            cache is not None
+            and cache[0] is self
+            and cache[1] is graph.edge_index
+            and cache[2] == graph.edge_index._version
+        ):
+            return cache[3]
+        state = self._build_state(graph)
+        graph._negative_sampler_cache = (
+            self, graph.edge_index, graph.edge_index._version, state
+        )
+        return state
+
+
+class DegreeNegativeSampler(NegativeSampler):
+    r"""
+    Samples the endpoints of negative edges with probability proportional
+    to their degree to the power of :obj:`alpha`, so that negatives
+    involve hub nodes as often as positives do. Source nodes are weighted
+    by out degree and target nodes by in degree, which are the same for
+    undirected graphs. The nodes are drawn in constant time per sample
+    from alias tables.
+
+    Args:
+        alpha (float): exponent of the degree, where 0 samples uniformly
+            and 1 proportionally to the degree.
+    """
+    def __init__(self, alpha: float = 0.75):
+        self.alpha = alpha
+
+    def _build_state(self, graph):
+        num_nodes = graph.num_nodes
+        edge_index = graph.edge_index.to("cpu")
+        tables = []
+        for row in [edge_index[0], edge_index[1]]:
+            degree = torch.bincount(row, minlength=num_nodes).double()
+            tables.append(
+                DegreeNegativeSampler._alias_table(degree.pow(self.alpha))
+            )
+        return tables
+
+    @staticmethod
+    def _alias_table(weights: torch.Tensor):
+        r"""
+        Builds the alias table of the discrete distribution proportional to
+        :obj:`weights`. Instead of pairing one under-full and one over-full
+        slot at a time, all under-full slots are assigned to over-full slots
+        at once by their cumulative deficits, which only takes a few rounds.
+
+        Returns:
+            tuple: Acceptance probabilities and aliases of the slots.
+        """
+        num_slots = weights.numel()
+        weights = weights.to("cpu").double().numpy()
+        if weights.sum() <= 0:
+            weights = np.ones(num_slots)
+        prob = weights * num_slots / weights.sum()
+        alias = np.arange(num_slots)
+        small = np.nonzero(prob < 1)[0]
+        large = np.nonzero(prob >= 1)[0]
+        while len(small) > 0 and len(large) > 0:
+            deficit = 1 - prob[small]
+            start = np.cumsum(deficit) - deficit
+            capacity_end = np.cumsum(prob[large] - 1)
+            # the over-full slot whose capacity covers the start of the deficit
+            index = np.searchsorted(capacity_end, start, side="right")
+            assigned = index < len(large)
+            alias[small[assigned]] = large[index[assigned]]
+            prob[large] -= np.bincount(
+                index[assigned],
+                weights=deficit[assigned],
+                minlength=len(large),
+            )
+            small = np.concatenate(
+                [small[~assigned], large[prob[large] < 1]]
+            )
+            large = large[prob[large] >= 1]
+        # slots left over by rounding errors
+        prob[small] = 1
+        prob[large] = 1
+        return torch.from_numpy(prob), torch.from_numpy(alias)
+
+    @staticmethod
+    def _sample_alias(table, num_samples: int, generator=None):
+        prob, alias = table
+        slots = torch.randint(
+            prob.numel(), (num_samples,), generator=generator
+        )
+        accept = (
+            torch.rand(num_samples, generator=generator, dtype=torch.double)
+            < prob[slots]
+        )
+        return torch.where(accept, slots, alias[slots])
+
+    def sample_sources(
+        self, graph, num_samples: int, generator: torch.Generator = None
+    ):
+        return DegreeNegativeSampler._sample_alias(
+            self._get_state(graph)[0], num_samples, generator
+        )
+
+    def sample_targets(
+        self, graph, sources, generator: torch.Generator = None
+    ):
+        return DegreeNegativeSampler._sample_alias(
+            self._get_state(graph)[1], sources.numel(), generator
+        )
+
+
+class HopNegativeSampler(NegativeSampler):
+    r"""
+    Samples "near-miss" negative edges, whose target node is reached from
+    the source node by a random walk of :obj:`num_hops` steps, i.e. nodes
+    that are close to the source but (after rejection) not linked to it.
+    The walks are taken in bulk on a cached CSR adjacency of
+    :obj:`edge_index`. Walks that end at the source node or at a node
+    without out edges are replaced by a uniformly random other node, and
+    source nodes are sampled uniformly.
+
+    Args:
+        num_hops (int): length of the random walks.
+    """
+    def __init__(self, num_hops: int = 2):
+        if num_hops < 1:
+            raise ValueError("`num_hops` must be at least 1.")
+        self.num_hops = num_hops
+
+    def _build_state(self, graph):
+        num_nodes = graph.num_nodes
+        edge_index = graph.edge_index.to("cpu")
+        order = torch.argsort(edge_index[0])
+        neighbors = edge_index[1][order]
+        degree = torch.bincount(edge_index[0], minlength=num_nodes)
+        offsets = torch.cumsum(degree, dim=0) - degree
+        return offsets, degree, neighbors
+
+    def sample_targets(
+        self, graph, sources, generator: torch.Generator = None
+    ):
+        offsets, degree, neighbors = self._get_state(graph)
+        sources = sources.to("cpu")
+        nodes = sources.clone()
+        is_valid = torch.ones(nodes.numel(), dtype=torch.bool)
+        for _ in range(self.num_hops):
+            node_degree = degree[nodes]
+            is_valid &= node_degree > 0
+            step = (
+                torch.rand(
+                    nodes.numel(), generator=generator, dtype=torch.double
+                ) * node_degree.double()
+            ).long()
+            position = (offsets[nodes] + step).clamp(max=neighbors.numel() - 1)
+            nodes = torch.where(is_valid, neighbors[position], nodes)
+        is_valid &= nodes != sources
+        num_invalid = int((~is_valid).sum())
+        if num_invalid > 0:
+            # uniformly random nodes other than the source
+            invalid_sources = sources[~is_valid]
+            nodes_random = torch.randint(
+                max(graph.num_nodes - 1, 1), (num_invalid,),
+                generator=generator,
+            )
+            nodes_random += (nodes_random >= invalid_sources).long()
+            nodes[~is_valid] = nodes_random.clamp(max=graph.num_nodes - 1)
+        return nodes
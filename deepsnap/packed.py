@@ -0,0 +1,668 @@
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import torch
+from deepsnap.graph import Graph
+from deepsnap.batch import Batch
+from deepsnap.hetero_graph import HeteroGraph
+from typing import (
+    Dict,
+    List,
+    Union,
+)
+
+
+class PackedGraphs(object):
+    r"""
+    Packed storage of a list of :class:`deepsnap.graph.Graph` objects, in
+    which each tensor attribute of all graphs is concatenated into one
+    contiguous tensor with an offset array :obj:`ptr[key]`, such that the
+    attribute of graph :obj:`i` is the slice
+    :obj:`ptr[key][i]:ptr[key][i + 1]`. Index attributes (e.g.
+    :obj:`edge_index`) are stored with the node indices local to each graph.
+
+    Indexing with an integer returns a tensor backed graph whose attributes
+    are views of the packed tensors. Indexing with a list or tensor of graph
+    ids returns a :class:`deepsnap.batch.Batch` of these graphs, gathered
+    with one :meth:`torch.Tensor.index_select` per attribute. Hence the
+    packed graphs can be used with a batch sampler directly, e.g.
+    :obj:`DataLoader(packed, sampler=BatchSampler(RandomSampler(packed),
+    32, drop_last=False), batch_size=None)`.
+
+    The NetworkX graphs are not kept. Non-tensor attributes shared by all
+    graphs (e.g. :obj:`task`) are stored once.
+
+    Args:
+        graphs (list): List of :class:`deepsnap.graph.Graph` objects.
+    """
+    def __init__(self, graphs: List[Graph]):
+        if len(graphs) == 0:
+            raise ValueError("PackedGraphs requires at least one graph.")
+        if any(isinstance(graph, HeteroGraph) for graph in graphs):
+            raise ValueError("PackedGraphs does not support HeteroGraph.")
+        self.num_graphs = len(graphs)
+        self.data = {}
+        self.ptr = {}
+        self.inc = {}
+        # non-tensor attributes, a single value if shared by all graphs
+        self.values = {}
+        self._stacked_keys = set()
+        self.metadata = None
+        self.num_nodes = [graph.num_nodes for graph in graphs]
+        self._num_nodes = torch.tensor(self.num_nodes, dtype=torch.long)
+        self.num_edges = [graph.num_edges for graph in graphs]
+        self.directed = [graph.is_directed() for graph in graphs]
+        # number of positive edges in edge_label_index if negative edges
+        # were appended to it
+        self.num_positive_examples = [
+            graph._num_positive_examples for graph in graphs
+        ]
+
+        keys = dict.fromkeys(key for graph in graphs for key in graph.keys)
+        keys.pop("G", None)
+        for key in keys:
+            items = [graph[key] for graph in graphs]
+            if any(item is None for item in items):
+                raise ValueError(
+                    f"Attribute {key} is not present in all graphs."
+                )
+            if torch.is_tensor(items[0]):
+                self._pack_key(key, items, graphs)
+            elif all(item == items[0] for item in items[1:]):
+                self.values[key] = items[0]
+            else:
+                self.values[key] = items
+
+    def _pack_key(self, key: str, items: List[torch.Tensor], graphs):
+        r"""
+        Concatenates the tensors of one attribute of all graphs.
+        """
+        item = items[0]
+        if (
+            Graph._is_graph_attribute(key)
+            and item.ndim == 1
+            and (not item.dtype == torch.long)
+            and "feature" in key
+        ):
+            # 1D graph features are stacked when batching, one row per graph
+            self._stacked_keys.add(key)
+            self.data[key] = torch.stack(items, dim=0)
+            self.ptr[key] = torch.arange(len(items) + 1)
+            self.inc[key] = None
+            return
+
+        cat_dim = graphs[0].__cat_dim__(key, item)
+        sizes = torch.tensor(
+            [curr_item.size(cat_dim) for curr_item in items], dtype=torch.long
+        )
+        self.data[key] = torch.cat(items, dim=cat_dim)
+        self.ptr[key] = torch.cat(
+            [torch.zeros(1, dtype=torch.long), torch.cumsum(sizes, dim=0)]
+        )
+        incs = [
+            graph.__inc__(key, curr_item)
+            for curr_item, graph in zip(items, graphs)
+        ]
+        if item.dtype == torch.bool or not any(incs):
+            self.inc[key] = None
+        else:
+            self.inc[key] = torch.tensor(incs, dtype=torch.long)
+
+    @property
+    def keys(self) -> List[str]:
+        r"""
+        Returns:
+            list: Names of the packed attributes.
+        """
+        return list(self.data) + list(self.values)
+
+    def __len__(self) -> int:
+        return self.num_graphs
+
+    def __getitem__(
+        self, idx: Union[int, List[int], torch.Tensor]
+    ) -> Union[Graph, Batch]:
+        r"""
+        Returns the graph :obj:`idx` as views of the packed tensors, or a
+        :class:`deepsnap.batch.Batch` if :obj:`idx` is a list or tensor of
+        graph ids.
+        """
+        if torch.is_tensor(idx) and idx.ndim == 0:
+            idx = int(idx)
+        if isinstance(idx, (list, tuple)) or torch.is_tensor(idx):
+            return self.collate(idx)
+        return self.get_graph(int(idx))
+
+    def get_graph(self, idx: int) -> Graph:
+        r"""
+        Returns the graph :obj:`idx`, whose tensor attributes are views of
+        the packed tensors.
+
+        Args:
+            idx (int): Index of the graph.
+
+        Returns:
+            :class:`deepsnap.graph.Graph`: A tensor backed graph.
+        """
+        if idx < 0:
+            idx += self.num_graphs
+        if not 0 <= idx < self.num_graphs:
+            raise IndexError(f"Graph index {idx} is out of range.")
+        graph = self._new_graph(idx)
+        for key, data in self.data.items():
+            if key in self._stacked_keys:
+                graph[key] = data[idx]
+                continue
+            start, end = self.ptr[key][idx:idx + 2].tolist()
+            graph[key] = data.narrow(
+                graph.__cat_dim__(key, data), start, end - start
+            )
+        for key, value in self.values.items():
+            graph[key] = value[idx] if isinstance(value, list) else value
+        return graph
+
+    def _new_graph(self, idx: int) -> Graph:
+        r"""
+        Creates the tensor backed graph :obj:`idx` without attributes.
+        """
+        graph = Graph._empty_tensor_graph(
+            self.num_nodes[idx], self.directed[idx]
+        )
+        graph._num_positive_examples = self.num_positive_examples[idx]
+        return graph
+
+    def to_graphs(self) -> List[Graph]:
+        r"""
+        Returns all graphs, equal to :meth:`get_graph` of each graph but
+        splitting each packed tensor into views at once.
+
+        Returns:
+            list: List of tensor backed :class:`deepsnap.graph.Graph` objects.
+        """
+        graphs = [self._new_graph(idx) for idx in range(self.num_graphs)]
+        for key, data in self.data.items():
+            if key in self._stacked_keys:
+                views = data.unbind(0)
+            else:
+                ptr = self.ptr[key]
+                views = torch.split(
+                    data, (ptr[1:] - ptr[:-1]).tolist(),
+                    dim=graphs[0].__cat_dim__(key, data),
+                )
+            for graph, view in zip(graphs, views):
+                graph[key] = view
+        for key, value in self.values.items():
+            for idx, graph in enumerate(graphs):
+                graph[key] = value[idx] if isinstance(value, list) else value
+        return graphs
+
+    def collate(self, ids: Union[List[int], torch.Tensor]) -> Batch:
+        r"""
+        Collates the graphs :obj:`ids` into a :class:`deepsnap.batch.Batch`,
+        equal to :meth:`deepsnap.batch.Batch.from_data_list` of these graphs.
+        The slices of each attribute are gathered with a single index
+        selection and the node offsets are added in one vectorized addition.
+
+        Args:
+            ids (list or :class:`torch.LongTensor`): Ids of the graphs.
+
+        Returns:
+            :class:`deepsnap.batch.Batch`: The batch of the graphs.
+        """
+        ids = torch.as_tensor(ids, dtype=torch.long).view(-1)
+        if ids.numel() == 0:
+            raise ValueError("Cannot collate an empty list of graphs.")
+        batch = Batch()
+        batch.__data_class__ = Graph
+        batch.__slices__ = {}
+        batch.__cumsum__ = {}
+        graph = Graph()
+        for key, data in self.data.items():
+            ptr = self.ptr[key]
+            starts = ptr[ids]
+            sizes = ptr[ids + 1] - starts
+            batch_ptr = torch.cat(
+                [torch.zeros(1, dtype=torch.long), torch.cumsum(sizes, dim=0)]
+            )
+            if key in self._stacked_keys:
+                batch[key] = data[ids]
+                batch.__slices__[key] = batch_ptr.tolist()
+                batch.__cumsum__[key] = None
+                continue
+
+            # position of each gathered element in the packed tensor
+            index = torch.arange(int(batch_ptr[-1])) + (
+                starts - batch_ptr[:-1]
+            ).repeat_interleave(sizes)
+            cat_dim = graph.__cat_dim__(key, data)
+            collated = data.index_select(cat_dim, index.to(data.device))
+            offsets = None
+            if self.inc[key] is not None:
+                incs = self.inc[key][ids]
+                offsets = torch.cumsum(incs, dim=0) - incs
+                collated = collated + Batch._expand_offsets(
+                    offsets, sizes, cat_dim, collated
+                )
+            batch[key] = collated
+            batch.__slices__[key] = batch_ptr.tolist()
+            batch.__cumsum__[key] = offsets
+
+        ids_list = ids.tolist()
+        for key, value in self.values.items():
+            if isinstance(value, list):
+                batch[key] = [value[idx] for idx in ids_list]
+            else:
+                batch[key] = [value] * len(ids_list)
+            batch.__slices__[key] = list(range(len(ids_list) + 1))
+            batch.__cumsum__[key] = None
+
+        num_nodes = self._num_nodes[ids]
+        batch.batch = torch.arange(len(ids_list)).repeat_interleave(num_nodes)
+        batch.ptr = torch.cat(
+            [torch.zeros(1, dtype=torch.long), torch.cumsum(num_nodes, dim=0)]
+        )
+        if "edge_index" in batch.__slices__:
+            batch.edge_index_ptr = torch.tensor(
+                batch.__slices__["edge_index"], dtype=torch.long
+            )
+        return batch
+
+    def save(self, path: str, metadata: Dict = None):
+        r"""
+        Saves the packed graphs to the directory :obj:`path`. Each packed
+        tensor and its offsets are written as separate numpy files, which
+        can be memory mapped by :meth:`load`, next to a small
+        :obj:`manifest.json` that describes them. The files of a previous
+        save are replaced, also while they are memory mapped.
+
+        Args:
+            path (str): The directory, created if it does not exist.
+            metadata (dict, optional): JSON serializable information stored
+                in the manifest, available as :obj:`metadata` after loading.
+        """
+        tensors = {}
+        for key, data in self.data.items():
+            if data.dtype == torch.bfloat16:
+                raise ValueError(
+                    f"Attribute {key} of dtype bfloat16 can not be saved."
+                )
+            tensors[key] = {
+                "dtype": str(data.dtype),
+                "shape": list(data.shape),
+                "inc": self.inc[key] is not None,
+                "stacked": key in self._stacked_keys,
+            }
+        manifest = {
+            "format_version": 1,
+            "num_graphs": self.num_graphs,
+            "tensors": tensors,
+            "values": self.values,
+            "metadata": metadata,
+        }
+        # checked before any file is written
+        try:
+            manifest = json.dumps(manifest, indent=2)
+        except TypeError:
+            raise ValueError(
+                "Non-tensor attributes and metadata need to be JSON "
+                "serializable to be saved."
+            )
+
+        os.makedirs(path, exist_ok=True)
+        # the files are written to a temporary directory and moved into
+        # place, which replaces files of a previous save instead of
+        # truncating them, e.g. while they are memory mapped by load
+        tmp_path = os.path.join(path, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_path)
+        try:
+            arrays = {}
+            for key, data in self.data.items():
+                arrays[f"{key}.npy"] = data.detach().cpu().numpy()
+                arrays[f"{key}.ptr.npy"] = self.ptr[key].numpy()
+                if self.inc[key] is not None:
+                    arrays[f"{key}.inc.npy"] = self.inc[key].numpy()
+            arrays["_num_nodes.npy"] = np.array(self.num_nodes)
+            arrays["_num_edges.npy"] = np.array(self.num_edges)
+            arrays["_directed.npy"] = np.array(self.directed)
+            arrays["_num_positive_examples.npy"] = np.array([
+                -1 if num is None else num
+                for num in self.num_positive_examples
+            ])
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_path, name), array)
+            with open(os.path.join(tmp_path, "manifest.json"), "w") as f:
+                f.write(manifest)
+
+            # a previously saved manifest is removed first and the manifest
+            # is moved last, such that incomplete directories are not loaded
+            manifest_path = os.path.join(path, "manifest.json")
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            for name in list(arrays) + ["manifest.json"]:
+                os.replace(
+                    os.path.join(tmp_path, name), os.path.join(path, name)
+                )
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        r"""
+        Loads packed graphs saved by :meth:`save`.
+
+        Args:
+            path (str): The directory of the saved graphs.
+            mmap (bool): If set to :obj:`True`, the tensors are memory mapped
+                (copy on write) instead of read into memory. Loading is then
+                independent of the size of the data, and processes loading
+                the same files share the pages of the operating system
+                cache.
+
+        Returns:
+            :class:`deepsnap.packed.PackedGraphs`: The loaded graphs.
+        """
+        manifest_path = os.path.join(path, "manifest.json")
+        if not os.path.isfile(manifest_path):
+            raise ValueError(f"{path} does not contain saved graphs.")
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest["format_version"] != 1:
+            raise ValueError(
+                f"Unsupported format version {manifest['format_version']}."
+            )
+
+        def load_array(name):
+            return torch.from_numpy(
+                np.load(
+                    os.path.join(path, f"{name}.npy"),
+                    mmap_mode="c" if mmap else None,
+                )
+            )
+
+        packed = cls.__new__(cls)
+        packed.num_graphs = manifest["num_graphs"]
+        packed.data = {}
+        packed.ptr = {}
+        packed.inc = {}
+        packed.values = manifest["values"]
+        packed._stacked_keys = set()
+        packed.metadata = manifest["metadata"]
+        for key, info in manifest["tensors"].items():
+            packed.data[key] = load_array(key)
+            packed.ptr[key] = load_array(f"{key}.ptr")
+            packed.inc[key] = load_array(f"{key}.inc") if info["inc"] else None
+            if info["stacked"]:
+                packed._stacked_keys.add(key)
+        packed._num_nodes = load_array("_num_nodes").long()
+        packed.num_nodes = packed._num_nodes.tolist()
+        packed.num_edges = load_array("_num_edges").tolist()
+        packed.directed = load_array("_directed").tolist()
+        packed.num_positive_examples = [
+            None if num < 0 else num
+            for num in load_array("_num_positive_examples").tolist()
+        ]
+        return packed
+
+    @classmethod
+    def from_pyg(cls, dataset) -> "PackedGraphs":
+        r"""
+        Packs the graphs of a PyTorch Geometric dataset directly from its
+        tensors, equal to converting each graph by
+        :meth:`deepsnap.graph.Graph.pyg_to_graph` with
+        :obj:`backend="tensor"`. The collated storage of an
+        :class:`torch_geometric.data.InMemoryDataset` is used as it is,
+        other datasets are concatenated first. The undirected edges of all
+        graphs are deduplicated at once.
+
+        Whether :obj:`y` holds node, edge or graph labels is decided for
+        the whole dataset: node (edge) labels if it matches the number of
+        nodes (edges) of every graph, graph labels otherwise.
+
+        Args:
+            dataset: A PyTorch Geometric dataset or a list of
+                :class:`torch_geometric.data.Data` objects.
+
+        Returns:
+            :class:`deepsnap.packed.PackedGraphs`: The packed graphs.
+        """
+        return cls._from_pyg_storage(*cls._pyg_storage(dataset))
+
+    @classmethod
+    def _from_pyg_storage(cls, storage, ptr, values, num_graphs):
+        r"""
+        Packs PyG graphs given by their concatenated tensors, see
+        :meth:`_pyg_storage`.
+        """
+        if num_graphs == 0:
+            raise ValueError("PackedGraphs requires at least one graph.")
+        if "edge_index" not in storage:
+            raise ValueError("The PyG graphs do not have an edge_index.")
+
+        def sizes(key):
+            return ptr[key][1:] - ptr[key][:-1]
+
+        # rename the PyG attributes as Graph.pyg_to_graph
+        renamed = {"x": "node_feature", "edge_attr": "edge_feature"}
+        if "y" in storage:
+            y_sizes = sizes("y")
+            if "x" in storage and torch.equal(y_sizes, sizes("x")):
+                renamed["y"] = "node_label"
+            elif "edge_attr" in storage and torch.equal(
+                y_sizes, sizes("edge_attr")
+            ):
+                renamed["y"] = "edge_label"
+            else:
+                renamed["y"] = "graph_label"
+        keys = {
+            renamed.get(key, key): key
+            for key in storage
+            if key != "edge_index" and (
+                Graph._is_node_attribute(renamed.get(key, key))
+                or Graph._is_edge_attribute(renamed.get(key, key))
+                or Graph._is_graph_attribute(renamed.get(key, key))
+            )
+        }
+
+        # number of nodes as inferred by Graph.from_tensors
+        edge_index = storage["edge_index"]
+        edge_sizes = sizes("edge_index")
+        if torch.any(edge_sizes == 0):
+            raise ValueError(
+                "in from_tensors, number of edges must be larger than 0"
+            )
+        graph_of_edge = torch.arange(num_graphs).repeat_interleave(
+            edge_sizes
+        )
+        node_key = next(
+            (key for key in keys if Graph._is_node_attribute(key)), None
+        )
+        if node_key is not None:
+            num_nodes = sizes(keys[node_key])
+        elif isinstance(values.get("num_nodes"), list):
+            num_nodes = torch.tensor(values["num_nodes"], dtype=torch.long)
+        else:
+            num_nodes = torch.from_numpy(
+                np.maximum.reduceat(
+                    edge_index.max(dim=0)[0].numpy(),
+                    (ptr["edge_index"][:-1]).numpy(),
+                )
+            ).long() + 1
+        node_ptr = torch.cat(
+            [torch.zeros(1, dtype=torch.long), torch.cumsum(num_nodes, 0)]
+        )
+
+        # keep the first occurrence of each undirected edge of each graph
+        total_nodes = int(node_ptr[-1])
+        row, col = edge_index + node_ptr[:-1][graph_of_edge]
+        edge_key = torch.min(row, col) * total_nodes + torch.max(row, col)
+        _, first = np.unique(edge_key.numpy(), return_index=True)
+        first = torch.from_numpy(np.sort(first))
+        kept_graph = graph_of_edge[first]
+        num_edges = torch.bincount(kept_graph, minlength=num_graphs)
+        kept_ptr = torch.cat(
+            [torch.zeros(1, dtype=torch.long), torch.cumsum(num_edges, 0)]
+        )
+        # the kept edges of each graph are followed by their reverses
+        position = kept_ptr[kept_graph] + torch.arange(first.numel())
+        reverse_position = position + num_edges[kept_graph]
+
+        def undirected(item, dim):
+            item = item.index_select(dim, first)
+            out = item.new_empty(
+                item.shape[:dim] + (2 * first.numel(),) + item.shape[dim + 1:]
+            )
+            out.index_copy_(dim, position, item)
+            out.index_copy_(
+                dim, reverse_position,
+                item.flip(0) if dim == 1 else item,
+            )
+            return out
+
+        packed = cls.__new__(cls)
+        packed.num_graphs = num_graphs
+        packed.data = {}
+        packed.ptr = {}
+        packed.inc = {}
+        packed.values = {}
+        packed._stacked_keys = set()
+        packed.metadata = None
+        packed._num_nodes = num_nodes
+        packed.num_nodes = num_nodes.tolist()
+        packed.num_edges = num_edges.tolist()
+        packed.directed = [False] * num_graphs
+        packed.num_positive_examples = [None] * num_graphs
+
+        for key, pyg_key in keys.items():
+            if Graph._is_edge_attribute(key):
+                packed.data[key] = undirected(storage[pyg_key], 0)
+                packed.ptr[key] = 2 * kept_ptr
+            else:
+                packed.data[key] = storage[pyg_key]
+                packed.ptr[key] = ptr[pyg_key]
+            packed.inc[key] = None
+        packed.data["edge_index"] = undirected(edge_index, 1)
+        packed.ptr["edge_index"] = 2 * kept_ptr
+        packed.inc["edge_index"] = num_nodes
+        # the objectives of Graph.from_tensors, edge_label_index shares
+        # the tensor of edge_index
+        packed.data["edge_label_index"] = packed.data["edge_index"]
+        packed.ptr["edge_label_index"] = packed.ptr["edge_index"]
+        packed.inc["edge_label_index"] = num_nodes
+        packed.data["node_label_index"] = (
+            torch.arange(total_nodes)
+            - node_ptr[:-1].repeat_interleave(num_nodes)
+        )
+        packed.ptr["node_label_index"] = node_ptr
+        packed.inc["node_label_index"] = num_nodes
+        for key, value in values.items():
+            key = renamed.get(key, key)
+            if (
+                Graph._is_node_attribute(key)
+                or Graph._is_edge_attribute(key)
+                or Graph._is_graph_attribute(key)
+            ):
+                packed.values[key] = value
+        return packed
+
+    @staticmethod
+    def _pyg_storage(dataset):
+        r"""
+        Returns the concatenated tensors of the PyG graphs, their offsets
+        along the concatenation dimension, the other attributes and the
+        number of graphs.
+        """
+        if PackedGraphs._has_pyg_storage(dataset):
+            # collated storage of an InMemoryDataset
+            data = (
+                dataset._data if hasattr(dataset, "_data") else dataset.data
+            )
+            storage, ptr, values = {}, {}, {}
+            for key, slice_ptr in dataset.slices.items():
+                if torch.is_tensor(data[key]):
+                    storage[key] = data[key]
+                    ptr[key] = slice_ptr.long()
+                else:
+                    values[key] = data[key]
+            return storage, ptr, values, len(dataset)
+
+        items = [dataset[i] for i in range(len(dataset))]
+        return PackedGraphs._concat_pyg(items)
+
+    @staticmethod
+    def _has_pyg_storage(dataset) -> bool:
+        r"""
+        Whether the graphs of a PyG dataset are the slices of its collated
+        storage, i.e. no transform is applied when indexing the dataset.
+        """
+        return (
+            getattr(dataset, "slices", None) is not None
+            and getattr(dataset, "transform", None) is None
+            and getattr(dataset, "_indices", None) is None
+        )
+
+    @staticmethod
+    def _concat_pyg(items):
+        r"""
+        Concatenates the attributes of a list of PyG graphs, see
+        :meth:`_pyg_storage`.
+        """
+        keys = {}
+        for item in items:
+            item_keys = item.keys() if callable(item.keys) else item.keys
+            keys.update(dict.fromkeys(item_keys))
+        storage, ptr, values = {}, {}, {}
+        for key in keys:
+            attrs = [item[key] for item in items]
+            if any(attr is None for attr in attrs):
+                raise ValueError(
+                    f"Attribute {key} is not present in all graphs."
+                )
+            if not torch.is_tensor(attrs[0]):
+                values[key] = attrs
+                continue
+            attrs = [
+                attr.view(1) if attr.ndim == 0 else attr for attr in attrs
+            ]
+            cat_dim = -1 if "index" in key else 0
+            storage[key] = torch.cat(attrs, dim=cat_dim)
+            ptr[key] = torch.cat(
+                [
+                    torch.zeros(1, dtype=torch.long),
+                    torch.cumsum(
+                        torch.tensor([attr.size(cat_dim) for attr in attrs]),
+                        dim=0,
+                    ),
+                ]
+            )
+        return storage, ptr, values, len(items)
+
+    @staticmethod
+    def _merge_pyg(storages):
+        r"""
+        Merges the concatenated attributes of consecutive lists of PyG
+        graphs, see :meth:`_concat_pyg`.
+        """
+        storage, ptr, values = {}, {}, {}
+        for key in storages[0][0]:
+            storage[key] = torch.cat(
+                [chunk[0][key] for chunk in storages],
+                dim=-1 if "index" in key else 0,
+            )
+            ptrs = [chunk[1][key] for chunk in storages]
+            offsets = torch.cumsum(
+                torch.tensor([0] + [int(chunk_ptr[-1]) for chunk_ptr in ptrs]),
+                dim=0,
+            )
+            ptr[key] = torch.cat(
+                [ptrs[0][:1]] + [
+                    chunk_ptr[1:] + offset
+                    for chunk_ptr, offset in zip(ptrs, offsets[:-1])
+                ]
+            )
+        for key in storages[0][2]:
+            values[key] = [
+                value for chunk in storages for value in chunk[2][key]
+            ]
+        return storage, ptr, values, sum(chunk[3] for chunk in storages)
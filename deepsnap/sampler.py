@@ -0,0 +1,473 @@
+import math
+import numpy as np
+import torch
+from torch.utils.data import Sampler
+from deepsnap.batch import Batch
+from deepsnap.feature_store import FeatureStore
+from deepsnap.graph import Graph
+from deepsnap.hetero_graph import HeteroGraph
+from typing import (
+    Dict,
+    List,
+)
+
+
+class BucketBatchSampler(Sampler):
+    r"""
+    Batch sampler that groups the graphs of a
+    :class:`deepsnap.dataset.GraphDataset` into batches under a node and / or
+    edge budget instead of a fixed number of graphs. The graphs are sorted
+    by size and divided into buckets of :obj:`bucket_size` graphs, such that
+    each batch contains graphs of similar sizes. Graphs are shuffled within
+    their bucket and the batches are shuffled across the dataset.
+
+    The sampler is passed as :obj:`batch_sampler` to the
+    :class:`torch.utils.data.DataLoader`, e.g.
+    :obj:`DataLoader(dataset, batch_sampler=sampler,
+    collate_fn=Batch.collate())`.
+
+    Args:
+        dataset (:class:`deepsnap.dataset.GraphDataset`): The dataset, whose
+            cached :obj:`num_nodes` and :obj:`num_edges` are used as the
+            sizes of the graphs.
+        max_num_nodes (int, optional): Maximum total number of nodes of a
+            batch.
+        max_num_edges (int, optional): Maximum total number of edges of a
+            batch.
+        max_num_graphs (int, optional): Maximum number of graphs of a batch.
+        bucket_size (int): Number of graphs of similar sizes that are
+            shuffled together. Larger buckets give more random batches
+            with more varied graph sizes.
+        shuffle (bool): Whether to shuffle the graphs within their buckets
+            and the order of the batches.
+        drop_last (bool): Whether to drop the last batch of each bucket if
+            it is filled less than half of the budget.
+        generator (:class:`torch.Generator`, optional): Random number
+            generator used for shuffling.
+
+    A graph that exceeds the budget on its own forms a batch of its own.
+    """
+    def __init__(
+        self,
+        dataset,
+        max_num_nodes: int = None,
+        max_num_edges: int = None,
+        max_num_graphs: int = None,
+        bucket_size: int = 128,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        generator: torch.Generator = None,
+    ):
+        if (
+            max_num_nodes is None
+            and max_num_edges is None
+            and max_num_graphs is None
+        ):
+            raise ValueError(
+                "At least one of max_num_nodes, max_num_edges and "
+                "max_num_graphs needs to be specified."
+            )
+        if bucket_size < 1:
+            raise ValueError("bucket_size should be a positive integer.")
+        num_nodes = dataset.num_nodes
+        num_edges = dataset.num_edges
+        if not isinstance(num_nodes, list) or not isinstance(num_edges, list):
+            raise ValueError(
+                "BucketBatchSampler requires the graph sizes of the dataset, "
+                "which are not known for on the fly generated graphs."
+            )
+        self.num_nodes = torch.tensor(num_nodes, dtype=torch.long)
+        self.num_edges = torch.tensor(num_edges, dtype=torch.long)
+        self.max_num_nodes = max_num_nodes
+        self.max_num_edges = max_num_edges
+        self.max_num_graphs = max_num_graphs
+        self.bucket_size = bucket_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.generator = generator
+        # sort by the number of nodes, ties are broken by the number of edges
+        self._sorted = torch.from_numpy(
+            np.lexsort((np.array(num_edges), np.array(num_nodes)))
+        ).long()
+        # batches of the next epoch, computed early by __len__
+        self._batches = None
+        self._last_batches = None
+
+    def __iter__(self):
+        batches = self._batches
+        if batches is None:
+            batches = self._create_batches()
+        self._batches = None
+        self._last_batches = batches
+        return iter(batches)
+
+    def __len__(self) -> int:
+        # the number of batches depends on the shuffling of the next epoch
+        if self._batches is None:
+            self._batches = self._create_batches()
+        return len(self._batches)
+
+    def _create_batches(self) -> List[List[int]]:
+        r"""
+        Shuffles the graphs within their buckets and packs them into
+        batches.
+        """
+        buckets = torch.split(self._sorted, self.bucket_size)
+        batches = []
+        for bucket in buckets:
+            if self.shuffle:
+                bucket = bucket[
+                    torch.randperm(len(bucket), generator=self.generator)
+                ]
+            batches.extend(self._pack(bucket.tolist()))
+        if self.shuffle:
+            perm = torch.randperm(len(batches), generator=self.generator)
+            batches = [batches[i] for i in perm.tolist()]
+        return batches
+
+    def _pack(self, indices: List[int]) -> List[List[int]]:
+        r"""
+        Greedily packs the graphs in order into batches under the budget.
+        """
+        num_nodes = self.num_nodes[indices].tolist()
+        num_edges = self.num_edges[indices].tolist()
+        max_num_nodes = self.max_num_nodes or math.inf
+        max_num_edges = self.max_num_edges or math.inf
+        max_num_graphs = self.max_num_graphs or math.inf
+        batches = []
+        batch = []
+        batch_nodes = 0
+        batch_edges = 0
+        for idx, nodes, edges in zip(indices, num_nodes, num_edges):
+            if batch and (
+                batch_nodes + nodes > max_num_nodes
+                or batch_edges + edges > max_num_edges
+                or len(batch) + 1 > max_num_graphs
+            ):
+                batches.append(batch)
+                batch = []
+                batch_nodes = 0
+                batch_edges = 0
+            batch.append(idx)
+            batch_nodes += nodes
+            batch_edges += edges
+        if batch and not (
+            self.drop_last
+            and batch_nodes < max_num_nodes / 2
+            and batch_edges < max_num_edges / 2
+            and len(batch) < max_num_graphs / 2
+        ):
+            batches.append(batch)
+        return batches
+
+    def stats(self) -> Dict[str, float]:
+        r"""
+        Statistics of the batches of the last epoch (or of the next epoch if
+        no batches have been sampled yet).
+
+        Returns:
+            dict: With the following keys:
+            :obj:`"num_batches"`; :obj:`"mean_num_graphs"` the average number
+            of graphs per batch; :obj:`"node_utilization"` and
+            :obj:`"edge_utilization"` the average fraction of the node and
+            edge budgets used by a batch (:obj:`None` without a budget);
+            :obj:`"padding"` the fraction of padding if the graphs of each
+            batch were padded to the number of nodes of its largest graph.
+        """
+        batches = self._last_batches
+        if batches is None:
+            batches = self._batches
+        if batches is None:
+            batches = self._batches = self._create_batches()
+        num_nodes = self.num_nodes.tolist()
+        num_edges = self.num_edges.tolist()
+        batch_nodes = []
+        batch_edges = []
+        padded = 0
+        for batch in batches:
+            nodes = [num_nodes[idx] for idx in batch]
+            batch_nodes.append(sum(nodes))
+            batch_edges.append(sum(num_edges[idx] for idx in batch))
+            padded += max(nodes) * len(batch)
+
+        stats = {
+            "num_batches": len(batches),
+            "mean_num_graphs": (
+                sum(len(batch) for batch in batches) / len(batches)
+            ),
+            "node_utilization": None,
+            "edge_utilization": None,
+            "padding": 1 - sum(batch_nodes) / padded if padded > 0 else 0.,
+        }
+        if self.max_num_nodes is not None:
+            stats["node_utilization"] = (
+                sum(batch_nodes) / len(batches) / self.max_num_nodes
+            )
+        if self.max_num_edges is not None:
+            stats["edge_utilization"] = (
+                sum(batch_edges) / len(batches) / self.max_num_edges
+            )
+        return stats
+
+
+class NeighborSampler(object):
+    r"""
+    GraphSAGE style neighbor sampler of mini-batches for transductive node
+    tasks on a large graph. Given a batch of seed nodes, e.g. from
+    :obj:`node_label_index` of a split graph, it samples at most
+    :obj:`num_neighbors[i]` incoming neighbors of each node reached at hop
+    :obj:`i`, and returns the sampled subgraph with local node ids as a
+    :class:`deepsnap.batch.Batch`. The seed nodes are the first nodes of
+    the subgraph, hence the loss is computed on
+    :obj:`batch.node_label_index`, the local ids of the seeds. The global
+    ids of the nodes and edges of the subgraph are stored in
+    :obj:`batch.node_id` and :obj:`batch.edge_id`.
+
+    The sampler is passed as :obj:`collate_fn` to a
+    :class:`torch.utils.data.DataLoader` over the seed nodes, such that the
+    subgraphs are sampled in its worker processes, e.g.
+    :obj:`DataLoader(graph.node_label_index, batch_size=512, shuffle=True,
+    num_workers=4, collate_fn=NeighborSampler(graph, [10, 5]))`.
+    By default the neighbors are drawn from the global random number
+    generator, which the data loader seeds differently in each worker. A
+    :obj:`generator` makes the batches sampled in the main process
+    reproducible, while each worker process would draw the same numbers
+    from its copy of the generator.
+
+    The incoming edges of each node are stored in compressed sparse column
+    format once, when the sampler is created. The edges of the subgraph are
+    the sampled edges from the neighbors to the nodes they were sampled
+    for, the subgraph is therefore directed. Node attributes of the graph
+    are sliced to the nodes of the subgraph; features in a
+    :class:`deepsnap.feature_store.FeatureStore` are only read for these
+    nodes. Edge attributes that are aligned with :obj:`edge_index` are
+    sliced to the sampled edges.
+
+    Args:
+        graph (:class:`deepsnap.graph.Graph`): The graph that is sampled.
+            Graphs of a transductive split of a graph share its edges, such
+            that one sampler can be used for all of them.
+        num_neighbors (list): Maximum number of neighbors sampled for each
+            node at each hop, -1 for all neighbors. Its length is the number
+            of hops, usually the number of message passing layers.
+        replace (bool): Whether to sample the neighbors with replacement.
+        generator (:class:`torch.Generator`, optional): Random number
+            generator used for sampling.
+    """
+    def __init__(
+        self,
+        graph: Graph,
+        num_neighbors: List[int],
+        replace: bool = False,
+        generator: torch.Generator = None,
+    ):
+        if isinstance(graph, HeteroGraph):
+            raise ValueError("NeighborSampler does not support HeteroGraph.")
+        if len(num_neighbors) == 0:
+            raise ValueError("num_neighbors should not be empty.")
+        if any(num < -1 for num in num_neighbors):
+            raise ValueError(
+                "num_neighbors should contain non-negative numbers or -1."
+            )
+        self.num_neighbors = list(num_neighbors)
+        self.replace = replace
+        self.generator = generator
+        self.num_nodes = graph.num_nodes
+        edge_index = graph.edge_index.cpu()
+        num_edges = edge_index.size(1)
+
+        # incoming edges of each node, in compressed sparse column format
+        self.perm = torch.sort(edge_index[1])[1]
+        self.row = edge_index[0, self.perm]
+        self.colptr = torch.zeros(self.num_nodes + 1, dtype=torch.long)
+        torch.cumsum(
+            torch.bincount(edge_index[1], minlength=self.num_nodes),
+            dim=0, out=self.colptr[1:],
+        )
+
+        self.node_attributes = {}
+        self.edge_attributes = {}
+        self.attributes = {}
+        for key in graph.keys:
+            value = graph[key]
+            if key in ["G", "edge_index", "edge_label_index"]:
+                continue
+            if key == "node_label_index" or value is None:
+                continue
+            if isinstance(value, FeatureStore) or torch.is_tensor(value):
+                size = value.size(0) if value.ndim > 0 else None
+                if Graph._is_node_attribute(key) and size == self.num_nodes:
+                    self.node_attributes[key] = value
+                elif Graph._is_edge_attribute(key) and size == num_edges:
+                    self.edge_attributes[key] = value
+                elif Graph._is_graph_attribute(key):
+                    self.attributes[key] = value
+                # other tensors, e.g. indices of the whole graph, are
+                # not valid in the subgraph
+            else:
+                self.attributes[key] = value
+
+    def __call__(self, seeds) -> Batch:
+        r"""
+        Samples the subgraph of a batch of seed nodes, as the
+        :obj:`collate_fn` of a :class:`torch.utils.data.DataLoader`.
+
+        Args:
+            seeds: A list of node ids (or of 0-dimensional tensors).
+
+        Returns:
+            :class:`deepsnap.batch.Batch`: The batch of the sampled subgraph.
+        """
+        if isinstance(seeds, list) and len(seeds) > 0:
+            if torch.is_tensor(seeds[0]):
+                seeds = torch.stack(seeds)
+        return Batch.from_data_list([self.sample(seeds)])
+
+    def sample(self, seeds) -> Graph:
+        r"""
+        Samples the subgraph of the seed nodes.
+
+        Args:
+            seeds (:class:`torch.LongTensor`): Global ids of the seed nodes.
+
+        Returns:
+            :class:`deepsnap.graph.Graph`: The tensor backed subgraph.
+        """
+        seeds = torch.as_tensor(seeds, dtype=torch.long).view(-1).cpu()
+        # distinct seeds in the order of their first occurrence
+        unique_seeds, inverse = torch.unique(seeds, return_inverse=True)
+        seed_nodes = seeds
+        if unique_seeds.numel() != seeds.numel():
+            positions = torch.arange(seeds.numel())
+            order = torch.argsort(inverse * seeds.numel() + positions)
+            is_first = torch.ones(seeds.numel(), dtype=torch.bool)
+            is_first[1:] = inverse[order[1:]] != inverse[order[:-1]]
+            seed_nodes = seeds[torch.sort(order[is_first])[0]]
+
+        nodes = [seed_nodes]
+        visited = torch.sort(seed_nodes)[0]
+        frontier = seed_nodes
+        rows = []
+        cols = []
+        edge_ids = []
+        for num_neighbors in self.num_neighbors:
+            if frontier.numel() == 0:
+                break
+            position, col = self._sample_neighbors(frontier, num_neighbors)
+            row = self.row[position]
+            rows.append(row)
+            cols.append(col)
+            edge_ids.append(self.perm[position])
+            # nodes reached for the first time are sampled at the next hop
+            candidates = torch.unique(row)
+            frontier = candidates[~_contains(visited, candidates)]
+            nodes.append(frontier)
+            visited = torch.sort(torch.cat([visited, frontier]))[0]
+
+        node_id = torch.cat(nodes)
+        node_sorted, node_order = torch.sort(node_id)
+
+        def local(index):
+            position = np.searchsorted(node_sorted.numpy(), index.numpy())
+            return node_order[torch.from_numpy(position)]
+
+        edge_index = torch.stack([
+            local(torch.cat(rows)) if rows else node_id.new_empty(0),
+            local(torch.cat(cols)) if cols else node_id.new_empty(0),
+        ])
+        edge_id = torch.cat(edge_ids) if edge_ids else node_id.new_empty(0)
+
+        graph = Graph._empty_tensor_graph(node_id.numel(), directed=True)
+        for key, value in self.attributes.items():
+            graph[key] = value
+        for key, value in self.node_attributes.items():
+            if isinstance(value, FeatureStore):
+                graph[key] = value.select(node_id)
+            else:
+                graph[key] = value[node_id.to(value.device)]
+        for key, value in self.edge_attributes.items():
+            graph[key] = value[edge_id.to(value.device)]
+        graph.edge_index = edge_index
+        graph.edge_label_index = edge_index
+        graph.node_label_index = local(seeds)
+        graph.node_id = node_id
+        graph.edge_id = edge_id
+        return graph
+
+    def _sample_neighbors(self, nodes: torch.Tensor, num_neighbors: int):
+        r"""
+        Samples incoming edges of each node.
+
+        Returns:
+            (:class:`torch.LongTensor`, :class:`torch.LongTensor`): The
+            positions of the sampled edges in the compressed sparse column
+            format and the nodes they were sampled for.
+        """
+        start = self.colptr[nodes]
+        degree = self.colptr[nodes + 1] - start
+        if num_neighbors == -1:
+            return _expand(nodes, start, degree)
+        if self.replace:
+            has_neighbors = degree > 0
+            nodes = nodes[has_neighbors]
+            start = start[has_neighbors]
+            degree = degree[has_neighbors]
+            offset = (
+                torch.rand(
+                    nodes.numel(), num_neighbors, generator=self.generator
+                )
+                * degree.view(-1, 1)
+            ).long()
+            position = start.view(-1, 1) + offset
+            return (
+                position.view(-1),
+                nodes.repeat_interleave(num_neighbors),
+            )
+
+        # all neighbors of the nodes with at most num_neighbors neighbors
+        small = degree <= num_neighbors
+        position, col = _expand(nodes[small], start[small], degree[small])
+        large = ~small
+        if not large.any():
+            return position, col
+        # Floyd's algorithm, which samples num_neighbors distinct neighbors
+        # in num_neighbors steps for all the other nodes at once
+        start = start[large]
+        degree = degree[large]
+        offset = torch.full(
+            (degree.numel(), num_neighbors), -1, dtype=torch.long
+        )
+        for i in range(num_neighbors):
+            upper = degree - num_neighbors + i
+            draw = (
+                torch.rand(degree.numel(), generator=self.generator)
+                * (upper + 1)
+            ).long()
+            drawn = (offset[:, :i] == draw.view(-1, 1)).any(dim=1)
+            offset[:, i] = torch.where(drawn, upper, draw)
+        position = torch.cat([position, (start.view(-1, 1) + offset).view(-1)])
+        col = torch.cat([col, nodes[large].repeat_interleave(num_neighbors)])
+        return position, col
+
+
+def _expand(nodes, start, count):
+    r"""
+    Returns the positions :obj:`start[i], ..., start[i] + count[i] - 1` of
+    all nodes and the node of each position.
+    """
+    segment = torch.repeat_interleave(torch.arange(nodes.numel()), count)
+    offset = torch.arange(segment.numel()) - (
+        torch.cumsum(count, dim=0) - count
+    )[segment]
+    return start[segment] + offset, nodes[segment]
+
+
+def _contains(sorted_values, values):
+    r"""
+    Returns whether each of :obj:`values` is in :obj:`sorted_values`.
+    """
+    if sorted_values.numel() == 0:
+        return torch.zeros(values.numel(), dtype=torch.bool)
+    position = np.searchsorted(sorted_values.numpy(), values.numpy())
+    position[position == sorted_values.numel()] = 0
+    return sorted_values[torch.from_numpy(position)] == values
@@ -0,0 +1,120 @@
+import time
+import argparse
+import torch
+import networkx as nx
+from deepsnap.graph import Graph
+
+
+def arg_parse():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of node and edge attribute extraction.'
+    )
+
+    parser.add_argument('--num_nodes', type=int,
+                        help='Number of nodes.')
+    parser.add_argument('--num_edges', type=int,
+                        help='Number of edges.')
+    parser.add_argument('--feature_dim', type=int,
+                        help='Node and edge feature dimension.')
+    parser.add_argument('--repeat', type=int,
+                        help='Number of repetitions for each method.')
+
+    parser.set_defaults(
+        num_nodes=200000,
+        num_edges=1000000,
+        feature_dim=128,
+        repeat=3,
+    )
+    return parser.parse_args()
+
+
+def stack_loop(attributes):
+    # the per element extraction used before the bulk extraction
+    if torch.is_tensor(attributes[0]):
+        return torch.stack(attributes, dim=0)
+    elif isinstance(attributes[0], float):
+        return torch.tensor(attributes, dtype=torch.float)
+    elif isinstance(attributes[0], int):
+        return torch.tensor(attributes, dtype=torch.long)
+
+
+def node_attributes_loop(G, name):
+    attributes = []
+    for _, d in G.nodes.items():
+        if name in d:
+            attributes.append(d[name])
+    return stack_loop(attributes)
+
+
+def edge_attributes_loop(G, name):
+    attributes = []
+    for x in G.edges(data=True):
+        if name in x[-1]:
+            attributes.append(x[-1][name])
+    return stack_loop(attributes)
+
+
+def timeit(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        best = min(best, time.time() - start)
+    return best
+
+
+def main():
+    args = arg_parse()
+    edge_index = torch.randint(args.num_nodes, (2, args.num_edges))
+    node_feature = torch.randn(args.num_nodes, args.feature_dim)
+    node_label = torch.randint(10, (args.num_nodes,))
+    edge_feature = torch.randn(args.num_edges, args.feature_dim)
+
+    # G built from the tensors, node and edge dicts hold rows of the tensors
+    graph = Graph.from_tensors(
+        edge_index,
+        node_feature=node_feature,
+        node_label=node_label,
+        edge_feature=edge_feature,
+    )
+    G = graph.G
+    # G holding separately allocated tensors, as read from other sources
+    G_copied = G.copy()
+    for _, d in G_copied.nodes.items():
+        d["node_feature"] = d["node_feature"].clone()
+    for _, _, d in G_copied.edges(data=True):
+        d["edge_feature"] = d["edge_feature"].clone()
+
+    print(
+        f"{G.number_of_nodes()} nodes, {G.number_of_edges()} edges, "
+        f"feature dim {args.feature_dim}"
+    )
+    for G_name, G_bench in [("rows of tensors", G), ("copied", G_copied)]:
+        graph.G = G_bench
+        for name, loop, bulk in [
+            (
+                "node_feature",
+                lambda: node_attributes_loop(G_bench, "node_feature"),
+                lambda: graph._get_node_attributes("node_feature"),
+            ),
+            (
+                "node_label",
+                lambda: node_attributes_loop(G_bench, "node_label"),
+                lambda: graph._get_node_attributes("node_label"),
+            ),
+            (
+                "edge_feature",
+                lambda: edge_attributes_loop(G_bench, "edge_feature"),
+                lambda: graph._get_edge_attributes("edge_feature"),
+            ),
+        ]:
+            time_loop = timeit(loop, args.repeat)
+            time_bulk = timeit(bulk, args.repeat)
+            print(
+                f"[{G_name}] {name}: loop {time_loop:.3f}s, "
+                f"bulk {time_bulk:.3f}s, speedup {time_loop / time_bulk:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import time
+import argparse
+import torch
+from deepsnap.graph import Graph
+from deepsnap.batch import Batch
+
+
+def arg_parse():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of collating graphs into batches '
+                    'and unbatching them.'
+    )
+
+    parser.add_argument('--batch_sizes', type=int, nargs='+',
+                        help='Numbers of graphs per batch.')
+    parser.add_argument('--num_nodes', type=int,
+                        help='Average number of nodes of each graph.')
+    parser.add_argument('--avg_degree', type=int,
+                        help='Average degree of each graph.')
+    parser.add_argument('--num_features', type=int,
+                        help='Dimension of the node and edge features.')
+    parser.add_argument('--repeat', type=int,
+                        help='Number of collated batches per batch size.')
+
+    parser.set_defaults(
+        batch_sizes=[32, 128, 512],
+        num_nodes=25,
+        avg_degree=2,
+        num_features=16,
+        repeat=20,
+    )
+    return parser.parse_args()
+
+
+def molecule_like_graphs(num_graphs, args, generator):
+    graphs = []
+    for _ in range(num_graphs):
+        num_nodes = int(
+            torch.randint(
+                args.num_nodes // 2, args.num_nodes * 3 // 2, (1, ),
+                generator=generator,
+            )
+        )
+        num_edges = num_nodes * args.avg_degree
+        graphs.append(
+            Graph.from_tensors(
+                torch.randint(num_nodes, (2, num_edges), generator=generator),
+                num_nodes=num_nodes,
+                node_feature=torch.randn(
+                    num_nodes, args.num_features, generator=generator
+                ),
+                node_label=torch.randint(
+                    2, (num_nodes, ), generator=generator
+                ),
+                edge_feature=torch.randn(
+                    num_edges, args.num_features, generator=generator
+                ),
+                graph_label=torch.randint(2, (1, ), generator=generator),
+            )
+        )
+    return graphs
+
+
+def collate_legacy(data_list):
+    # the collate used before the vectorized one: one addition and one
+    # assignment vector per graph and key, followed by a torch.cat per key
+    keys = list(set.union(*[set(data.keys) for data in data_list]))
+    batch = {key: [] for key in keys}
+    cumsum = {key: 0 for key in keys}
+    assignment = []
+    for i, data in enumerate(data_list):
+        for key in data.keys:
+            item = data[key]
+            if torch.is_tensor(item) and item.dtype != torch.bool:
+                item = item + cumsum[key]
+            cumsum[key] = cumsum[key] + data.__inc__(key, item)
+            batch[key].append(item)
+        assignment.append(
+            torch.full((data.num_nodes, ), i, dtype=torch.long)
+        )
+    for key in keys:
+        item = batch[key][0]
+        if torch.is_tensor(item):
+            batch[key] = torch.cat(
+                batch[key], dim=data_list[0].__cat_dim__(key, item)
+            )
+        elif isinstance(item, (float, int)):
+            batch[key] = torch.tensor(batch[key])
+    batch["batch"] = torch.cat(assignment)
+    return batch
+
+
+def to_data_list_legacy(batch):
+    # the unbatching used before the vectorized one: a narrow, a
+    # subtraction and an __inc__ call per graph and key
+    keys = [key for key in batch.keys if not batch._is_batch_key(key)]
+    cumsum = {key: 0 for key in keys}
+    data_list = []
+    for i in range(batch.num_graphs):
+        data = Graph()
+        for key in keys:
+            slices = batch.__slices__[key]
+            value = batch[key].narrow(
+                data.__cat_dim__(key, batch[key]),
+                slices[i],
+                slices[i + 1] - slices[i],
+            )
+            if value.dtype != torch.bool:
+                value = value - cumsum[key]
+            data[key] = value
+        for key in keys:
+            cumsum[key] = cumsum[key] + data.__inc__(key, data[key])
+        data_list.append(data)
+    return data_list
+
+
+def main():
+    args = arg_parse()
+    generator = torch.Generator().manual_seed(0)
+    for batch_size in args.batch_sizes:
+        graphs = molecule_like_graphs(batch_size, args, generator)
+
+        start = time.time()
+        for _ in range(args.repeat):
+            batch = Batch.from_data_list(graphs)
+        time_batch = (time.time() - start) / args.repeat
+
+        start = time.time()
+        for _ in range(args.repeat):
+            batch_legacy = collate_legacy(graphs)
+        time_legacy = (time.time() - start) / args.repeat
+
+        for key in ["edge_index", "node_feature", "batch"]:
+            assert torch.equal(batch[key], batch_legacy[key])
+        print(
+            f"{batch_size} graphs: collate {time_batch * 1000:.2f}ms, "
+            f"previous collate {time_legacy * 1000:.2f}ms, "
+            f"speedup {time_legacy / time_batch:.1f}x"
+        )
+
+        times = {}
+        for name, unbatch in [
+            ("unbatch", lambda: batch.to_data_list()),
+            ("lazy unbatch", lambda: batch.to_data_list(lazy=True)),
+            ("previous unbatch", lambda: to_data_list_legacy(batch)),
+        ]:
+            start = time.time()
+            for _ in range(args.repeat):
+                unbatch()
+            times[name] = (time.time() - start) / args.repeat
+        print(
+            f"{batch_size} graphs: " + ", ".join(
+                f"{name} {time_unbatch * 1000:.2f}ms"
+                for name, time_unbatch in times.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
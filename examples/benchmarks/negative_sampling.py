@@ -0,0 +1,90 @@
+import time
+import random
+import argparse
+import numpy as np
+import torch
+from deepsnap.graph import Graph
+
+
+def arg_parse():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of negative sampling.'
+    )
+
+    parser.add_argument('--num_edges', type=int, nargs='+',
+                        help='Numbers of edges of the benchmarked graphs.')
+    parser.add_argument('--avg_degree', type=int,
+                        help='Average degree of the benchmarked graphs.')
+    parser.add_argument('--legacy_max_edges', type=int,
+                        help='Largest number of edges to also run '
+                             'the previous negative sampling on.')
+    parser.add_argument('--repeat', type=int,
+                        help='Number of resampling epochs.')
+
+    parser.set_defaults(
+        num_edges=[1000000, 10000000, 100000000],
+        avg_degree=10,
+        legacy_max_edges=10000000,
+        repeat=3,
+    )
+    return parser.parse_args()
+
+
+def negative_sampling_legacy(edge_index, num_nodes, num_neg_samples):
+    # the negative sampling used before the cached key index
+    num_neg_samples = min(
+        num_neg_samples, num_nodes * num_nodes - edge_index.size(1)
+    )
+    rng = range(num_nodes ** 2)
+    idx = (edge_index[0] * num_nodes + edge_index[1]).to("cpu")
+
+    perm = torch.tensor(random.sample(rng, num_neg_samples))
+    mask = torch.from_numpy(np.isin(perm, idx)).to(torch.bool)
+    rest = mask.nonzero().view(-1)
+    while rest.numel() > 0:
+        tmp = torch.tensor(random.sample(rng, rest.size(0)))
+        mask = torch.from_numpy(np.isin(tmp, idx)).to(torch.bool)
+        perm[rest] = tmp
+        rest = rest[mask.nonzero().view(-1)]
+
+    row = perm // num_nodes
+    col = perm % num_nodes
+    return torch.stack([row, col], dim=0).long()
+
+
+def main():
+    args = arg_parse()
+    generator = torch.Generator().manual_seed(0)
+    for num_edges in args.num_edges:
+        num_nodes = num_edges // args.avg_degree
+        edge_index = torch.randint(
+            num_nodes, (2, num_edges), generator=generator
+        )
+        # the first epoch builds the sorted key index, later epochs reuse it
+        start = time.time()
+        edge_keys = Graph._edge_keys(edge_index, num_nodes)
+        time_keys = time.time() - start
+        start = time.time()
+        for _ in range(args.repeat):
+            Graph._negative_sampling_from_keys(
+                edge_keys, num_nodes, num_edges, generator
+            )
+        time_epoch = (time.time() - start) / args.repeat
+        print(
+            f"{num_edges} edges: key index {time_keys:.2f}s, "
+            f"sampling {time_epoch:.2f}s per epoch "
+            f"({num_edges / time_epoch / 1e6:.1f}M negatives/s)"
+        )
+
+        if num_edges <= args.legacy_max_edges:
+            start = time.time()
+            negative_sampling_legacy(edge_index, num_nodes, num_edges)
+            time_legacy = time.time() - start
+            print(
+                f"{num_edges} edges: previous sampling {time_legacy:.2f}s "
+                f"per epoch, speedup {time_legacy / time_epoch:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import time
+import argparse
+import torch
+from deepsnap.graph import Graph
+from deepsnap.dataset import GraphDataset
+
+
+def arg_parse():
+    parser = argparse.ArgumentParser(
+        description='Benchmark of splitting an inductive link prediction '
+                    'dataset serially and in worker processes.'
+    )
+
+    parser.add_argument('--num_graphs', type=int, nargs='+',
+                        help='Numbers of graphs of the dataset.')
+    parser.add_argument('--num_nodes', type=int,
+                        help='Average number of nodes of each graph.')
+    parser.add_argument('--avg_degree', type=int,
+                        help='Average degree of each graph.')
+    parser.add_argument('--num_workers', type=int, nargs='+',
+                        help='Numbers of worker processes to compare.')
+    parser.add_argument('--edge_train_mode', type=str,
+                        help='Edge train mode of the dataset.')
+
+    parser.set_defaults(
+        num_graphs=[1000, 10000, 100000],
+        num_nodes=25,
+        avg_degree=3,
+        num_workers=[0, 4, 16],
+        edge_train_mode='disjoint',
+    )
+    return parser.parse_args()
+
+
+def random_graphs(num_graphs, args, generator):
+    graphs = []
+    for _ in range(num_graphs):
+        num_nodes = int(
+            torch.randint(
+                args.num_nodes // 2, args.num_nodes * 3 // 2, (1, ),
+                generator=generator,
+            )
+        )
+        num_edges = num_nodes * args.avg_degree // 2
+        graphs.append(
+            Graph.from_tensors(
+                torch.randint(num_nodes, (2, num_edges), generator=generator),
+                num_nodes=num_nodes,
+                directed=False,
+                node_feature=torch.randn(num_nodes, 8, generator=generator),
+            )
+        )
+    return graphs
+
+
+def main():
+    args = arg_parse()
+    generator = torch.Generator().manual_seed(0)
+    for num_graphs in args.num_graphs:
+        graphs = random_graphs(num_graphs, args, generator)
+        times = {}
+        for num_workers in args.num_workers:
+            dataset = GraphDataset(
+                graphs,
+                task="link_pred",
+                edge_train_mode=args.edge_train_mode,
+                seed=0,
+            )
+            start = time.time()
+            dataset.split(transductive=False, num_workers=num_workers)
+            times[num_workers] = time.time() - start
+        print(
+            f"{num_graphs} graphs: " + ", ".join(
+                f"{num_workers} workers {time_split:.2f}s"
+                for num_workers, time_split in times.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -100,7 +100,7 @@ class GIN(torch.nn.Module):
         for i in range(len(self.convs)):
             x = self.convs[i](x, edge_index)
             x = F.relu(x)
-        x = pyg_nn.global_add_pool(x, batch)
+        x = data.pool(x, reduce="sum")
         x = self.post_mp(x)
         x = F.log_softmax(x, dim=1)
         return x
@@ -144,8 +144,8 @@ class GNN(torch.nn.Module):
             x = F.relu(x)
             x = F.dropout(x, p=self.dropout, training=self.training)
 
-        # x = pyg_nn.global_mean_pool(x, batch)
-        x = pyg_nn.global_add_pool(x, batch)
+        # x = data.pool(x, reduce="mean")
+        x = data.pool(x, reduce="sum")
         x = self.post_mp(x)
         x = F.log_softmax(x, dim=1)
         return x
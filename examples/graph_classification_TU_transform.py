@@ -52,6 +52,8 @@ def arg_parse():
                         help='apply transform to each batch.')
     parser.add_argument('--radius', type=int,
                         help='Radius of mini-batch ego networks')
+    parser.add_argument('--cache_dir', type=str,
+                        help='Directory caching the transformed dataset.')
 
     parser.set_defaults(
             device='cuda:0', 
@@ -68,7 +70,8 @@ def arg_parse():
             skip=None,
             transform_dataset=None,
             transform_batch=None,
-            radius=3
+            radius=3,
+            cache_dir=None
     )
     return parser.parse_args()
 
@@ -239,15 +242,17 @@ if __name__ == "__main__":
     graphs = GraphDataset.pyg_to_graphs(pyg_dataset)
 
     dataset = GraphDataset(graphs, task="graph")
+    if args.transform_dataset is not None:
+        # transformed before the split, such that the cached dataset is
+        # reused by later runs
+        trans_func = get_transform(args.transform_dataset)
+        dataset = dataset.apply_transform(
+            trans_func, radius=args.radius, cache_dir=args.cache_dir)
+
     datasets = {}
     datasets['train'], datasets['val'], datasets['test'] = dataset.split(
             transductive=False, split_ratio = [0.8, 0.1, 0.1])
 
-    if args.transform_dataset is not None:
-        trans_func = get_transform(args.transform_dataset)
-        for _, dataset in datasets.items():
-            dataset.apply_transform(trans_func, radius=args.radius)
-
     dataloaders = {split: DataLoader(
                 dataset, collate_fn=Batch.collate(), 
                 batch_size=args.batch_size, shuffle=True)
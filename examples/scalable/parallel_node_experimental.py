@@ -1,4 +1,4 @@
-# need to add neighbor sampling, API calls to replace torch.distributed
+# need to add API calls to replace torch.distributed
 
 import math
 import copy
@@ -14,6 +14,7 @@ import pdb
 
 from deepsnap.dataset import GraphDataset
 from deepsnap.batch import Batch
+from deepsnap.sampler import NeighborSampler
 from torch.utils.data import DataLoader
 
 from torch.nn.parallel import DistributedDataParallel
@@ -22,6 +23,8 @@ n_gpus = 2
 name = 'Cora'
 model_name = 'GCN'
 fixed_split = True
+num_neighbors = [10, 5]  # neighbors sampled per node at each layer
+batch_size = 512
 pyg_dataset = Planetoid('./cora', name,
                         transform=T.TargetIndegree())  # load some format of graph data
 
@@ -100,14 +103,17 @@ def test():
     return accs
 
 def run(proc_id, n_gpus, devices):
-    dataset_train = torch.split(dataset_train, len(dataset_train) // n_gpus)[proc_id]
-
-    train_loader = DataLoader(dataset_train, collate_fn=Batch.collate(),
-                          batch_size=16)  # basic data loader
-    val_loader = DataLoader(dataset_val, collate_fn=Batch.collate(),
-                          batch_size=16)  # basic data loader
-    test_loader = DataLoader(dataset_test, collate_fn=Batch.collate(),
-                          batch_size=16)  # basic data loader
+    # mini-batches of subgraphs sampled around the labeled nodes of each split,
+    # the training nodes are divided among the processes
+    sampler = NeighborSampler(dataset_train[0], num_neighbors)
+    train_nodes = torch.chunk(dataset_train[0].node_label_index, n_gpus)[proc_id]
+
+    train_loader = DataLoader(train_nodes, collate_fn=sampler, shuffle=True,
+                          batch_size=batch_size, num_workers=4)
+    val_loader = DataLoader(dataset_val[0].node_label_index, collate_fn=sampler,
+                          batch_size=batch_size, num_workers=4)
+    test_loader = DataLoader(dataset_test[0].node_label_index, collate_fn=sampler,
+                          batch_size=batch_size, num_workers=4)
     
     dev_id = devices[proc_id]
     torch.cuda.set_device(dev_id)
@@ -1,4 +1,6 @@
+import copy
 import math
+import pickle
 import unittest
 from copy import deepcopy
 import torch
@@ -31,6 +33,129 @@ class TestBatch(unittest.TestCase):
             2 * len(graphs[0].node_feature),
         )
 
+    def test_batch_tensor_offsets(self):
+        sizes = [3, 1, 4]
+        graphs = [
+            Graph.from_tensors(
+                torch.tensor([[0, num_nodes - 1], [num_nodes - 1, 0]]),
+                num_nodes=num_nodes,
+                node_feature=torch.full((num_nodes, 2), float(i)),
+                edge_mask=torch.tensor([True, False]),
+            )
+            for i, num_nodes in enumerate(sizes)
+        ]
+        batch = Batch.from_data_list(graphs, follow_batch=["edge_index"])
+        self.assertTrue(
+            torch.equal(batch.batch, torch.tensor([0, 0, 0, 1, 2, 2, 2, 2]))
+        )
+        self.assertTrue(
+            torch.equal(
+                batch.edge_index,
+                torch.tensor([[0, 2, 3, 3, 4, 7], [2, 0, 3, 3, 7, 4]]),
+            )
+        )
+        self.assertTrue(
+            torch.equal(batch.edge_index_batch, torch.tensor([0, 0, 1, 1, 2, 2]))
+        )
+        self.assertTrue(
+            torch.equal(batch.edge_mask, torch.tensor([True, False] * 3))
+        )
+        self.assertEqual(batch.__slices__["node_feature"], [0, 3, 4, 8])
+        self.assertTrue(torch.equal(batch.ptr, torch.tensor([0, 3, 4, 8])))
+        self.assertTrue(
+            torch.equal(batch.edge_index_ptr, torch.tensor([0, 2, 4, 6]))
+        )
+        self.assertEqual(batch.num_graphs, 3)
+
+        pooled = batch.pool(batch.node_feature, reduce="sum")
+        self.assertTrue(
+            torch.equal(pooled[:, 0], torch.tensor([0., 1., 8.]))
+        )
+        pooled = batch.pool(batch.node_feature, reduce="mean")
+        self.assertTrue(
+            torch.equal(pooled[:, 0], torch.tensor([0., 1., 2.]))
+        )
+
+        for graph, graph_recon in zip(graphs, batch.to_data_list()):
+            self.assertTrue(
+                torch.equal(graph.edge_index, graph_recon.edge_index)
+            )
+            self.assertTrue(
+                torch.equal(graph.node_feature, graph_recon.node_feature)
+            )
+
+    def test_to_data_list_lazy(self):
+        graphs = [
+            Graph.from_tensors(
+                torch.randint(num_nodes, (2, 2 * num_nodes)),
+                num_nodes=num_nodes,
+                node_feature=torch.randn(num_nodes, 2),
+            )
+            for num_nodes in [3, 1, 4]
+        ]
+        batch = Batch.from_data_list(graphs)
+        for lazy in [False, True]:
+            data_list = batch.to_data_list(lazy=lazy)
+            for graph, graph_recon in zip(graphs, data_list):
+                self.assertEqual(set(graph.keys), set(graph_recon.keys))
+                self.assertTrue(
+                    torch.equal(graph.edge_index, graph_recon.edge_index)
+                )
+                self.assertTrue(
+                    torch.equal(graph.node_feature, graph_recon.node_feature)
+                )
+
+        data = batch.to_data_list(lazy=True)[2]
+        # node features are views of the batch, edge indices are pending
+        self.assertEqual(
+            data.__dict__["node_feature"].data_ptr(),
+            batch.node_feature[4].data_ptr(),
+        )
+        self.assertNotIn("edge_index", data.__dict__)
+        self.assertTrue(torch.equal(data["edge_index"], graphs[2].edge_index))
+        self.assertIn("edge_index", data.__dict__)
+        data.edge_label_index = torch.zeros(2, 0, dtype=torch.long)
+        self.assertIn("edge_label_index", data.keys)
+
+        # copies keep attributes pending, pickled graphs compute them
+        data = batch.to_data_list(lazy=True)[0]
+        data_copy = copy.copy(data)
+        self.assertNotIn("edge_index", data_copy.__dict__)
+        self.assertTrue(
+            torch.equal(data_copy.edge_index, graphs[0].edge_index)
+        )
+        self.assertNotIn("edge_index", data.__dict__)
+        data_load = pickle.loads(pickle.dumps(data))
+        self.assertIs(type(data_load), type(data))
+        self.assertEqual(set(data_load.keys), set(graphs[0].keys))
+        self.assertTrue(
+            torch.equal(data_load.edge_index, graphs[0].edge_index)
+        )
+
+    def test_segment_pool(self):
+        x = torch.randn(7, 3)
+        ptr = torch.tensor([0, 3, 3, 7])
+        segments = [x[:3], x[3:7]]
+        pooled = Batch.segment_pool(x, ptr, reduce="sum")
+        self.assertTrue(torch.allclose(pooled[0], segments[0].sum(dim=0)))
+        self.assertTrue(torch.allclose(pooled[2], segments[1].sum(dim=0)))
+        pooled = Batch.segment_pool(x, ptr, reduce="mean")
+        self.assertTrue(torch.allclose(pooled[2], segments[1].mean(dim=0)))
+        pooled = Batch.segment_pool(x, ptr, reduce="max")
+        self.assertTrue(
+            torch.equal(pooled[0], segments[0].max(dim=0)[0])
+        )
+        # empty segments are pooled to zeros
+        for reduce in ["sum", "mean", "max"]:
+            pooled = Batch.segment_pool(x, ptr, reduce=reduce)
+            self.assertTrue(torch.equal(pooled[1], torch.zeros(3)))
+
+        pooled = Batch.segment_pool(torch.arange(7), ptr, reduce="max")
+        self.assertTrue(torch.equal(pooled, torch.tensor([2, 0, 6])))
+
+        with self.assertRaises(ValueError):
+            Batch.segment_pool(x, ptr, reduce="min")
+
     def test_torch_dataloader_collate(self):
         # graph classification example
         pyg_dataset = TUDataset("./enzymes", "ENZYMES")
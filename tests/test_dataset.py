@@ -1,11 +1,15 @@
+import os
 import random
+import tempfile
 import torch
 import unittest
+import warnings
 from torch_geometric.datasets import TUDataset, Planetoid
 import copy
 from copy import deepcopy
 from deepsnap.graph import Graph
 from deepsnap.hetero_graph import HeteroGraph
+from deepsnap.cache import TransformCache
 from deepsnap.dataset import GraphDataset, Generator, EnsembleGenerator
 from tests.utils import (
     simple_networkx_graph,
@@ -16,6 +20,19 @@ from tests.utils import (
 )
 
 
+def node_degree_transform(graph, scale):
+    degrees = [degree for _, degree in graph.G.degree()]
+    graph.node_degree = scale * torch.tensor(degrees, dtype=torch.float)
+
+
+class NodeScale(object):
+    def __init__(self, scale):
+        self.scale = scale
+
+    def apply(self, graph):
+        graph.node_feature = self.scale * graph.node_feature
+
+
 class TestDataset(unittest.TestCase):
 
     def test_dataset_basic(self):
@@ -652,15 +669,15 @@ class TestDataset(unittest.TestCase):
 
         split_res = dataset.split(transductive=True)
         self.assertEqual(
-            split_res[0][0].node_label_index,
+            split_res[0][0].node_label_index.tolist(),
             list(range(int(0.3 * num_nodes)))
         )
         self.assertEqual(
-            split_res[1][0].node_label_index,
+            split_res[1][0].node_label_index.tolist(),
             list(range(int(0.3 * num_nodes), int(0.6 * num_nodes)))
         )
         self.assertEqual(
-            split_res[2][0].node_label_index,
+            split_res[2][0].node_label_index.tolist(),
             list(range(int(0.6 * num_nodes), num_nodes))
         )
 
@@ -849,6 +866,40 @@ class TestDataset(unittest.TestCase):
             2 * link_size_list[2]
         )
 
+        # transductive split with link_pred task (custom splits as tensors)
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_edge_attr(G, "edge_feature", edge_x)
+        Graph.add_node_attr(G, "node_feature", x)
+        edges = torch.tensor(list(G.edges)).t()
+        num_edges_train = int(0.7 * edges.shape[1])
+        edges_train = edges[:, :num_edges_train]
+        edges_val = edges[:, num_edges_train:]
+        graph = Graph(
+            G,
+            custom_splits=[edges_train, edges_val],
+            task="link_pred"
+        )
+        dataset = GraphDataset(
+            [graph],
+            task="link_pred",
+            general_split_mode="custom",
+        )
+        split_res = dataset.split(transductive=True)
+        self.assertTrue(torch.equal(split_res[0][0].edge_index, edges_train))
+        self.assertTrue(torch.equal(split_res[1][0].edge_index, edges_train))
+        self.assertTrue(
+            torch.equal(
+                split_res[1][0].edge_label_index[:, :edges_val.shape[1]],
+                edges_val
+            )
+        )
+        self.assertEqual(
+            split_res[1][0].edge_label_index.shape[1],
+            2 * edges_val.shape[1]
+        )
+
         # transductive split with node task (pytorch geometric dataset)
         pyg_dataset = Planetoid("./cora", "Cora")
         graphs = GraphDataset.pyg_to_graphs(pyg_dataset)
@@ -1076,6 +1127,241 @@ class TestDataset(unittest.TestCase):
         # TODO: test for transductive split w/ hetero graph
         # TODO: test for inductive split w/ hetero graph
 
+    def test_negative_sampling_mode(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+        dataset = GraphDataset(
+            [Graph(G)],
+            task="link_pred",
+            edge_negative_sampling_ratio=3,
+            negative_sampling_mode="tail",
+        )
+        split_res = dataset.split(transductive=True)
+        for dataset_split in split_res + [[split_res[0][0]]]:
+            graph = dataset_split[0]
+            num_pos = graph.edge_label_index.shape[1] // 4
+            positives = graph.edge_label_index[:, :num_pos]
+            negatives = graph.edge_label_index[:, num_pos:]
+            positive = set(
+                map(
+                    tuple,
+                    torch.cat([graph.edge_index, positives], dim=1)
+                    .t().tolist()
+                )
+            )
+            self.assertTrue(
+                torch.equal(
+                    negatives[0].view(num_pos, 3),
+                    positives[0].view(-1, 1).expand(num_pos, 3),
+                )
+            )
+            self.assertEqual(
+                len(positive.intersection(map(tuple, negatives.t().tolist()))),
+                0,
+            )
+            self.assertEqual(graph.edge_label[num_pos:].sum(), 0)
+
+        with self.assertRaises(ValueError):
+            GraphDataset(
+                [Graph(G)],
+                task="link_pred",
+                edge_negative_sampling_ratio=0.5,
+                negative_sampling_mode="tail",
+            )
+
+    def test_negative_resampling(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+
+        def negatives(dataset):
+            return [
+                graph.edge_label_index[:, graph._num_positive_examples:]
+                for graph in dataset.graphs
+            ]
+
+        # only the accessed graph is resampled
+        dataset = GraphDataset(
+            [Graph(G.copy()) for _ in range(10)],
+            task="link_pred",
+            edge_train_mode="disjoint",
+        )
+        dataset_train = dataset.split(transductive=False)[0]
+        before = negatives(dataset_train)
+        dataset_train[0]
+        after = negatives(dataset_train)
+        self.assertTrue(
+            all(torch.equal(a, b) for a, b in zip(before[1:], after[1:]))
+        )
+
+        for prefetch_negatives in [False, True]:
+            dataset = GraphDataset(
+                [Graph(G.copy()) for _ in range(10)],
+                task="link_pred",
+                edge_train_mode="disjoint",
+                negative_resampling="epoch",
+                prefetch_negatives=prefetch_negatives,
+            )
+            dataset_train = dataset.split(transductive=False)[0]
+            before = negatives(dataset_train)
+            for graph in dataset_train:
+                pass
+            after = negatives(dataset_train)
+            self.assertTrue(
+                all(torch.equal(a, b) for a, b in zip(before, after))
+            )
+            for _ in range(3):
+                dataset_train.new_epoch()
+                after = negatives(dataset_train)
+                self.assertFalse(
+                    all(torch.equal(a, b) for a, b in zip(before, after))
+                )
+                for graph, negative in zip(dataset_train.graphs, after):
+                    num_pos = graph._num_positive_examples
+                    self.assertEqual(negative.shape[1], num_pos)
+                    positive = set(
+                        map(
+                            tuple,
+                            torch.cat(
+                                [
+                                    graph.edge_index,
+                                    graph.edge_label_index[:, :num_pos],
+                                ],
+                                dim=1,
+                            ).t().tolist()
+                        )
+                    )
+                    self.assertEqual(
+                        len(
+                            positive.intersection(
+                                map(tuple, negative.t().tolist())
+                            )
+                        ),
+                        0,
+                    )
+                before = after
+
+        with self.assertRaises(ValueError):
+            GraphDataset(
+                [Graph(G)], task="link_pred", prefetch_negatives=True
+            )
+
+    def test_resample_disjoint(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+        Graph.add_edge_attr(G, "edge_feature", edge_x)
+        dataset = GraphDataset(
+            [Graph(G)],
+            task="link_pred",
+            edge_train_mode="disjoint",
+            edge_message_ratio=0.5,
+        )
+        dataset_train = dataset.split(transductive=True)[0]
+        graph = dataset_train[0]
+        num_pos = graph._num_positive_examples
+
+        def edge_set(edge_index):
+            return set(map(tuple, edge_index.t().tolist()))
+
+        edges = edge_set(graph.edge_index) | edge_set(
+            graph.edge_label_index[:, :num_pos]
+        )
+        for _ in range(3):
+            dataset_train.resample_disjoint()
+            # the graph is updated in place
+            self.assertIs(dataset_train.graphs[0], graph)
+            message = edge_set(graph.edge_index)
+            objective = edge_set(graph.edge_label_index[:, :num_pos])
+            self.assertEqual(len(message & objective), 0)
+            self.assertEqual(message | objective, edges)
+            # negative edges are sampled for the new objective edges
+            self.assertEqual(graph._num_positive_examples, num_pos)
+            self.assertEqual(graph.edge_label_index.shape[1], 2 * num_pos)
+            self.assertEqual(graph.edge_label[:num_pos].min(), 1)
+            self.assertEqual(graph.edge_label[num_pos:].max(), 0)
+            self.assertEqual(
+                len(edges & edge_set(graph.edge_label_index[:, num_pos:])),
+                0,
+            )
+            self.assertEqual(
+                graph.edge_feature.shape[0], graph.edge_index.shape[1]
+            )
+
+    def test_seed(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+
+        def split(seed, **kwargs):
+            dataset = GraphDataset(
+                [Graph(G.copy()) for _ in range(10)],
+                task="link_pred",
+                edge_train_mode="disjoint",
+                seed=seed,
+                **kwargs,
+            )
+            return dataset.split(transductive=False)
+
+        def edge_label_indices(dataset):
+            return [graph.edge_label_index for graph in dataset.graphs]
+
+        def equal(a, b):
+            return all(torch.equal(a_i, b_i) for a_i, b_i in zip(a, b))
+
+        # the same seed gives the same splits and negative edges
+        split_res = [split(0), split(0), split(1)]
+        for i in range(3):
+            self.assertTrue(
+                equal(
+                    edge_label_indices(split_res[0][i]),
+                    edge_label_indices(split_res[1][i]),
+                )
+            )
+        self.assertFalse(
+            equal(
+                edge_label_indices(split_res[0][0]),
+                edge_label_indices(split_res[2][0]),
+            )
+        )
+
+        # resampling on access
+        for dataset in [split_res[0][0], split_res[1][0]]:
+            for graph in dataset:
+                pass
+            dataset.resample_disjoint()
+        self.assertTrue(
+            equal(
+                edge_label_indices(split_res[0][0]),
+                edge_label_indices(split_res[1][0]),
+            )
+        )
+
+        # negative edges prefetched in the background are the same as
+        # those sampled in new_epoch
+        datasets = [
+            split(
+                0,
+                negative_resampling="epoch",
+                prefetch_negatives=prefetch_negatives,
+            )[0]
+            for prefetch_negatives in [False, True]
+        ]
+        for _ in range(3):
+            for dataset in datasets:
+                dataset.new_epoch()
+            self.assertTrue(
+                equal(
+                    edge_label_indices(datasets[0]),
+                    edge_label_indices(datasets[1]),
+                )
+            )
+
     def test_generator(self):
         pyg_dataset = Planetoid("./cora", "Cora")
         dg = Graph.pyg_to_graph(pyg_dataset[0])
@@ -1150,6 +1436,182 @@ class TestDataset(unittest.TestCase):
             num_graphs_large,
         )
 
+    def test_apply_transform_parallel(self):
+        pyg_dataset = TUDataset("./enzymes", "ENZYMES")
+        graphs = GraphDataset.pyg_to_graphs(pyg_dataset)
+        dataset = GraphDataset(graphs[:50], task="graph")
+
+        serial = dataset.apply_transform(
+            node_degree_transform, update_tensor=False, deep_copy=True,
+            scale=2.,
+        )
+        parallel = dataset.apply_transform(
+            node_degree_transform, update_tensor=False, num_workers=2,
+            chunksize=7, scale=2.,
+        )
+        self.assertEqual(len(parallel), len(serial))
+        self.assertNotIn("node_degree", dataset[0].keys)
+        for graph, expected in zip(parallel, serial):
+            for key in ["node_degree", "node_feature", "edge_index"]:
+                self.assertTrue(torch.equal(graph[key], expected[key]))
+            self.assertEqual(graph.task, "graph")
+            self.assertEqual(
+                graph.G.number_of_edges(), expected.G.number_of_edges()
+            )
+
+        # transforms that can not be pickled are applied serially
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            transformed = dataset.apply_transform(
+                lambda graph: None, num_workers=2
+            )
+        self.assertEqual(len(transformed), len(dataset))
+        self.assertTrue(
+            any("picklable" in str(warning.message) for warning in caught)
+        )
+
+    def test_apply_transform_cache(self):
+        pyg_dataset = TUDataset("./enzymes", "ENZYMES")
+        graphs = GraphDataset.pyg_to_graphs(pyg_dataset)
+        dataset = GraphDataset(graphs[:30], task="graph")
+        other_dataset = GraphDataset(graphs[30:60], task="graph")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = TransformCache(cache_dir)
+            expected = dataset.apply_transform(
+                node_degree_transform, deep_copy=True, scale=2.,
+                cache_dir=cache_dir,
+            )
+            self.assertEqual(len(cache.entries()), 1)
+            cached = dataset.apply_transform(
+                node_degree_transform, deep_copy=True, scale=2., cache_dir=cache_dir,
+            )
+            self.assertNotIn("node_degree", dataset[0].keys)
+            self.assertEqual(len(cached), len(expected))
+            for graph, expected_graph in zip(cached, expected):
+                for key in ["node_degree", "node_feature", "edge_index"]:
+                    self.assertTrue(
+                        torch.equal(graph[key], expected_graph[key])
+                    )
+                self.assertEqual(graph.task, "graph")
+
+            # other parameters or graphs are new entries
+            dataset.apply_transform(
+                node_degree_transform, deep_copy=True, scale=3., cache_dir=cache_dir,
+            )
+            other_dataset.apply_transform(
+                node_degree_transform, deep_copy=True, scale=2., cache_dir=cache_dir,
+            )
+            self.assertEqual(len(cache.entries()), 3)
+
+            # the least recently used entries are evicted
+            key = cache.fingerprint(
+                dataset.graphs, node_degree_transform,
+                update_tensor=True, update_graph=False, update_keys=None,
+                kwargs={"scale": 2.},
+            )
+            os.utime(
+                os.path.join(cache_dir, key, "manifest.json"), (0, 0)
+            )
+            size = max(entry["size"] for entry in cache.entries().values())
+            other_dataset.apply_transform(
+                node_degree_transform, deep_copy=True, scale=4., cache_dir=cache_dir,
+                cache_max_bytes=3 * size,
+            )
+            entries = cache.entries()
+            self.assertEqual(len(entries), 3)
+            self.assertNotIn(key, entries)
+
+            # graphs with custom node ids are not cached
+            G = simple_networkx_graph_alphabet()[0]
+            Graph.add_node_attr(G, "node_feature", torch.ones(10, 2))
+            dataset = GraphDataset([Graph(G)], task="node")
+            for _ in range(2):
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter("always")
+                    transformed = dataset.apply_transform(
+                        NodeScale(2.).apply, deep_copy=True,
+                        cache_dir=cache_dir,
+                    )
+                self.assertTrue(
+                    any("cached" in str(warning.message) for warning in caught)
+                )
+                self.assertEqual(
+                    list(transformed[0].G.nodes), list("abcdefghij")
+                )
+
+        # bound methods are fingerprinted with the state of their object
+        key_2 = cache.fingerprint(dataset.graphs, NodeScale(2.).apply)
+        key_3 = cache.fingerprint(dataset.graphs, NodeScale(3.).apply)
+        self.assertNotEqual(key_2, key_3)
+        self.assertEqual(
+            key_2, cache.fingerprint(dataset.graphs, NodeScale(2.).apply)
+        )
+
+        def recursive_transform(graph, depth=1):
+            if depth > 0:
+                recursive_transform(graph, depth - 1)
+
+        def late_transform(graph):
+            return later(graph)
+
+        # the closures refer to the function itself and to an unset variable
+        cache.fingerprint(dataset.graphs, recursive_transform)
+        cache.fingerprint(dataset.graphs, late_transform)
+        later = None
+
+    def test_split_parallel(self):
+        pyg_dataset = TUDataset("./enzymes", "ENZYMES")
+        graphs = GraphDataset.pyg_to_graphs(pyg_dataset)[:60]
+
+        def split(transductive, **kwargs):
+            dataset = GraphDataset(
+                graphs, task="link_pred", edge_train_mode="disjoint", seed=0
+            )
+            return dataset.split(transductive=transductive, **kwargs)
+
+        for transductive in [True, False]:
+            split_res = split(transductive, num_workers=2)
+            # the splits do not depend on the number of workers
+            split_res_chunks = split(
+                transductive, num_workers=1, chunksize=7
+            )
+            self.assertEqual(
+                [len(dataset) for dataset in split_res],
+                [len(dataset) for dataset in split(transductive)],
+            )
+            for dataset, dataset_chunks in zip(split_res, split_res_chunks):
+                for graph, graph_chunks in zip(
+                    dataset.graphs, dataset_chunks.graphs
+                ):
+                    self.assertTrue(
+                        torch.equal(
+                            graph.edge_label_index,
+                            graph_chunks.edge_label_index,
+                        )
+                    )
+                    num_pos = graph._num_positive_examples
+                    positive = set(
+                        map(
+                            tuple,
+                            torch.cat(
+                                [
+                                    graph.edge_index,
+                                    graph.edge_label_index[:, :num_pos],
+                                ],
+                                dim=1,
+                            ).t().tolist()
+                        )
+                    )
+                    negative = set(
+                        map(
+                            tuple,
+                            graph.edge_label_index[:, num_pos:].t().tolist()
+                        )
+                    )
+                    self.assertEqual(len(positive & negative), 0)
+            split_res[0].resample_disjoint()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import os
+import pickle
+import tempfile
+import torch
+import unittest
+from deepsnap.graph import Graph
+from deepsnap.batch import Batch
+from deepsnap.feature_store import FeatureStore
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def test_gather(self):
+        features = torch.rand(100, 4)
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "features.npy")
+            store = FeatureStore.create(path, features, cache_size=10)
+            self.assertEqual(store.shape, features.shape)
+            self.assertEqual(store.dtype, features.dtype)
+            self.assertTrue(torch.equal(store.gather(), features))
+
+            index = torch.tensor([50, 30, 50, 70])
+            self.assertTrue(torch.equal(store.gather(index), features[index]))
+            info = store.cache_info()
+            self.assertEqual(info["size"], 10)
+            # only the first rows of the full gather fit in the cache
+            self.assertEqual(info["misses"], 103)
+            store.gather(index)
+            self.assertEqual(store.cache_info()["hits"], 3)
+
+            subset = store.select(torch.tensor([10, 20, 30]))
+            self.assertEqual(len(subset), 3)
+            self.assertTrue(
+                torch.equal(subset.gather(torch.tensor([2, 0])),
+                            features[[30, 10]])
+            )
+
+            copied = pickle.loads(pickle.dumps(subset))
+            self.assertTrue(torch.equal(copied.gather(), subset.gather()))
+
+    def test_batch(self):
+        features = torch.rand(20, 3)
+        edge_index = torch.tensor([[0, 1, 2], [1, 2, 3]])
+        with tempfile.TemporaryDirectory() as root:
+            store = FeatureStore.create(
+                os.path.join(root, "features.npy"), features, cache_size=8
+            )
+            nodes = [torch.tensor([0, 1, 2, 3]), torch.tensor([9, 8, 7, 1])]
+            graphs = [
+                Graph.from_tensors(
+                    edge_index, num_nodes=4,
+                    node_feature=store.select(index),
+                )
+                for index in nodes
+            ]
+            batch = Batch.from_data_list(graphs)
+            self.assertTrue(
+                torch.equal(batch.node_feature, features[torch.cat(nodes)])
+            )
+            self.assertEqual(batch.num_graphs, 2)
+
+            graph = graphs[0].to("cpu")
+            self.assertIsInstance(graph.node_feature, FeatureStore)
+
+
+if __name__ == "__main__":
+    unittest.main()
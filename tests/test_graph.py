@@ -1,11 +1,31 @@
 import torch
 import unittest
 import numpy as np
-from tests.utils import simple_networkx_graph
+import networkx as nx
+from tests.utils import (
+    simple_networkx_graph,
+    simple_networkx_graph_alphabet,
+)
 from deepsnap.graph import Graph
 from torch_geometric.datasets import Planetoid
 
 
+def remove_node_label(graph):
+    graph.node_label = None
+
+
+def shift_attributes_in_G(graph):
+    for _, data in graph.G.nodes(data=True):
+        data["node_feature"] = data["node_feature"] + 1
+        data["node_label"] = data["node_label"] + 1
+    for _, _, data in graph.G.edges(data=True):
+        data["edge_feature"] = data["edge_feature"] + 1
+
+
+def add_edge_to_G(graph):
+    graph.G.add_edge(0, 9, edge_feature=torch.zeros(2))
+
+
 class TestGraph(unittest.TestCase):
 
     def test_add_feature_nx(self):
@@ -164,6 +184,207 @@ class TestGraph(unittest.TestCase):
         ]
         self.assertTrue(tuple(dg.keys) == tuple(keys))
 
+    def test_from_tensors(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        dg = Graph.from_tensors(
+            edge_index,
+            node_feature=x,
+            node_label=y,
+            edge_feature=edge_x,
+            edge_label=edge_y,
+            graph_label=graph_y,
+        )
+        self.assertNotIn("G", dg.keys)
+        self.assertTrue(dg.is_directed())
+        self.assertEqual(dg.num_nodes, G.number_of_nodes())
+        self.assertEqual(dg.num_edges, G.number_of_edges())
+        self.assertEqual(dg.num_node_features, 2)
+        self.assertEqual(dg.num_edge_labels, torch.max(edge_y).item() + 1)
+        self.assertTrue(torch.equal(dg.edge_index, edge_index))
+
+        # undirected: reversed and duplicated edges are removed
+        edge_index_undirected = torch.cat(
+            [edge_index, torch.flip(edge_index, [0])], dim=1
+        )
+        dg = Graph.from_tensors(
+            edge_index_undirected,
+            node_feature=x,
+            edge_feature=torch.cat([edge_x, edge_x], dim=0),
+            directed=False,
+        )
+        G_undirected = G.to_undirected()
+        self.assertTrue(dg.is_undirected())
+        self.assertEqual(dg.num_edges, G_undirected.number_of_edges())
+        self.assertEqual(
+            dg.edge_index.shape[1], 2 * G_undirected.number_of_edges()
+        )
+        self.assertEqual(dg.edge_feature.shape[0], dg.edge_index.shape[1])
+
+        dg_link = dg.split(task="link_pred")
+        num_edges_reduced = dg.num_edges - 3
+        edge_0 = 2 * (1 + int(num_edges_reduced * 0.8))
+        edge_1 = 2 * (1 + int(num_edges_reduced * 0.1))
+        edge_2 = dg.num_edges * 2 - edge_0 - edge_1
+        self.assertEqual(dg_link[0].edge_label_index.shape[1], edge_0)
+        self.assertEqual(dg_link[1].edge_label_index.shape[1], edge_1)
+        self.assertEqual(dg_link[2].edge_label_index.shape[1], edge_2)
+        self.assertNotIn("G", dg_link[0].keys)
+        self.assertTrue(dg_link[0].node_feature is dg.node_feature)
+
+        dg_resample = dg_link[0].resample_disjoint(message_ratio=0.5)
+        self.assertEqual(
+            dg_resample.edge_label_index.shape[1]
+            + dg_resample.edge_index.shape[1],
+            edge_0,
+        )
+
+    def test_lazy_G(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        dg = Graph.from_tensors(
+            edge_index, node_feature=x, node_label=y, edge_feature=edge_x
+        )
+        # transforms that do not touch G do not build it
+        dg.apply_transform(remove_node_label)
+        self.assertNotIn("G", dg.keys)
+        self.assertIsNone(dg.node_label)
+
+        # G is built from the tensors on access
+        self.assertEqual(dg.G.number_of_nodes(), G.number_of_nodes())
+        self.assertEqual(dg.G.number_of_edges(), G.number_of_edges())
+        self.assertIn("G", dg.keys)
+        for u, v, data in dg.G.edges(data=True):
+            index = (
+                (dg.edge_index[0] == u) & (dg.edge_index[1] == v)
+            ).nonzero().item()
+            self.assertTrue(
+                torch.equal(data["edge_feature"], dg.edge_feature[index])
+            )
+
+        # modifications of G are synced back to the tensors
+        dg.apply_transform(add_edge_to_G)
+        self.assertEqual(dg.num_edges, G.number_of_edges() + 1)
+        self.assertEqual(dg.edge_index.shape[1], G.number_of_edges() + 1)
+
+        # tensor changes are only pushed to G when the tensors changed
+        dg.node_feature = dg.node_feature + 1
+        dg.apply_transform(
+            lambda graph: None, update_tensor=False, update_graph=True
+        )
+        self.assertTrue(
+            torch.equal(dg.G.nodes[0]["node_feature"], dg.node_feature[0])
+        )
+
+        dg.drop_G()
+        self.assertNotIn("G", dg.keys)
+        self.assertEqual(dg.num_edges, G.number_of_edges() + 1)
+        self.assertEqual(dg.G.number_of_edges(), G.number_of_edges() + 1)
+
+    def test_update_keys(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_edge_attr(G, "edge_feature", edge_x)
+        Graph.add_edge_attr(G, "edge_label", edge_y)
+        Graph.add_node_attr(G, "node_feature", x)
+        Graph.add_node_attr(G, "node_label", y)
+        dg = Graph(G)
+        node_feature = dg.node_feature.clone()
+        node_label = dg.node_label.clone()
+        edge_feature = dg.edge_feature.clone()
+
+        dg.apply_transform(shift_attributes_in_G, update_keys=["node_feature"])
+        self.assertTrue(torch.equal(dg.node_feature, node_feature + 1))
+        self.assertTrue(torch.equal(dg.node_label, node_label))
+        self.assertTrue(torch.equal(dg.edge_feature, edge_feature))
+
+        dg.apply_transform(shift_attributes_in_G)
+        self.assertTrue(torch.equal(dg.node_feature, node_feature + 2))
+        self.assertTrue(torch.equal(dg.node_label, node_label + 2))
+        self.assertTrue(torch.equal(dg.edge_feature, edge_feature + 2))
+
+    def test_node_ids(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph_alphabet()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+        Graph.add_edge_attr(G, "edge_feature", edge_x)
+        G_int = nx.relabel_nodes(G, {node: 10 * i for i, node in enumerate(G)})
+        # mixed integer and string ids, where 2 and "2" are different nodes
+        G_mixed = nx.relabel_nodes(
+            G, {node: i if i % 2 == 0 else str(i - 1) for i, node in enumerate(G)}
+        )
+        for G_test in [G, G_int, G_mixed]:
+            dg = Graph(G_test)
+            # G is not relabeled
+            self.assertIs(dg.G, G_test)
+            nodes = list(G_test.nodes)
+            for i, (u, v) in enumerate(dg.edge_index.t().tolist()):
+                self.assertTrue(G_test.has_edge(nodes[u], nodes[v]))
+                self.assertTrue(
+                    torch.equal(
+                        dg.edge_feature[i],
+                        G_test.edges[nodes[u], nodes[v]]["edge_feature"],
+                    )
+                )
+            self.assertEqual(
+                dg._node_ids_to_index(nodes[::-1]).tolist(),
+                list(range(len(nodes)))[::-1],
+            )
+            with self.assertRaises(KeyError):
+                dg._node_ids_to_index(["unknown"])
+
+            # G is rebuilt with the node ids of the original G
+            edge_index = dg.edge_index
+            dg.drop_G()
+            self.assertEqual(list(dg.G.nodes), nodes)
+            self.assertEqual(set(dg.G.edges), set(G_test.edges))
+            self.assertTrue(torch.equal(dg.edge_index, edge_index))
+
+        G = nx.Graph()
+        G.add_nodes_from([1, "a", 2])
+        G.add_edges_from([(1, 2), (1, "a")])
+        dg = Graph(G)
+        self.assertEqual(dg.num_edges, 2)
+        self.assertEqual(dg._node_ids_to_index([2, "a", 1]).tolist(), [2, 1, 0])
+
+    def test_negative_sampling(self):
+        num_nodes = 1000
+        edge_index = torch.randint(num_nodes, (2, 5000))
+        positive = set(map(tuple, edge_index.t().tolist()))
+
+        negative_edges = Graph.negative_sampling(
+            edge_index, num_nodes, 2000
+        )
+        negative = list(map(tuple, negative_edges.t().tolist()))
+        self.assertEqual(len(negative), 2000)
+        self.assertEqual(len(set(negative)), 2000)
+        self.assertEqual(len(positive.intersection(negative)), 0)
+
+        # seeded generators give the same negative edges
+        negative_edges = [
+            Graph.negative_sampling(
+                edge_index,
+                num_nodes,
+                2000,
+                generator=torch.Generator().manual_seed(0),
+            )
+            for _ in range(2)
+        ]
+        self.assertTrue(torch.equal(negative_edges[0], negative_edges[1]))
+
+        # all the remaining edges of a small graph
+        edge_index = torch.tensor([[0, 1, 2], [1, 2, 0]])
+        negative_edges = Graph.negative_sampling(edge_index, 3, 10)
+        self.assertEqual(negative_edges.shape[1], 6)
+        self.assertEqual(
+            set(map(tuple, negative_edges.t().tolist())),
+            {(0, 0), (1, 1), (2, 2), (1, 0), (2, 1), (0, 2)},
+        )
+
     def test_clone(self):
         G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
             simple_networkx_graph()
@@ -228,6 +449,76 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(dg_link[1].edge_label_index.shape[1], edge_1)
         self.assertEqual(dg_link[2].edge_label_index.shape[1], edge_2)
 
+    def test_split_link_pred_tensor(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph_alphabet()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+        Graph.add_edge_attr(G, "edge_feature", edge_x)
+        for G_test in [G, G.to_undirected()]:
+            dg = Graph(G_test)
+            graph_train, graph_val, graph_test = dg.split_link_pred(
+                [0.6, 0.2, 0.2]
+            )
+            # the splits share the node features and are not backed by G
+            for graph in [graph_train, graph_val, graph_test]:
+                self.assertNotIn("G", graph.keys)
+                self.assertIs(graph.node_feature, dg.node_feature)
+            self.assertIs(graph_val.edge_index, graph_train.edge_index)
+
+            num_message = graph_train.num_edges
+            num_objective = (
+                graph_val.edge_label_index.shape[1]
+                + graph_test.edge_label_index.shape[1]
+            )
+            if G_test.is_directed():
+                # message edges of the test split extend the training ones
+                self.assertEqual(
+                    graph_test.edge_index.data_ptr(),
+                    graph_train.edge_index.data_ptr(),
+                )
+            else:
+                num_objective //= 2
+            self.assertEqual(num_message + num_objective, dg.num_edges)
+
+            # the edges and their features are those of G
+            nodes = list(G_test.nodes)
+            for graph in [graph_train, graph_val, graph_test]:
+                for u, v in graph.edge_label_index.t().tolist():
+                    self.assertTrue(G_test.has_edge(nodes[u], nodes[v]))
+                for i, (u, v) in enumerate(graph.edge_index.t().tolist()):
+                    self.assertTrue(
+                        torch.equal(
+                            graph.edge_feature[i],
+                            G_test.edges[nodes[u], nodes[v]]["edge_feature"],
+                        )
+                    )
+            self.assertEqual(list(graph_train.G.nodes), nodes)
+            self.assertTrue(
+                all(G_test.has_edge(u, v) for u, v in graph_test.G.edges)
+            )
+
+    def test_split_generator(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+        Graph.add_node_attr(G, "node_label", y)
+        dg = Graph(G)
+        for task, key in [
+            ("node", "node_label_index"),
+            ("edge", "edge_label_index"),
+            ("link_pred", "edge_label_index"),
+        ]:
+            split_res = [
+                dg.split(
+                    task=task, generator=torch.Generator().manual_seed(0)
+                )
+                for _ in range(2)
+            ]
+            for graph_0, graph_1 in zip(*split_res):
+                self.assertTrue(torch.equal(graph_0[key], graph_1[key]))
+
     def test_split(self):
         pyg_dataset = Planetoid("./cora", "Cora")
         dg = Graph.pyg_to_graph(pyg_dataset[0])
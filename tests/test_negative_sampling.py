@@ -0,0 +1,185 @@
+import numpy as np
+import torch
+import unittest
+import warnings
+from tests.utils import simple_networkx_graph
+from deepsnap.graph import Graph
+from deepsnap.dataset import GraphDataset
+from deepsnap.negative_sampling import (
+    DegreeNegativeSampler,
+    HopNegativeSampler,
+    NegativeSampler,
+)
+
+
+class PairNegativeSampler(NegativeSampler):
+    r"""
+    Draws only the edges 0 -> 1, 1 -> 2 and 2 -> 0, recording the number
+    of requested samples.
+    """
+    def __init__(self):
+        self.requests = []
+
+    def sample_sources(self, graph, num_samples, generator=None):
+        self.requests.append(num_samples)
+        return torch.randint(3, (num_samples,), generator=generator)
+
+    def sample_targets(self, graph, sources, generator=None):
+        return (sources + 1) % 3
+
+
+class TestNegativeSampling(unittest.TestCase):
+
+    def test_alias_table(self):
+        weights = torch.tensor([0., 1., 2., 3., 10., 0.5, 0.5, 3.])
+        prob, alias = DegreeNegativeSampler._alias_table(weights)
+        # probability of each slot recovered from the table
+        recovered = prob.clone()
+        recovered.index_add_(0, alias, 1 - prob)
+        self.assertTrue(
+            torch.allclose(
+                recovered / len(weights), weights.double() / weights.sum()
+            )
+        )
+
+        samples = DegreeNegativeSampler._sample_alias(
+            (prob, alias), 100000, torch.Generator().manual_seed(0)
+        )
+        frequency = torch.bincount(samples, minlength=8).double() / 100000
+        self.assertEqual(frequency[0].item(), 0)
+        self.assertTrue(
+            torch.allclose(
+                frequency, weights.double() / weights.sum(), atol=0.01
+            )
+        )
+
+    def test_degree_negative_sampler(self):
+        # node 0 is a hub linked to all other nodes
+        edge_index = torch.tensor(
+            [[0] * 9 + [1, 2], list(range(1, 10)) + [2, 3]]
+        )
+        graph = Graph.from_tensors(edge_index, num_nodes=10)
+        sampler = DegreeNegativeSampler(alpha=1)
+        generator = torch.Generator().manual_seed(0)
+        sources = sampler.sample_sources(graph, 10000, generator)
+        frequency = torch.bincount(sources, minlength=10).double() / 10000
+        self.assertAlmostEqual(frequency[0].item(), 9 / 11, delta=0.02)
+        self.assertEqual(frequency[3:].sum().item(), 0)
+
+        # negatives of the small, dense graph are drawn by the sampler: the
+        # sources 1 and 2 have 16 negative edges to targets with in edges
+        edge_keys = np.sort((edge_index[0] * 10 + edge_index[1]).numpy())
+
+        def sample_edges(num):
+            return graph._sample_negative_candidates(sampler, num, generator)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            negatives = Graph._negative_sampling_from_keys(
+                edge_keys, 10, 12, generator, sample_edges=sample_edges,
+            )
+        self.assertEqual(len(caught), 0)
+        self.assertEqual(negatives.shape, (2, 12))
+        self.assertTrue(torch.all((negatives[0] == 1) | (negatives[0] == 2)))
+        self.assertTrue(torch.all(negatives[1] > 0))
+        # the remaining negatives are sampled uniformly with a warning
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            negatives = Graph._negative_sampling_from_keys(
+                edge_keys, 10, 20, generator, sample_edges=sample_edges,
+            )
+        self.assertEqual(len(caught), 1)
+        keys = (negatives[0] * 10 + negatives[1]).numpy()
+        self.assertEqual(len(np.unique(keys)), 20)
+        self.assertFalse(np.any(np.isin(keys, edge_keys)))
+        weighted = (negatives[0] > 0) & (negatives[0] < 3) & (negatives[1] > 0)
+        self.assertEqual(int(weighted.sum()), 16)
+
+        # the alias tables are reused until the edges change
+        state = sampler._get_state(graph)
+        self.assertIs(sampler._get_state(graph), state)
+        graph.edge_index = edge_index.flip([0])
+        self.assertIsNot(sampler._get_state(graph), state)
+
+    def test_small_negative_sampler(self):
+        # the sampler draws 3 distinct edges, the rest is sampled uniformly
+        num_nodes = 2000
+        generator = torch.Generator().manual_seed(0)
+        edge_index = torch.randint(num_nodes, (2, 5000), generator=generator)
+        graph = Graph.from_tensors(edge_index, num_nodes=num_nodes)
+        edge_keys = np.unique(
+            (edge_index[0] * num_nodes + edge_index[1]).numpy()
+        )
+        sampler = PairNegativeSampler()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            negatives = Graph._negative_sampling_from_keys(
+                edge_keys, num_nodes, 5000, generator,
+                sample_edges=lambda num: graph._sample_negative_candidates(
+                    sampler, num, generator
+                ),
+            )
+        self.assertEqual(len(caught), 1)
+        self.assertLessEqual(max(sampler.requests), 10 * 5000 + 16)
+        self.assertLessEqual(len(sampler.requests), 2)
+        keys = (negatives[0] * num_nodes + negatives[1]).numpy()
+        self.assertEqual(len(np.unique(keys)), 5000)
+        self.assertFalse(np.any(np.isin(keys, edge_keys)))
+
+    def test_hop_negative_sampler(self):
+        # a directed path 0 -> 1 -> ... -> 9
+        edge_index = torch.tensor([list(range(9)), list(range(1, 10))])
+        graph = Graph.from_tensors(edge_index)
+        sampler = HopNegativeSampler(num_hops=2)
+        sources = torch.arange(10).repeat(100)
+        targets = sampler.sample_targets(
+            graph, sources, torch.Generator().manual_seed(0)
+        )
+        self.assertFalse(torch.any(targets == sources))
+        # the walks of the last two nodes end without out edges
+        walked = sources <= 7
+        self.assertTrue(torch.equal(targets[walked], sources[walked] + 2))
+
+        with self.assertRaises(ValueError):
+            HopNegativeSampler(num_hops=0)
+
+    def test_dataset_negative_sampler(self):
+        G, x, y, edge_x, edge_y, edge_index, graph_x, graph_y = (
+            simple_networkx_graph()
+        )
+        Graph.add_node_attr(G, "node_feature", x)
+        for negative_sampling_mode in ["random", "tail"]:
+            for sampler in [DegreeNegativeSampler(), HopNegativeSampler()]:
+                dataset = GraphDataset(
+                    [Graph(G)],
+                    task="link_pred",
+                    edge_negative_sampling_ratio=2,
+                    negative_sampling_mode=negative_sampling_mode,
+                    negative_sampler=sampler,
+                )
+                split_res = dataset.split(transductive=True)
+                for dataset_split in split_res + [[split_res[0][0]]]:
+                    graph = dataset_split[0]
+                    num_pos = graph.edge_label_index.shape[1] // 3
+                    positives = graph.edge_label_index[:, :num_pos]
+                    negatives = graph.edge_label_index[:, num_pos:]
+                    positive = set(
+                        map(
+                            tuple,
+                            torch.cat([graph.edge_index, positives], dim=1)
+                            .t().tolist()
+                        )
+                    )
+                    self.assertEqual(negatives.shape[1], 2 * num_pos)
+                    self.assertEqual(
+                        len(
+                            positive.intersection(
+                                map(tuple, negatives.t().tolist())
+                            )
+                        ),
+                        0,
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import os
+import tempfile
+import torch
+import unittest
+from torch.utils.data import BatchSampler, DataLoader, SequentialSampler
+from torch_geometric.data import Data, InMemoryDataset
+from torch_geometric.datasets import TUDataset
+from deepsnap.graph import Graph
+from deepsnap.batch import Batch
+from deepsnap.dataset import GraphDataset
+
+
+class TestPacked(unittest.TestCase):
+
+    def test_packed_graphs(self):
+        pyg_dataset = TUDataset("./enzymes", "ENZYMES")
+        graphs = GraphDataset.pyg_to_graphs(pyg_dataset)
+        dataset = GraphDataset(graphs, task="graph")
+        packed = dataset.pack()
+        self.assertEqual(len(packed), len(dataset))
+        self.assertEqual(packed.num_nodes, dataset.num_nodes)
+        self.assertNotIn("G", packed.keys)
+
+        graph = packed[3]
+        self.assertIsNone(graph._G)
+        self.assertEqual(graph.num_nodes, dataset[3].num_nodes)
+        self.assertEqual(graph.is_directed(), dataset[3].is_directed())
+        self.assertEqual(graph.task, "graph")
+        self.assertTrue(torch.equal(graph.edge_index, dataset[3].edge_index))
+        # attributes are views of the packed tensors
+        self.assertEqual(
+            graph.node_feature.data_ptr(),
+            packed.data["node_feature"][packed.ptr["node_feature"][3]]
+            .data_ptr(),
+        )
+
+        ids = [5, 0, 17, 3]
+        batch = packed[ids]
+        expected = Batch.from_data_list([dataset[idx] for idx in ids])
+        for key in ["node_feature", "edge_index", "graph_label", "batch",
+                    "ptr", "edge_index_ptr", "node_label_index"]:
+            self.assertTrue(torch.equal(batch[key], expected[key]))
+        self.assertEqual(batch.task, expected.task)
+        self.assertEqual(batch.num_graphs, 4)
+        for graph, idx in zip(batch.to_data_list(), ids):
+            self.assertTrue(
+                torch.equal(graph.edge_index, dataset[idx].edge_index)
+            )
+
+        dataloader = DataLoader(
+            packed,
+            sampler=BatchSampler(
+                SequentialSampler(packed), batch_size=32, drop_last=False
+            ),
+            batch_size=None,
+        )
+        num_graphs = 0
+        for batch in dataloader:
+            self.assertIsInstance(batch, Batch)
+            num_graphs += batch.num_graphs
+        self.assertEqual(num_graphs, len(dataset))
+
+        graph_feature = torch.randn(len(graphs), 4)
+        for graph, feature in zip(graphs, graph_feature):
+            graph.graph_feature = feature
+        packed = GraphDataset(graphs, task="graph").pack()
+        self.assertTrue(torch.equal(packed[[2, 1]].graph_feature,
+                                    graph_feature[[2, 1]]))
+        self.assertTrue(torch.equal(packed[2].graph_feature, graph_feature[2]))
+
+
+    def test_save_load(self):
+        pyg_dataset = TUDataset("./enzymes", "ENZYMES")
+        graphs = GraphDataset.pyg_to_graphs(pyg_dataset)
+        dataset = GraphDataset(graphs, task="graph", minimum_node_per_graph=8)
+        with tempfile.TemporaryDirectory() as path:
+            dataset.save(path)
+            self.assertTrue(
+                os.path.isfile(os.path.join(path, "manifest.json"))
+            )
+            for mmap in [True, False]:
+                dataset_load = GraphDataset.load(path, mmap=mmap)
+                self.assertEqual(len(dataset_load), len(dataset))
+                self.assertEqual(dataset_load.task, "graph")
+                self.assertEqual(dataset_load.minimum_node_per_graph, 8)
+                self.assertEqual(dataset_load.num_nodes, dataset.num_nodes)
+                for graph, graph_load in zip(dataset, dataset_load):
+                    self.assertTrue(
+                        torch.equal(graph.edge_index, graph_load.edge_index)
+                    )
+                    self.assertTrue(
+                        torch.equal(
+                            graph.node_feature, graph_load.node_feature
+                        )
+                    )
+            dataset_load = GraphDataset.load(path, task="node")
+            self.assertEqual(dataset_load.task, "node")
+
+            # the tensors are memory mapped copy on write
+            packed = type(dataset.pack()).load(path)
+            node_feature = packed.data["node_feature"]
+            node_feature[0] = 1
+            packed_load = type(packed).load(path)
+            self.assertFalse(
+                torch.equal(node_feature[0], packed_load.data["node_feature"][0])
+            )
+
+            # saving the memory mapped graphs to the directory they are
+            # loaded from replaces the files
+            packed = type(packed).load(path)
+            packed.save(path)
+            packed_load = type(packed).load(path)
+            for key, data in packed.data.items():
+                self.assertTrue(torch.equal(packed_load.data[key], data))
+            self.assertEqual(
+                sorted(name for name in os.listdir(path) if name[0] == "."),
+                [],
+            )
+
+            # a save that fails does not write any file of the directory
+            array_path = os.path.join(path, "node_feature.npy")
+            os.utime(array_path, (0, 0))
+            packed.values["graph_name"] = object()
+            with self.assertRaises(ValueError):
+                packed.save(path)
+            self.assertEqual(os.path.getmtime(array_path), 0)
+            self.assertEqual(len(GraphDataset.load(path)), len(dataset))
+
+            os.remove(os.path.join(path, "manifest.json"))
+            with self.assertRaises(ValueError):
+                GraphDataset.load(path)
+
+    def test_from_pyg(self):
+        pyg_dataset = TUDataset("./enzymes", "ENZYMES")
+        expected = [
+            Graph.pyg_to_graph(data, backend="tensor") for data in pyg_dataset
+        ]
+
+        class InMemory(InMemoryDataset):
+            def __init__(self, data_list):
+                super().__init__(None)
+                self.data, self.slices = self.collate(data_list)
+
+        # a duplicated edge is removed as by Graph.from_tensors
+        data_list = [
+            Data(x=data.x, edge_index=data.edge_index, y=data.y)
+            for data in pyg_dataset
+        ]
+        data_list[0].edge_index = torch.cat(
+            [data_list[0].edge_index, data_list[0].edge_index[:, :2]], dim=1
+        )
+        in_memory = InMemory(data_list)
+
+        for graphs in [
+            GraphDataset.pyg_to_graphs(pyg_dataset, backend="tensor"),
+            GraphDataset.pyg_to_graphs(
+                pyg_dataset, backend="tensor", num_workers=2, chunksize=64
+            ),
+            GraphDataset.pyg_to_graphs(in_memory, backend="tensor"),
+        ]:
+            self.assertEqual(len(graphs), len(expected))
+            for graph, expected_graph in zip(graphs, expected):
+                self.assertEqual(
+                    sorted(graph.keys), sorted(expected_graph.keys)
+                )
+                self.assertEqual(graph.num_nodes, expected_graph.num_nodes)
+                self.assertEqual(graph.num_edges, expected_graph.num_edges)
+                self.assertFalse(graph.is_directed())
+                for key in [
+                    "node_feature", "graph_label", "edge_index",
+                    "edge_label_index", "node_label_index",
+                ]:
+                    self.assertTrue(
+                        torch.equal(graph[key], expected_graph[key])
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
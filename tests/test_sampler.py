@@ -0,0 +1,181 @@
+import os
+import tempfile
+import torch
+import unittest
+from torch.utils.data import DataLoader
+from deepsnap.graph import Graph
+from deepsnap.batch import Batch
+from deepsnap.dataset import GraphDataset
+from deepsnap.feature_store import FeatureStore
+from deepsnap.sampler import BucketBatchSampler, NeighborSampler
+
+
+class TestSampler(unittest.TestCase):
+
+    def test_bucket_batch_sampler(self):
+        generator = torch.Generator().manual_seed(0)
+        sizes = torch.randint(5, 100, (200,), generator=generator).tolist()
+        graphs = [
+            Graph.from_tensors(
+                torch.randint(num_nodes, (2, 2 * num_nodes)),
+                num_nodes=num_nodes,
+                node_feature=torch.ones(num_nodes, 1),
+                graph_label=torch.tensor([0]),
+            )
+            for num_nodes in sizes
+        ]
+        graphs.append(
+            Graph.from_tensors(
+                torch.randint(500, (2, 1000)),
+                num_nodes=500,
+                node_feature=torch.ones(500, 1),
+                graph_label=torch.tensor([0]),
+            )
+        )
+        dataset = GraphDataset(graphs, task="graph")
+        sampler = BucketBatchSampler(
+            dataset, max_num_nodes=400, bucket_size=50,
+            generator=torch.Generator().manual_seed(0),
+        )
+        num_batches = len(sampler)
+        batches = list(sampler)
+        self.assertEqual(len(batches), num_batches)
+        indices = sorted(idx for batch in batches for idx in batch)
+        self.assertEqual(indices, list(range(len(graphs))))
+        for batch in batches:
+            num_nodes = sum(dataset.num_nodes[idx] for idx in batch)
+            # only the oversized graph exceeds the budget, on its own
+            self.assertTrue(num_nodes <= 400 or batch == [200])
+
+        stats = sampler.stats()
+        self.assertEqual(stats["num_batches"], len(batches))
+        self.assertIsNone(stats["edge_utilization"])
+        self.assertGreater(stats["node_utilization"], 0.5)
+        self.assertLess(stats["padding"], 0.5)
+
+        # a new epoch is shuffled differently
+        self.assertNotEqual(list(sampler), batches)
+
+        dataloader = DataLoader(
+            dataset, batch_sampler=sampler, collate_fn=Batch.collate()
+        )
+        num_graphs = 0
+        for batch in dataloader:
+            num_graphs += batch.num_graphs
+            self.assertEqual(batch.node_feature.size(0), batch.ptr[-1])
+        self.assertEqual(num_graphs, len(graphs))
+
+        sampler = BucketBatchSampler(
+            dataset, max_num_graphs=16, shuffle=False
+        )
+        batches = list(sampler)
+        self.assertEqual(len(batches), 13)
+        self.assertEqual(
+            [dataset.num_nodes[idx] for idx in batches[0]],
+            sorted(dataset.num_nodes)[:16],
+        )
+
+        with self.assertRaises(ValueError):
+            BucketBatchSampler(dataset)
+
+    def test_neighbor_sampler(self):
+        generator = torch.Generator().manual_seed(0)
+        num_nodes = 500
+        graph = Graph.from_tensors(
+            torch.randint(num_nodes, (2, 3000), generator=generator),
+            num_nodes=num_nodes,
+            directed=False,
+            node_feature=torch.randn(num_nodes, 4, generator=generator),
+            node_label=torch.randint(3, (num_nodes,), generator=generator),
+            edge_feature=torch.randn(3000, 2, generator=generator),
+        )
+        graph.task = "node"
+        edges = set(map(tuple, graph.edge_index.t().tolist()))
+        in_degree = torch.bincount(graph.edge_index[1], minlength=num_nodes)
+
+        sampler = NeighborSampler(graph, [5, 3])
+        seeds = torch.tensor([7, 3, 42, 3])
+        subgraph = sampler.sample(seeds)
+        # the distinct seeds are the first nodes
+        self.assertEqual(subgraph.node_id[:3].tolist(), [7, 3, 42])
+        self.assertEqual(subgraph.node_label_index.tolist(), [0, 1, 2, 1])
+        self.assertEqual(
+            len(set(subgraph.node_id.tolist())), subgraph.num_nodes
+        )
+        global_edges = subgraph.node_id[subgraph.edge_index]
+        self.assertTrue(
+            torch.equal(global_edges, graph.edge_index[:, subgraph.edge_id])
+        )
+        for edge in global_edges.t().tolist():
+            self.assertIn(tuple(edge), edges)
+        self.assertTrue(torch.equal(
+            subgraph.node_feature, graph.node_feature[subgraph.node_id]
+        ))
+        self.assertTrue(torch.equal(
+            subgraph.node_label, graph.node_label[subgraph.node_id]
+        ))
+        self.assertTrue(torch.equal(
+            subgraph.edge_feature, graph.edge_feature[subgraph.edge_id]
+        ))
+        # at most 5 neighbors of the seeds, all if they have fewer
+        seed_degree = torch.bincount(
+            subgraph.edge_index[1], minlength=subgraph.num_nodes
+        )[:3]
+        self.assertTrue(torch.equal(
+            seed_degree, in_degree[[7, 3, 42]].clamp(max=5)
+        ))
+        self.assertLessEqual(
+            int(torch.bincount(subgraph.edge_index[1]).max()), 5
+        )
+
+        # all neighbors
+        subgraph = NeighborSampler(graph, [-1]).sample(torch.tensor([7]))
+        self.assertEqual(subgraph.edge_index.size(1), int(in_degree[7]))
+
+        # equally seeded generators sample the same subgraphs
+        for replace in [False, True]:
+            subgraphs = [
+                NeighborSampler(
+                    graph, [5, 3], replace=replace,
+                    generator=torch.Generator().manual_seed(1),
+                ).sample(seeds)
+                for _ in range(2)
+            ]
+            self.assertTrue(
+                torch.equal(subgraphs[0].node_id, subgraphs[1].node_id)
+            )
+            self.assertTrue(
+                torch.equal(subgraphs[0].edge_index, subgraphs[1].edge_index)
+            )
+
+        # batches of seeds from the node_label_index of a split, sampled in
+        # worker processes with features in a feature store
+        dataset = GraphDataset([graph], task="node")
+        train, _, _ = dataset.split(
+            transductive=True, split_ratio=[0.8, 0.1, 0.1]
+        )
+        with tempfile.TemporaryDirectory() as root:
+            graph.node_feature = FeatureStore.create(
+                os.path.join(root, "x.npy"), graph.node_feature
+            )
+            sampler = NeighborSampler(graph, [4, 4], replace=True)
+            dataloader = DataLoader(
+                train[0].node_label_index, batch_size=64, shuffle=True,
+                num_workers=2, collate_fn=sampler,
+            )
+            labeled = []
+            for batch in dataloader:
+                self.assertIsInstance(batch, Batch)
+                self.assertTrue(torch.equal(
+                    batch.node_feature,
+                    graph.node_feature.gather(batch.node_id),
+                ))
+                labeled.append(batch.node_id[batch.node_label_index])
+            self.assertEqual(
+                torch.sort(torch.cat(labeled))[0].tolist(),
+                torch.sort(train[0].node_label_index)[0].tolist(),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()